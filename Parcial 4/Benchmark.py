@@ -0,0 +1,301 @@
+# Benchmark de extremo a extremo para ConsoleApp
+# Uso: python Benchmark.py [--files N] [--commits N] [--branches N] [--prs N] [--out resultados.json]
+#      python Benchmark.py --startup [--runs N]   (arranque en frío por comando)
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Main import ConsoleApp
+
+def read_io_counters():
+    """
+    Contadores de E/S del proceso (Linux: /proc/self/io), o None si no están
+    disponibles. read_bytes/write_bytes son los bytes que llegan al
+    almacenamiento; read_chars/write_chars cuentan todo lo que pasa por
+    read()/write(), incluidos los aciertos en la caché de páginas.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            values = dict(line.split(": ") for line in f.read().splitlines())
+        return {"read_bytes": int(values["read_bytes"]), "write_bytes": int(values["write_bytes"]),
+                "read_chars": int(values["rchar"]), "write_chars": int(values["wchar"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def current_rss_kb():
+    """Memoria residente actual del proceso en KiB (Linux: /proc/self/statm), o None"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, IndexError, ValueError):
+        return None
+
+def peak_rss_mb():
+    """Máximo histórico de memoria residente de todo el proceso (no de un comando)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB y macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    position = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[position]
+
+class WorkloadBenchmark:
+    """
+    Genera un repositorio sintético y ejecuta los comandos reales de ConsoleApp,
+    midiendo por comando la latencia, la variación de memoria residente y
+    los bytes de E/S.
+    """
+    def __init__(self, workdir, files, commits, branches, prs, files_per_commit, seed):
+        self.workdir = workdir
+        self.repo_path = os.path.join(workdir, "bench_repo")
+        self.files = files
+        self.commits = commits
+        self.branches = branches
+        self.prs = prs
+        self.files_per_commit = files_per_commit
+        self.random = random.Random(seed)
+        self.app = ConsoleApp()
+        self.samples = {}  # comando -> [{"seconds", "rss_delta_kb", "read_bytes", ...}]
+        self.file_names = []
+        self._devnull = open(os.devnull, "w")
+
+    def run(self, command_line, label=None):
+        """Ejecuta un comando como lo haría la consola y registra su costo"""
+        parts = command_line.split()
+        before_rss = current_rss_kb()
+        before_io = read_io_counters()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(self._devnull):
+            self.app.commands[parts[0]].execute(parts)
+        elapsed = time.perf_counter() - start
+        after_io = read_io_counters()
+        after_rss = current_rss_kb()
+        sample = {"seconds": elapsed}
+        if before_rss is not None and after_rss is not None:
+            sample["rss_delta_kb"] = after_rss - before_rss
+        if before_io and after_io:
+            for counter in before_io:
+                sample[counter] = after_io[counter] - before_io[counter]
+        self.samples.setdefault(label or parts[0], []).append(sample)
+
+    def _write_file(self, name):
+        path = os.path.join(self.repo_path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lines = self.random.randint(5, 60)
+        with open(path, "w") as f:
+            for _ in range(lines):
+                f.write(f"{self.random.getrandbits(64):016x} linea generada\n")
+
+    def generate_tree(self):
+        """Crea `files` archivos repartidos en subdirectorios de 100 archivos"""
+        for i in range(self.files):
+            name = f"src/d{i // 100:05d}/f{i:07d}.txt"
+            self.file_names.append(name)
+            self._write_file(name)
+
+    def scenario(self):
+        self.run(f"init {self.repo_path}")
+        self.generate_tree()
+        self.run("add .", "add .")
+        self.run('commit -m "inicial"')
+        for _ in range(5):
+            self.run("status")
+
+        branch_names = [f"feature{i}" for i in range(self.branches)]
+        for i in range(self.commits):
+            # Cada cierto número de commits se cambia de rama
+            if branch_names and i % max(1, self.commits // (self.branches + 1)) == 0:
+                branch = branch_names[(i // max(1, self.commits // (self.branches + 1))) % len(branch_names)]
+                if not self.app.branch_tree.find_branch_inorder(self.app.branch_tree.root, branch):
+                    self.run("checkout main")
+                    self.run(f"branch {branch}")
+                self.run(f"checkout {branch}")
+            for name in self.random.sample(self.file_names, min(self.files_per_commit, len(self.file_names))):
+                self._write_file(name)
+                self.run(f"add {name}", "add <file>")
+            self.run(f"commit -m c{i}")
+            if i % 50 == 0:
+                self.run("status")
+
+        for _ in range(20):
+            self.run("log -n 20", "log -n 20")
+        self.run("log", "log (completo)")
+        for _ in range(20):
+            commit_id = self.random.choice(self.app.commit_graph.order)
+            self.run(f"checkout {commit_id}", "checkout <commit>")
+        self.run("checkout main")
+        for branch in branch_names:
+            node = self.app.branch_tree.find_branch_inorder(self.app.branch_tree.root, branch)
+            if node and node.commit:
+                self.run(f"branch merge {branch} main", "branch merge")
+        for i in range(self.prs):
+            source = branch_names[i % len(branch_names)] if branch_names else "main"
+            self.run(f"pr create {source} main", "pr create")
+        for _ in range(self.prs):
+            self.run("pr next", "pr next")
+            pending = [pr for pr in self.app.pr_queue.get_all() if pr.status == "reviewing"]
+            if pending:
+                self.run(f"pr approve {pending[0].id}", "pr approve")
+        self.run("pr list", "pr list")
+
+    def report(self):
+        commands = {}
+        for name, samples in self.samples.items():
+            latencies = sorted(sample["seconds"] * 1000 for sample in samples)
+            entry = {
+                "count": len(samples),
+                "mean_ms": round(sum(latencies) / len(latencies), 3),
+                "p50_ms": round(percentile(latencies, 0.50), 3),
+                "p90_ms": round(percentile(latencies, 0.90), 3),
+                "p99_ms": round(percentile(latencies, 0.99), 3),
+                "max_ms": round(latencies[-1], 3),
+            }
+            if "rss_delta_kb" in samples[0]:
+                deltas = [s["rss_delta_kb"] for s in samples]
+                entry["rss_delta_kb_mean"] = sum(deltas) // len(deltas)
+                entry["rss_delta_kb_max"] = max(deltas)
+            for counter in ("read_bytes", "write_bytes", "read_chars", "write_chars"):
+                if counter in samples[0]:
+                    entry[counter + "_mean"] = sum(s[counter] for s in samples) // len(samples)
+            commands[name] = entry
+        return {
+            "params": {"files": self.files, "commits": self.commits, "branches": self.branches,
+                       "prs": self.prs, "files_per_commit": self.files_per_commit},
+            "python": sys.version.split()[0],
+            "process_peak_rss_mb": peak_rss_mb(),
+            "commands": commands,
+        }
+
+    def close(self):
+        self._devnull.close()
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Main.py")
+# Comandos de una sola ejecución medidos en frío (cada uno en un proceso nuevo)
+STARTUP_COMMANDS = {
+    "help": ["help"],
+    "status": ["init {repo}", "status"],
+    "log": ["init {repo}", "log -n 20"],
+    "pr list": ["init {repo}", "pr list"],
+    "branch --list": ["init {repo}", "branch --list"],
+}
+
+def parse_importtime(stderr):
+    """
+    Lee la salida de python -X importtime. Devuelve (microsegundos totales,
+    {módulo: microsegundos acumulados}); el total suma solo los imports de
+    primer nivel, que ya incluyen a los anidados.
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, modules
+
+class StartupBenchmark:
+    """
+    Mide el arranque en frío de Main.py: cada comando se ejecuta con -c en
+    un proceso nuevo bajo `python -X importtime`, registrando el tiempo total
+    del proceso y el tiempo de importación de los módulos.
+    """
+    def __init__(self, workdir, runs):
+        self.repo_path = os.path.join(workdir, "startup_repo")
+        self.runs = runs
+        self.samples = {}  # comando -> [{"seconds", "import_us", "imports"}]
+
+    def run(self, label, commands):
+        args = [sys.executable, "-X", "importtime", MAIN_SCRIPT]
+        for command in commands:
+            args += ["-c", command.format(repo=self.repo_path)]
+        start = time.perf_counter()
+        process = subprocess.run(args, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        import_us, imports = parse_importtime(process.stderr)
+        self.samples.setdefault(label, []).append({"seconds": elapsed, "import_us": import_us,
+                                                   "imports": imports})
+
+    def scenario(self):
+        # Una pasada previa crea el repositorio y los .pyc
+        for label, commands in STARTUP_COMMANDS.items():
+            self.run(label, commands)
+        self.samples.clear()
+        for _ in range(self.runs):
+            for label, commands in STARTUP_COMMANDS.items():
+                self.run(label, commands)
+
+    def report(self):
+        commands = {}
+        for name, samples in self.samples.items():
+            latencies = sorted(sample["seconds"] * 1000 for sample in samples)
+            slowest = {}
+            for sample in samples:
+                for module, micros in sample["imports"].items():
+                    slowest[module] = max(slowest.get(module, 0), micros)
+            commands[name] = {
+                "count": len(samples),
+                "p50_ms": round(percentile(latencies, 0.50), 3),
+                "p90_ms": round(percentile(latencies, 0.90), 3),
+                "max_ms": round(latencies[-1], 3),
+                "import_ms_mean": round(sum(s["import_us"] for s in samples) / len(samples) / 1000, 3),
+                "modules_loaded": len(samples[-1]["imports"]),
+                "slowest_imports_ms": {module: round(micros / 1000, 3) for module, micros in
+                                       sorted(slowest.items(), key=lambda item: -item[1])[:8]},
+            }
+        return {"params": {"runs": self.runs}, "python": sys.version.split()[0], "commands": commands}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga para la consola git del Parcial 4")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--branches", type=int, default=10)
+    parser.add_argument("--prs", type=int, default=50)
+    parser.add_argument("--files-per-commit", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Directorio de trabajo (por defecto uno temporal)")
+    parser.add_argument("--keep", action="store_true", help="No borrar el repositorio generado")
+    parser.add_argument("--out", help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--startup", action="store_true",
+                        help="Mide el arranque en frío por comando con python -X importtime")
+    parser.add_argument("--runs", type=int, default=10, help="Repeticiones por comando en --startup")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_git_")
+    if args.startup:
+        bench = StartupBenchmark(workdir, args.runs)
+    else:
+        bench = WorkloadBenchmark(workdir, args.files, args.commits, args.branches, args.prs,
+                                  args.files_per_commit, args.seed)
+    try:
+        bench.scenario()
+        result = bench.report()
+    finally:
+        if not args.startup:
+            bench.close()
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    output = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,158 @@
 # 1. Módulo de Gestión de Branches (Árbol N-ario)
 import json
 import os
-import difflib
+
+from RadixIndex import RadixIndex
 
 class BranchNode:
-    def __init__(self, name, commit=None):
+    def __init__(self, name, commit=None, parent=None):
         self.name = name
         self.commit = commit  # Commit actual
         self.children = []    # Subramas
+        self.parent = parent  # Rama de la que se creó (None para main)
         
 class BranchTree:
     def __init__(self):
         self.root = BranchNode("main")
         self.current_branch = self.root
+        self.index = {"main": self.root}  # nombre -> nodo, sincronizado con el árbol
+        self.prefixes = RadixIndex()        # Mismo contenido, para búsquedas por prefijo
+        self.prefixes.insert("main", self.root)
         
     def add_branch(self, parent_name, new_branch):
-        parent = self._find_node_preorder(self.root, parent_name)
-        if parent:
-            parent.children.append(BranchNode(new_branch))
+        parent = self.index.get(parent_name)
+        if parent and new_branch not in self.index:
+            node = BranchNode(new_branch, parent=parent)
+            parent.children.append(node)
+            self.index[new_branch] = node
+            self.prefixes.insert(new_branch, node)
             return True
         return False
     
-    def _find_node_preorder(self, node, target):
-        if node.name == target:
-            return node
-        for child in node.children:
-            result = self._find_node_preorder(child, target)
-            if result:
-                return result
-        return None
+    def find(self, name):
+        """Búsqueda O(1) de una rama por nombre"""
+        return self.index.get(name)
+
+    def find_prefix(self, prefix):
+        """Ramas cuyo nombre empieza con prefix, ordenadas por nombre"""
+        return [node for _, node in self.prefixes.items(prefix)]
     
-    def merge(self, source, target, repo_path=None, commits_list=None):
+    def merge(self, source, target, commit_graph, append_commit=None, object_store=None, merge_service=None):
         """
-        Muestra los cambios individuales por archivo entre las ramas source y target usando difflib.
-        Además, crea un commit de merge en la rama destino con los archivos combinados.
-        """        
-        source_node = self._find_node_preorder(self.root, source)
-        target_node = self._find_node_preorder(self.root, target)
+        Merge de tres vías de source en target. Solo se leen los archivos que
+        cambiaron desde el ancestro común en ambas ramas; merge_service
+        (opcional) los combina en paralelo.
+        Crea un commit de merge (con ambos padres) en la rama destino.
+        append_commit (opcional) registra el commit en el historial y sus índices.
+        """
+        source_node = self.index.get(source)
+        target_node = self.index.get(target)
         if not source_node or not target_node:
             print(f"No se encontró alguna de las ramas: {source}, {target}")
             return False
         if not source_node.commit or not target_node.commit:
             print("Alguna de las ramas no tiene commit asociado.")
             return False
-        
-        # Archivos en cada commit
-        source_files = set(source_node.commit.staged_files)
-        target_files = set(target_node.commit.staged_files)
-        all_files = source_files | target_files
-        
-        print(f"\n--- Comparando ramas '{source}' y '{target}' ---\n")
-        for filename in sorted(all_files):
+        source_commit, target_commit = source_node.commit, target_node.commit
+
+        base_id = commit_graph.merge_base(source_commit.id, target_commit.id)
+        if base_id == source_commit.id:
+            print(f"La rama '{target}' ya contiene todos los cambios de '{source}'")
+            return True
+        source_changes = commit_graph.changed_since(base_id, source_commit.id)
+        target_changes = commit_graph.changed_since(base_id, target_commit.id)
+
+        merged = {}  # filename -> sha1 resultante (None = borrado)
+        notes = {}   # filename -> descripción para el resumen
+        conflicts = []
+        both_changed = []
+        for filename, source_hash in source_changes.items():
+            if filename not in target_changes:
+                # Solo cambió en source: se toma su versión sin leer el contenido
+                merged[filename] = source_hash
+                notes[filename] = ("(Archivo eliminado en la rama source)" if source_hash is None
+                                   else "(Se toma la versión de la rama source)")
+            elif target_changes[filename] == source_hash:
+                continue  # Mismo cambio en ambas ramas
+            elif source_hash is None or target_changes[filename] is None:
+                conflicts.append(filename)
+                notes[filename] = "CONFLICTO: modificado en una rama y eliminado en la otra (se conserva la versión de target)"
+            else:
+                both_changed.append(filename)
+
+        # Solo los archivos que cambiaron en ambas ramas necesitan la versión base
+        base_hashes = commit_graph.blobs_at(base_id, both_changed) if base_id else {}
+        tasks = [(filename, base_hashes.get(filename), target_changes[filename],
+                  source_changes[filename], target, source) for filename in both_changed]
+        if merge_service is None:
+            from MergeService import MergeService
+            merge_service = MergeService(1)
+        for filename, result_hash, conflict_count in merge_service.merge_files(object_store, tasks):
+            merged[filename] = result_hash
+            if conflict_count:
+                conflicts.append(filename)
+                notes[filename] = f"CONFLICTO: {conflict_count} bloque(s) con marcadores"
+            else:
+                notes[filename] = "(Cambios combinados sin conflictos)"
+
+        print(f"\n--- Merge de '{source}' en '{target}' (base: {base_id or 'ninguna'}) ---\n")
+        for filename in sorted(notes):
             print(f"Archivo: {filename}")
-            source_path = os.path.join(repo_path, filename) if repo_path else filename
-            target_path = os.path.join(repo_path, filename) if repo_path else filename
-            
-            # Leer contenido de cada archivo en cada rama (si existe)
-            source_content = []
-            target_content = []
-            if filename in source_files and os.path.isfile(source_path):
-                with open(source_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    source_content = f.readlines()
-            if filename in target_files and os.path.isfile(target_path):
-                with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    target_content = f.readlines()
-            
-            if filename in source_files and filename in target_files:
-                # Mostrar delta
-                diff = difflib.unified_diff(
-                    target_content, source_content,
-                    fromfile=f'{target}:{filename}',
-                    tofile=f'{source}:{filename}',
-                    lineterm=''
-                )
-                diff_lines = list(diff)
-                if diff_lines:
-                    print("\n".join(diff_lines))
-                else:
-                    print("(Sin diferencias)")
-            elif filename in source_files:
-                print("(Archivo nuevo en la rama source)")
-            elif filename in target_files:
-                print("(Archivo eliminado en la rama source)")
+            print(notes[filename])
+            if filename in both_changed:
+                # Hunks de cada rama respecto a la base, impresos a medida que se generan
+                base_hash = base_hashes.get(filename)
+                for label, side_hash in ((target, target_changes[filename]), (source, source_changes[filename])):
+                    self._print_hunks(object_store, filename, base_hash, side_hash, label)
             print("-"*40)
-        # --- Lógica de commit de merge ---
-        if commits_list is not None:
-            # Unir archivos de ambos commits (sin duplicados)
-            merged_files = list(all_files)
-            merge_message = f"Merge branch '{source}' into '{target}'"
-            from Main import Commit  # Importar la clase Commit
-            parent_id = target_node.commit.id if hasattr(target_node.commit, 'id') else None
-            merge_commit = Commit(
-                message=merge_message,
-                author_email="system@merge",
-                staged_files=merged_files,
-                parent_id=parent_id
-            )
-            commits_list.insert_at_end(merge_commit)
-            target_node.commit = merge_commit
+        if conflicts:
+            print(f"Archivos con conflictos: {', '.join(sorted(conflicts))}")
+
+        # --- Commit de merge ---
+        from Main import Commit  # Importar la clase Commit
+        merge_commit = Commit(
+            message=f"Merge branch '{source}' into '{target}'",
+            author_email="system@merge",
+            staged_files=sorted(merged),
+            parent_id=target_commit.id
+        )
+        merge_commit.merge_parent_id = source_commit.id
+        merge_commit.branch = target
+        merge_commit.file_hashes = dict(merged)  # None = borrado explícito
+        if append_commit:
+            append_commit(merge_commit)
+        else:
+            commit_graph.add(merge_commit)
+        target_node.commit = merge_commit
         return True
 
+    def _print_hunks(self, object_store, filename, base_hash, side_hash, label):
+        """Diff unificado base -> versión de una rama, línea por línea"""
+        from LineDiff import unified_diff
+        from MergeService import blob_lines
+        for line in unified_diff(blob_lines(object_store, base_hash), blob_lines(object_store, side_hash),
+                                 f"base/{filename}", f"{label}/{filename}"):
+            print(line)
+
     def delete_branch(self, branch_name):
         """Elimina una rama por nombre (no permite borrar main)"""
         if branch_name == "main":
             return False
-        parent, branch = self._find_parent_and_node(self.root, None, branch_name)
-        if branch and parent:
-            parent.children = [child for child in parent.children if child.name != branch_name]
+        branch = self.index.get(branch_name)
+        if branch and branch.parent:
+            branch.parent.children.remove(branch)
+            # La rama se elimina junto con sus subramas
+            pending = [branch]
+            while pending:
+                node = pending.pop()
+                del self.index[node.name]
+                self.prefixes.remove(node.name)
+                if self.current_branch is node:
+                    self.current_branch = self.root
+                pending.extend(node.children)
             return True
         return False
 
-    def _find_parent_and_node(self, node, parent, target):
-        if node.name == target:
-            return parent, node
-        for child in node.children:
-            found_parent, found_node = self._find_parent_and_node(child, node, target)
-            if found_node:
-                return found_parent, found_node
-        return None, None
-
     def list_branches_preorder(self, node, prefix=""):
         """Devuelve una lista de ramas en preorden"""
         if not node:
@@ -132,6 +166,8 @@ class BranchTree:
         """Busca una rama por nombre (búsqueda en preorden)"""
         if not node:
             return None
+        if node is self.root:
+            return self.index.get(target)  # Desde la raíz basta con el índice
         if node.name == target:
             return node
         for child in node.children:
@@ -152,4 +188,31 @@ class BranchTree:
     
     def save(self, repo_path):
         with open(f"{repo_path}/branches.json", "w") as f:
-            json.dump(self.to_dict(), f)
\ No newline at end of file
+            json.dump(self.to_dict(), f)
+
+    def load(self, repo_path, commit_lookup=None):
+        """
+        Reconstruye el árbol desde branches.json sin recursión.
+        commit_lookup (id -> Commit) vuelve a enlazar cada rama con su commit.
+        """
+        try:
+            with open(f"{repo_path}/branches.json", "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        self.root = BranchNode(data["name"])
+        self.index = {self.root.name: self.root}
+        self.prefixes = RadixIndex()
+        self.prefixes.insert(self.root.name, self.root)
+        pending = [(data, self.root)]
+        while pending:
+            node_data, node = pending.pop()
+            if node_data.get("commit") and commit_lookup:
+                node.commit = commit_lookup(node_data["commit"])
+            for child_data in node_data.get("children", []):
+                child = BranchNode(child_data["name"], parent=node)
+                node.children.append(child)
+                self.index[child.name] = child
+                self.prefixes.insert(child.name, child)
+                pending.append((child_data, child))
+        self.current_branch = self.root
\ No newline at end of file
@@ -0,0 +1,200 @@
+# 6. Módulo de Grafo de Commits (tabla hash id -> commit)
+import heapq
+
+# Marcas del recorrido por generación
+FROM_FIRST, FROM_SECOND = 1, 2
+
+class CommitGraph:
+    """
+    Índice del historial: cada commit se localiza por id en O(1) y su padre
+    se resuelve una sola vez. El número de generación (1 + generación del
+    padre) se guarda con el commit y permite podar los recorridos de ancestros.
+
+    El grafo solo guarda ids, padres, generación y fecha. Los commits completos
+    se piden a `loader` la primera vez que se necesitan y quedan en caché.
+    """
+    def __init__(self, loader=None):
+        self.parent_ids = {}   # id -> [ids de los padres]
+        self.generations = {}  # id -> generación
+        self.timestamps = {}   # id -> fecha del commit
+        self.order = []        # ids en orden de creación
+        self.commits = {}      # id -> Commit ya deserializado
+        self.loader = loader   # Función id -> Commit para carga perezosa
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, commit_id):
+        return commit_id in self.generations
+
+    @property
+    def head_id(self):
+        """Id del último commit creado"""
+        return self.order[-1] if self.order else None
+
+    def add_entry(self, commit_id, parent_ids, generation, timestamp):
+        """Registra un commit sin deserializarlo (desde el índice de offsets)"""
+        self.parent_ids[commit_id] = parent_ids
+        self.generations[commit_id] = generation
+        self.timestamps[commit_id] = timestamp
+        self.order.append(commit_id)
+
+    def add(self, commit):
+        """Registra un commit nuevo; calcula su generación si no venía persistida"""
+        parent_ids = [p for p in (commit.parent_id, commit.merge_parent_id) if p]
+        if not commit.generation:
+            commit.generation = 1 + max((self.generations.get(p, 0) for p in parent_ids), default=0)
+        self.add_entry(commit.id, parent_ids, commit.generation, commit.timestamp)
+        self.commits[commit.id] = commit
+
+    def get(self, commit_id):
+        commit = self.commits.get(commit_id)
+        if commit is None and commit_id in self.generations and self.loader:
+            commit = self.loader(commit_id)
+            self.commits[commit_id] = commit
+        return commit
+
+    def parents(self, commit):
+        """Commits padre ya resueltos por id"""
+        return [self.get(p) for p in self.parent_ids.get(commit.id, []) if p in self.generations]
+
+    def ancestor_ids(self, commit_id):
+        """Recorre los ids del commit y sus ancestros sin deserializarlos"""
+        if commit_id not in self.generations:
+            return
+        seen = {commit_id}
+        pending = [commit_id]
+        while pending:
+            current = pending.pop()
+            yield current
+            for parent_id in self.parent_ids.get(current, []):
+                if parent_id in self.generations and parent_id not in seen:
+                    seen.add(parent_id)
+                    pending.append(parent_id)
+
+    def ancestors(self, commit_id):
+        """Recorre el commit y sus ancestros (cada uno una sola vez)"""
+        for current in self.ancestor_ids(commit_id):
+            yield self.get(current)
+
+    def is_ancestor(self, ancestor_id, descendant_id):
+        """Indica si ancestor_id es alcanzable desde descendant_id"""
+        if ancestor_id not in self.generations or descendant_id not in self.generations:
+            return False
+        limit = self.generations[ancestor_id]
+        seen = {descendant_id}
+        pending = [descendant_id]
+        while pending:
+            current = pending.pop()
+            if current == ancestor_id:
+                return True
+            for parent_id in self.parent_ids.get(current, []):
+                # Un padre con generación menor que la del ancestro no puede llegar a él
+                if (parent_id not in seen and parent_id in self.generations
+                        and self.generations[parent_id] >= limit):
+                    seen.add(parent_id)
+                    pending.append(parent_id)
+        return False
+
+    def _paint(self, first_id, second_id, until_covered=False):
+        """
+        Recorre los ancestros de ambos commits a la vez, siempre por el de
+        mayor generación, y genera (id, marcas) con las marcas ya completas:
+        todos los hijos de un commit salen del montículo antes que él.
+        Con until_covered se detiene cuando todo lo pendiente es alcanzable
+        desde second_id.
+        """
+        flags = {}
+        heap = []
+        for commit_id, flag in ((first_id, FROM_FIRST), (second_id, FROM_SECOND)):
+            if commit_id in self.generations:
+                if commit_id not in flags:
+                    heapq.heappush(heap, (-self.generations[commit_id], commit_id))
+                flags[commit_id] = flags.get(commit_id, 0) | flag
+        first_only = sum(1 for value in flags.values() if value == FROM_FIRST)
+        while heap and (first_only or not until_covered):
+            _, current = heapq.heappop(heap)
+            current_flags = flags[current]
+            if current_flags == FROM_FIRST:
+                first_only -= 1
+            yield current, current_flags
+            for parent_id in self.parent_ids.get(current, []):
+                if parent_id not in self.generations:
+                    continue
+                previous = flags.get(parent_id)
+                if previous is None:
+                    previous = 0
+                    heapq.heappush(heap, (-self.generations[parent_id], parent_id))
+                flags[parent_id] = previous | current_flags
+                if flags[parent_id] == FROM_FIRST and previous != FROM_FIRST:
+                    first_only += 1
+                elif previous == FROM_FIRST and flags[parent_id] != FROM_FIRST:
+                    first_only -= 1
+
+    def merge_base(self, first_id, second_id):
+        """
+        Ancestro común más reciente. El primer commit alcanzado desde ambos
+        lados es el de mayor generación, así que el costo depende de cuánto
+        divergieron las ramas y no del tamaño del historial.
+        """
+        for commit_id, flags in self._paint(first_id, second_id):
+            if flags == FROM_FIRST | FROM_SECOND:
+                return commit_id
+        return None
+
+    def changed_since(self, base_id, tip_id):
+        """
+        Archivos modificados por los commits alcanzables desde tip_id pero no
+        desde base_id: {archivo: sha1 del blob más reciente, o None si se borró}.
+        Solo cuentan los archivos con entrada en file_hashes (None = borrado
+        explícito): los commits antiguos o sin hashes no dicen qué contenido
+        dejaron, así que no se toman como borrados.
+        """
+        changes = {}
+        for commit_id, flags in self._paint(tip_id, base_id, until_covered=True):
+            if flags == FROM_FIRST:
+                for filename, sha1_hash in self.get(commit_id).file_hashes.items():
+                    changes.setdefault(filename, sha1_hash)
+        return changes
+
+    def blobs_at(self, commit_id, filenames):
+        """
+        {archivo: sha1} de varios archivos tal como estaban en commit_id
+        (None si no existían), con un único recorrido de ancestros. Un commit
+        que nombra el archivo sin registrar su hash no lo resuelve: se sigue
+        buscando en sus ancestros.
+        """
+        missing = set(filenames)
+        found = dict.fromkeys(missing)
+        for current, _ in self._paint(commit_id, None):
+            if not missing:
+                break
+            commit = self.get(current)
+            for filename in missing.intersection(commit.file_hashes):
+                found[filename] = commit.file_hashes[filename]
+                missing.discard(filename)
+        return found
+
+    def blob_at(self, commit_id, filename):
+        """Sha1 del archivo tal como estaba en commit_id (None si no existía)"""
+        return self.blobs_at(commit_id, [filename])[filename]
+
+    def files_at(self, commit_id):
+        """Archivos registrados en la historia que termina en commit_id"""
+        files = set()
+        for commit in self.ancestors(commit_id):
+            files.update(commit.staged_files)
+        return files
+
+    def iter_newest_first(self, since=None, until=None):
+        """
+        Genera ids del más reciente al más antiguo, filtrando por fecha
+        ("YYYY-MM-DD" o "YYYY-MM-DD HH:MM:SS") sin deserializar los commits.
+        """
+        for commit_id in reversed(self.order):
+            timestamp = self.timestamps[commit_id]
+            if since and timestamp < since:
+                continue
+            if until and timestamp[:len(until)] > until:
+                continue
+            yield commit_id
@@ -0,0 +1,327 @@
+# 10. Módulo de Diario de Commits (registro de solo anexado)
+import json
+import os
+import threading
+from itertools import chain
+
+FSYNC_EVERY = 32       # Registros entre cada fsync (commit en grupo)
+COMPACT_EVERY = 1000   # Registros del diario antes de compactar en segundo plano
+INDEX_VERSION = 1
+
+# Segmentos donde puede estar un registro
+SNAPSHOT, JOURNAL, COMPACTING = "s", "j", "c"
+
+class CommitJournal:
+    """
+    Persistencia del historial en dos partes:
+    - repo_path/commits.json: instantánea compactada (arreglo JSON, un commit por línea)
+    - repo_path/.git/commits.journal: un registro JSON por línea con los commits nuevos
+    Cada commit cuesta una línea anexada. Cuando el diario crece, un hilo
+    copia sus líneas al final de la instantánea sin volver a parsearlas.
+
+    El índice .git/commits.idx guarda por commit (id, padres, generación,
+    fecha, segmento, offset), así que el historial se puede recorrer sin
+    deserializar los commits: cada uno se lee del disco solo cuando se pide.
+    """
+    def __init__(self, repo_path, snapshot_name="commits.json",
+                 fsync_every=FSYNC_EVERY, compact_every=COMPACT_EVERY):
+        self.snapshot_path = os.path.join(repo_path, snapshot_name)
+        self.journal_path = os.path.join(repo_path, ".git", "commits.journal")
+        self.compacting_path = self.journal_path + ".compacting"
+        self.index_path = os.path.join(repo_path, ".git", "commits.idx")
+        self.fsync_every = fsync_every
+        self.compact_every = compact_every
+        self.journal_records = 0  # Registros en el diario activo
+        self.entries = []         # [id, padres, generación, fecha, segmento, offset] en orden
+        self.locations = {}       # id -> entrada de self.entries
+        self._unsynced = 0
+        self._file = None
+        self._index_file = None
+        self._thread = None
+        self._lock = threading.Lock()  # Protege ubicaciones e índice durante la compactación
+        self._recovered = False
+        if os.path.exists(self.compacting_path):
+            # Una compactación quedó a medias: terminarla antes de leer
+            self._compact(self.compacting_path)
+            self._recovered = True
+
+    def _segment_path(self, segment):
+        return {SNAPSHOT: self.snapshot_path, JOURNAL: self.journal_path,
+                COMPACTING: self.compacting_path}[segment]
+
+    # --- Índice de offsets ---
+    def load_index(self):
+        """
+        Devuelve [(id, padres, generación, fecha)] en orden de creación.
+        Si el índice falta o no coincide con los archivos, se reconstruye.
+        """
+        self._repair_journal_tail()
+        if self._recovered or not self._read_index():
+            self._rebuild_index()
+        self.journal_records = sum(1 for entry in self.entries if entry[4] == JOURNAL)
+        return [(entry[0], entry[1], entry[2], entry[3]) for entry in self.entries]
+
+    def _repair_journal_tail(self):
+        """Quita una última línea incompleta para que el próximo anexado no la corrompa"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as f:
+            data_end = f.seek(0, os.SEEK_END)
+            if data_end == 0:
+                return
+            f.seek(data_end - 1)
+            if f.read(1) == b"\n":
+                return
+            position = data_end
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                block = f.read(step)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    f.truncate(position - step + newline + 1)
+                    return
+                position -= step
+            f.truncate(0)
+
+    def _file_size(self, path):
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return False
+        entries = []
+        with open(self.index_path, "r") as f:
+            header = f.readline().split()
+            if header[:2] != ["#", str(INDEX_VERSION)] or int(header[2]) != self._file_size(self.snapshot_path):
+                return False
+            for line in f:
+                commit_id, parents, generation, timestamp, segment, offset = line.rstrip("\n").split("\t")
+                entries.append([commit_id, parents.split(",") if parents != "-" else [],
+                                int(generation), timestamp, segment, int(offset)])
+        # La última entrada del diario debe terminar justo donde termina el archivo
+        journal_entries = [entry for entry in entries if entry[4] == JOURNAL]
+        journal_size = self._file_size(self.journal_path)
+        if journal_entries:
+            with open(self.journal_path, "rb") as f:
+                f.seek(journal_entries[-1][5])
+                f.readline()
+                if f.tell() != journal_size:
+                    return False
+        elif journal_size:
+            return False
+        if any(entry[4] == COMPACTING for entry in entries):
+            return False
+        self._set_entries(entries)
+        return True
+
+    def _set_entries(self, entries):
+        self.entries = entries
+        self.locations = {entry[0]: entry for entry in entries}
+
+    def _rebuild_index(self):
+        """Recorre instantánea y diario una vez para volver a generar el índice"""
+        if not self._snapshot_is_line_format():
+            self._compact(None)  # Convierte la instantánea antigua al formato de una línea por commit
+        entries = []
+        generations = {}
+        for segment in (SNAPSHOT, JOURNAL):
+            for offset, record in self._scan_segment(segment):
+                entries.append(self._entry_for(record, segment, offset, generations))
+        self._set_entries(entries)
+        if entries:
+            self._write_index()  # Un repositorio vacío aún no tiene .git/commits.idx
+
+    def _entry_for(self, record, segment, offset, generations):
+        parents = [p for p in (record.get("parent_id"), record.get("merge_parent_id")) if p]
+        generation = record.get("generation") or 1 + max((generations.get(p, 0) for p in parents), default=0)
+        generations[record["id"]] = generation
+        return [record["id"], parents, generation, record["timestamp"], segment, offset]
+
+    def _scan_segment(self, segment):
+        path = self._segment_path(segment)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                stripped = line.strip().rstrip(b",")
+                if stripped.startswith(b"{"):
+                    try:
+                        yield offset, json.loads(stripped)
+                    except ValueError:
+                        break
+                offset += len(line)
+
+    def _index_line(self, entry):
+        parents = ",".join(entry[1]) if entry[1] else "-"
+        return f"{entry[0]}\t{parents}\t{entry[2]}\t{entry[3]}\t{entry[4]}\t{entry[5]}\n"
+
+    def _write_index(self):
+        if self._index_file:
+            self._index_file.close()
+            self._index_file = None
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"# {INDEX_VERSION} {self._file_size(self.snapshot_path)}\n")
+            for entry in self.entries:
+                f.write(self._index_line(entry))
+        os.replace(tmp_path, self.index_path)
+
+    def read(self, commit_id):
+        """Deserializa un único commit leyendo solo su línea"""
+        with self._lock:
+            entry = self.locations.get(commit_id)
+            if not entry:
+                return None
+            with open(self._segment_path(entry[4]), "rb") as f:
+                f.seek(entry[5])
+                line = f.readline()
+        return json.loads(line.strip().rstrip(b","))
+
+    def read_records(self):
+        """Recorre todos los registros en orden: instantánea y luego diario"""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                yield from json.load(f)
+        for _, record in self._scan_segment(JOURNAL):
+            yield record
+
+    # --- Escritura ---
+    def append(self, record):
+        """Anexa un commit al diario; fsync cada fsync_every registros"""
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                self._file = open(self.journal_path, "ab")
+            offset = self._file.tell()
+            self._file.write(json.dumps(record).encode() + b"\n")
+            self._file.flush()
+            if self._index_file is None:
+                # Se crea con las entradas previas: la nueva se anexa abajo una sola vez
+                if not os.path.exists(self.index_path):
+                    self._write_index()
+                self._index_file = open(self.index_path, "a")
+            parents = [self.locations.get(record.get(key)) for key in ("parent_id", "merge_parent_id")]
+            entry = self._entry_for(record, JOURNAL, offset, {p[0]: p[2] for p in parents if p})
+            self.entries.append(entry)
+            self.locations[entry[0]] = entry
+            self._index_file.write(self._index_line(entry))
+            self._index_file.flush()
+        self.journal_records += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+        if self.journal_records >= self.compact_every:
+            self.compact()
+
+    def sync(self):
+        # Con el lock: la compactación en segundo plano cierra y reemplaza _index_file
+        with self._lock:
+            if self._file and self._unsynced:
+                os.fsync(self._file.fileno())
+                if self._index_file:
+                    os.fsync(self._index_file.fileno())
+                self._unsynced = 0
+
+    def compact(self, wait=False):
+        """Rota el diario y lo integra a la instantánea en un hilo aparte"""
+        self.wait()
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if not os.path.exists(self.journal_path):
+            return
+        with self._lock:
+            os.replace(self.journal_path, self.compacting_path)
+            for entry in self.entries:
+                if entry[4] == JOURNAL:
+                    entry[4] = COMPACTING
+        self.journal_records = 0
+        self._thread = threading.Thread(target=self._compact, args=(self.compacting_path,),
+                                        name="commit-compaction")
+        self._thread.start()
+        if wait:
+            self.wait()
+
+    def wait(self):
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _compact(self, journal_path):
+        """
+        Escribe una nueva instantánea = instantánea actual + diario rotado,
+        anotando el offset de cada línea para actualizar el índice.
+        """
+        tmp_path = self.snapshot_path + ".tmp"
+        folded_ids = set()
+        offsets = []
+        journal_lines = []
+        if journal_path:
+            for _, record in self._scan_segment(COMPACTING):
+                journal_lines.append((record["id"], json.dumps(record)))
+        journal_ids = {commit_id for commit_id, _ in journal_lines}
+        with open(tmp_path, "wb") as out:
+            out.write(b"[")
+            first = True
+            for commit_id, line in chain(self._snapshot_lines(), journal_lines):
+                if commit_id in folded_ids:
+                    continue  # Ya estaba en la instantánea (compactación interrumpida)
+                if commit_id in journal_ids:
+                    folded_ids.add(commit_id)
+                out.write(b"\n" if first else b",\n")
+                first = False
+                offsets.append(out.tell())
+                out.write(line.encode())
+            out.write(b"\n]\n")
+            out.flush()
+            os.fsync(out.fileno())
+        with self._lock:
+            os.replace(tmp_path, self.snapshot_path)
+            if journal_path:
+                os.remove(journal_path)
+            # Los primeros registros del historial ahora viven en la instantánea
+            for entry, offset in zip(self.entries, offsets):
+                entry[4] = SNAPSHOT
+                entry[5] = offset
+            if self.entries:
+                self._write_index()
+
+    def _snapshot_is_line_format(self):
+        if not os.path.exists(self.snapshot_path):
+            return True
+        with open(self.snapshot_path, "r") as f:
+            first = f.readline()
+            second = f.readline()
+        return first.strip() == "[" and second.startswith(("{", "]"))
+
+    def _snapshot_lines(self):
+        """(id, línea) de cada commit de la instantánea, sin reparsear el JSON"""
+        if not os.path.exists(self.snapshot_path):
+            return
+        if not self._snapshot_is_line_format():
+            # Formato anterior (json.dump con indent): convertir una sola vez
+            with open(self.snapshot_path, "r") as f:
+                for record in json.load(f):
+                    yield record["id"], json.dumps(record)
+            return
+        with open(self.snapshot_path, "r") as f:
+            f.readline()
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith("{"):
+                    line = line.rstrip(",")
+                    # to_dict() siempre escribe "id" primero: {"id": "abc1234", ...
+                    yield line.split('"', 4)[3], line
+
+    def close(self):
+        self.wait()
+        self.sync()
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._index_file:
+            self._index_file.close()
+            self._index_file = None
@@ -1,116 +1,308 @@
-# 2. Módulo de Colaboradores (Árbol Binario de Búsqueda)
+# 2. Módulo de Colaboradores (Árbol Rojo-Negro)
 import json
+import os
+
+from RadixIndex import RadixIndex
+
+RED, BLACK = True, False
 
 class ContributorNode:
-    def __init__(self, name, role):
+    def __init__(self, name, role, parent=None):
         self.name = name
         self.role = role
         self.left = None
         self.right = None
+        self.parent = parent
+        self.color = RED  # Todo nodo nuevo entra rojo
+
+def _is_red(node):
+    return node is not None and node.color == RED
 
 class ContributorsBST:
+    """
+    Árbol rojo-negro de colaboradores ordenado por nombre. La altura queda
+    acotada a 2·log2(n+1) aunque se inserte en orden (como en una lista
+    exportada), y todas las operaciones son iterativas: no hay límite de
+    recursión sin importar la cantidad de colaboradores.
+    """
     def __init__(self):
         self.root = None
-    
+        self.size = 0
+        self.prefixes = RadixIndex()  # nombre -> nodo, para búsquedas por prefijo
+
+    def __len__(self):
+        return self.size
+
     def insert(self, name, role):
-        if not self.root:
-            self.root = ContributorNode(name, role)
-        else:
-            self._insert_recursive(self.root, name, role)
-    
-    def _insert_recursive(self, node, name, role):
-        if name < node.name:
-            if node.left:
-                self._insert_recursive(node.left, name, role)
+        parent = None
+        node = self.root
+        while node:
+            parent = node
+            if name < node.name:
+                node = node.left
+            elif name > node.name:
+                node = node.right
             else:
-                node.left = ContributorNode(name, role)
-        elif name > node.name:
-            if node.right:
-                self._insert_recursive(node.right, name, role)
+                raise Exception("Colaborador ya existe")
+        new_node = ContributorNode(name, role, parent)
+        if parent is None:
+            self.root = new_node
+        elif name < parent.name:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self.size += 1
+        self.prefixes.insert(name, new_node)
+        self._fix_insert(new_node)
+
+    def _fix_insert(self, node):
+        while _is_red(node.parent):
+            parent = node.parent
+            grandparent = parent.parent
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if _is_red(uncle):
+                    # Tío rojo: recolorear y seguir subiendo
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                    continue
+                if node is parent.right:
+                    node = parent
+                    self._rotate_left(node)
+                    parent = node.parent
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_right(grandparent)
             else:
-                node.right = ContributorNode(name, role)
+                uncle = grandparent.left
+                if _is_red(uncle):
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                    continue
+                if node is parent.left:
+                    node = parent
+                    self._rotate_right(node)
+                    parent = node.parent
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_left(grandparent)
+        self.root.color = BLACK
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        if pivot.left:
+            pivot.left.parent = node
+        self._replace(node, pivot)
+        pivot.left = node
+        node.parent = pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        if pivot.right:
+            pivot.right.parent = node
+        self._replace(node, pivot)
+        pivot.right = node
+        node.parent = pivot
+
+    def _replace(self, old, new):
+        """Pone new en el lugar que ocupa old bajo su padre"""
+        parent = old.parent
+        if parent is None:
+            self.root = new
+        elif old is parent.left:
+            parent.left = new
         else:
-            raise Exception("Colaborador ya existe")
-    
+            parent.right = new
+        if new:
+            new.parent = parent
+
+    def _iter_nodes(self):
+        """Recorrido en orden iterativo"""
+        pending = []
+        node = self.root
+        while pending or node:
+            while node:
+                pending.append(node)
+                node = node.left
+            node = pending.pop()
+            yield node
+            node = node.right
+
     def list_inorder(self):
-        return self._inorder_traversal(self.root, [])
-    
-    def _inorder_traversal(self, node, result):
-        if node:
-            self._inorder_traversal(node.left, result)
-            result.append(f"{node.name} ({node.role})")
-            self._inorder_traversal(node.right, result)
-        return result
-    
+        return [f"{node.name} ({node.role})" for node in self._iter_nodes()]
+
+    def find_prefix(self, prefix):
+        """Colaboradores cuyo nombre empieza con prefix, en orden (sin recorrer el árbol)"""
+        return [node for _, node in self.prefixes.items(prefix)]
+
     def find(self, name):
-        return self._find_recursive(self.root, name)
-    
-    def _find_recursive(self, node, name):
-        if not node:
-            return None
-        if name == node.name:
-            return node
-        elif name < node.name:
-            return self._find_recursive(node.left, name)
-        else:
-            return self._find_recursive(node.right, name)
-    
+        node = self.root
+        while node:
+            if name == node.name:
+                return node
+            node = node.left if name < node.name else node.right
+        return None
+
     def delete(self, name):
-        self.root = self._delete_recursive(self.root, name)
-    
-    def _delete_recursive(self, node, name):
+        node = self.find(name)
         if not node:
-            return node
-        
-        if name < node.name:
-            node.left = self._delete_recursive(node.left, name)
-        elif name > node.name:
-            node.right = self._delete_recursive(node.right, name)
-        else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-            
-            temp = self._min_value_node(node.right)
-            node.name = temp.name
-            node.role = temp.role
-            node.right = self._delete_recursive(node.right, temp.name)
-        return node
-    
+            return
+        self.prefixes.remove(name)
+        if node.left and node.right:
+            # Dos hijos: se copia el sucesor y se elimina su nodo (tiene a lo sumo un hijo)
+            successor = self._min_value_node(node.right)
+            node.name = successor.name
+            node.role = successor.role
+            self.prefixes.insert(node.name, node)
+            node = successor
+        child = node.left or node.right
+        parent = node.parent
+        self._replace(node, child)
+        self.size -= 1
+        if node.color == BLACK:
+            if _is_red(child):
+                child.color = BLACK
+            else:
+                self._fix_delete(child, parent)
+
+    def _fix_delete(self, node, parent):
+        """node (posiblemente None) tiene un negro de menos; parent es su padre"""
+        while node is not self.root and not _is_red(node):
+            if node is parent.left:
+                sibling = parent.right
+                if _is_red(sibling):
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.color = RED
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.right):
+                    sibling.left.color = BLACK
+                    sibling.color = RED
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.right.color = BLACK
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if _is_red(sibling):
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.color = RED
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.color = BLACK
+                    sibling.color = RED
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.left.color = BLACK
+                self._rotate_right(parent)
+            node = self.root
+        if node:
+            node.color = BLACK
+
     def _min_value_node(self, node):
         current = node
         while current.left:
             current = current.left
         return current
-    
+
+    def build_sorted(self, records):
+        """
+        Reemplaza el árbol con los pares (nombre, rol) de records, ya ordenados
+        por nombre y sin repetidos, en O(n) y sin recursión. Con la mediana
+        como raíz de cada tramo todos los niveles quedan llenos salvo el
+        último; sus nodos van en rojo y el resto en negro, así cada camino
+        tiene la misma cantidad de negros.
+        """
+        records = list(records)
+        self.root = None
+        self.size = len(records)
+        self.prefixes = RadixIndex()
+        deepest = self.size.bit_length() - 1  # Profundidad del último nivel
+        pending = [(0, self.size, None, None, 0)]  # (inicio, fin, padre, ¿derecho?, profundidad)
+        while pending:
+            lo, hi, parent, side, depth = pending.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            name, role = records[mid]
+            node = ContributorNode(name, role, parent)
+            self.prefixes.insert(name, node)
+            if depth != deepest or depth == 0:
+                node.color = BLACK
+            if parent is None:
+                self.root = node
+            elif side:
+                parent.right = node
+            else:
+                parent.left = node
+            if depth < deepest:
+                pending.append((lo, mid, node, False, depth + 1))
+                pending.append((mid + 1, hi, node, True, depth + 1))
+
     def save(self, repo_path):
-        data = self._serialize(self.root)
-        with open(f"{repo_path}/contributors.json", "w") as f:
-            json.dump(data, f)
-    
+        """
+        Escribe contributors.json como un arreglo plano de [nombre, rol]
+        ordenado por nombre, un registro por línea, sin armar el documento
+        completo en memoria.
+        """
+        path = f"{repo_path}/contributors.json"
+        with open(path + ".tmp", "w") as f:
+            f.write("[")
+            separator = "\n"
+            for node in self._iter_nodes():
+                f.write(separator + json.dumps([node.name, node.role]))
+                separator = ",\n"
+            f.write("\n]\n")
+        os.replace(path + ".tmp", path)
+
     def load(self, repo_path):
         try:
-            with open(f"{repo_path}/contributors.json", "r") as f:
-                data = json.load(f)
-                self.root = self._deserialize(data)
+            f = open(f"{repo_path}/contributors.json", "r")
         except FileNotFoundError:
-            pass
-    
-    def _serialize(self, node):
-        if not node:
-            return None
-        return {
-            "name": node.name,
-            "role": node.role,
-            "left": self._serialize(node.left),
-            "right": self._serialize(node.right)
-        }
-    
+            return
+        with f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == "[":
+                records = self._read_records(f)
+            else:
+                # Formato anterior: árbol anidado {name, role, left, right} (o null)
+                records = self._deserialize(json.loads(first + f.read()))
+            self.build_sorted(records)
+
+    def _read_records(self, f):
+        """Registros del formato plano, leídos línea por línea"""
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line and line != "]":
+                name, role = json.loads(line)
+                yield name, role
+
     def _deserialize(self, data):
-        if not data:
-            return None
-        node = ContributorNode(data["name"], data["role"])
-        node.left = self._deserialize(data["left"])
-        node.right = self._deserialize(data["right"])
-        return node
\ No newline at end of file
+        """Pares (nombre, rol) del árbol anidado del formato anterior, en orden"""
+        pending = []
+        while pending or data:
+            while data:
+                pending.append(data)
+                data = data.get("left")
+            data = pending.pop()
+            yield data["name"], data["role"]
+            data = data.get("right")
@@ -0,0 +1,69 @@
+# 9. Módulo de Hashing de Archivos (pool de hilos)
+import os
+from functools import partial
+
+MIN_PARALLEL = 4             # Con menos archivos no compensa usar el pool
+BUFFER_SIZE = 1024 * 1024    # Bytes leídos por bloque (memoria máxima por hilo)
+
+def iter_chunks(f, buffer_size=None):
+    """
+    Lee un archivo binario por bloques reutilizando un único buffer.
+    Cada bloque es una vista que se sobrescribe en la siguiente iteración,
+    así que quien lo recibe debe consumirlo antes de pedir el siguiente.
+    """
+    buffer = bytearray(buffer_size or BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        size = f.readinto(buffer)
+        if not size:
+            break
+        yield view[:size]
+
+def sha1_file(file_path, buffer_size=None):
+    """SHA-1 del contenido de un archivo leído en streaming, o None si ya no existe"""
+    import hashlib
+    sha = hashlib.sha1()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter_chunks(f, buffer_size):
+                sha.update(chunk)
+    except FileNotFoundError:
+        return None
+    return sha.hexdigest()
+
+class HashService:
+    """
+    Hashea lotes de archivos en un pool de hilos. hashlib libera el GIL con
+    buffers grandes, así que el trabajo escala con los núcleos disponibles.
+    Los resultados se devuelven en el mismo orden que las rutas recibidas.
+    La memoria usada es como máximo buffer_size por hilo, sin importar el
+    tamaño de los archivos.
+    """
+    def __init__(self, max_workers=None, buffer_size=BUFFER_SIZE):
+        self.max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self.buffer_size = buffer_size
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # concurrent.futures solo se importa si hay un lote que lo justifique
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="hash")
+        return self._executor
+
+    def map(self, func, items):
+        """Aplica func a cada elemento en paralelo conservando el orden"""
+        items = list(items)
+        if len(items) < MIN_PARALLEL or self.max_workers == 1:
+            return [func(item) for item in items]
+        return list(self._pool().map(func, items))
+
+    def hash_files(self, file_paths):
+        """Lista de SHA-1 (o None) en el orden de file_paths"""
+        return self.map(partial(sha1_file, buffer_size=self.buffer_size), file_paths)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
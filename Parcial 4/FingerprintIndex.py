@@ -0,0 +1,40 @@
+# 7. Módulo de Huellas de Commits (tabla hash persistente)
+import os
+
+class FingerprintIndex:
+    """
+    Conjunto de huellas (hash de mensaje + archivos) de todos los commits.
+    Se guarda en repo_path/.git/fingerprints, una huella por línea y solo
+    por anexado, así que detectar un commit redundante es una búsqueda O(1).
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.fingerprints = set()
+        self._file = None
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.fingerprints.update(line.strip() for line in f if line.strip())
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def contains(self, fingerprint):
+        return fingerprint in self.fingerprints
+
+    def add(self, fingerprint):
+        """Registra una huella; solo escribe en disco si es nueva"""
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        if self.path:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.write(fingerprint + "\n")
+            self._file.flush()
+        return True
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
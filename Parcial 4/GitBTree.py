@@ -1,4 +1,9 @@
 # 3. Módulo de Archivos Git (B-Tree)
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
 class BTreeNode:
     def __init__(self, t):
         self.t = t  # Grado mínimo
@@ -13,19 +18,64 @@ class GitBTree:
     def __init__(self, t):
         self.root = BTreeNode(t)
         self.t = t
-    
+
+    @classmethod
+    def bulk_load(cls, sorted_hashes, t=50):
+        """
+        Construye el árbol de abajo hacia arriba a partir de hashes ordenados,
+        en O(n) y sin divisiones: las hojas se llenan parejas (a lo sumo 2t-1
+        claves, al menos t-1) y la clave entre dos nodos vecinos sube como
+        separador al nivel de arriba, que se arma igual hasta llegar a la raíz.
+        """
+        tree = cls(t)
+        keys = []
+        for sha1_hash in sorted_hashes:
+            if keys and sha1_hash <= keys[-1]:
+                if sha1_hash == keys[-1]:
+                    continue
+                raise Exception("bulk_load requiere hashes ordenados")
+            keys.append(sha1_hash)
+        if not keys:
+            return tree
+        nodes, separators = tree._pack_level(keys, None)
+        while len(nodes) > 1:
+            nodes, separators = tree._pack_level(separators, nodes)
+        tree.root = nodes[0]
+        return tree
+
+    def _pack_level(self, keys, children):
+        """Reparte keys (y children, si no es el nivel de hojas) en nodos de un nivel"""
+        capacity = 2 * self.t - 1
+        count = -(-(len(keys) + 1) // (capacity + 1))  # Nodos necesarios (techo)
+        base, extra = divmod(len(keys) - (count - 1), count)
+        nodes, separators = [], []
+        position = child_position = 0
+        for index in range(count):
+            size = base + (1 if index < extra else 0)
+            node = BTreeNode(self.t)
+            node.keys = keys[position:position + size]
+            position += size
+            if children is not None:
+                node.leaf = False
+                node.children = children[child_position:child_position + size + 1]
+                child_position += size + 1
+            nodes.append(node)
+            if index < count - 1:
+                separators.append(keys[position])
+                position += 1
+        return nodes, separators
+
     def search(self, sha1_hash, node=None):
-        """Búsqueda eficiente de un hash SHA-1 en el B-Tree"""
+        """Búsqueda de un hash SHA-1 en el B-Tree (búsqueda binaria dentro de cada nodo)"""
         if node is None:
             node = self.root
-        i = 0
-        while i < len(node.keys) and sha1_hash > node.keys[i]:
-            i += 1
-        if i < len(node.keys) and sha1_hash == node.keys[i]:
-            return True
-        if node.leaf:
-            return False
-        return self.search(sha1_hash, node.children[i])
+        while True:
+            i = bisect_left(node.keys, sha1_hash)
+            if i < len(node.keys) and sha1_hash == node.keys[i]:
+                return True
+            if node.leaf:
+                return False
+            node = node.children[i]
 
     def insert(self, sha1_hash):
         """Inserta un nuevo hash SHA-1 en el B-Tree"""
@@ -41,35 +91,28 @@ class GitBTree:
             self._insert_non_full(root, sha1_hash)
 
     def _insert_non_full(self, node, sha1_hash):
-        i = len(node.keys) - 1
-        if node.leaf:
-            node.keys.append(None)
-            while i >= 0 and sha1_hash < node.keys[i]:
-                node.keys[i + 1] = node.keys[i]
-                i -= 1
-            node.keys[i + 1] = sha1_hash
-        else:
-            while i >= 0 and sha1_hash < node.keys[i]:
-                i -= 1
-            i += 1
+        while not node.leaf:
+            i = bisect_right(node.keys, sha1_hash)
             if node.children[i].is_full():
                 self._split_child(node, i)
                 if sha1_hash > node.keys[i]:
                     i += 1
-            self._insert_non_full(node.children[i], sha1_hash)
+            node = node.children[i]
+        node.keys.insert(bisect_right(node.keys, sha1_hash), sha1_hash)
 
     def _split_child(self, parent, i):
         t = self.t
         y = parent.children[i]
         z = BTreeNode(t)
         z.leaf = y.leaf
+        median = y.keys[t - 1]  # Sube al padre
         z.keys = y.keys[t:]
-        y.keys = y.keys[:t-1]
+        y.keys = y.keys[:t - 1]
         if not y.leaf:
             z.children = y.children[t:]
             y.children = y.children[:t]
         parent.children.insert(i + 1, z)
-        parent.keys.insert(i, y.keys.pop())
+        parent.keys.insert(i, median)
 
     def delete(self, sha1_hash):
         """Elimina un hash SHA-1 del B-Tree"""
@@ -80,9 +123,7 @@ class GitBTree:
 
     def _delete(self, node, sha1_hash):
         t = self.t
-        i = 0
-        while i < len(node.keys) and sha1_hash > node.keys[i]:
-            i += 1
+        i = bisect_left(node.keys, sha1_hash)
         if node.leaf:
             if i < len(node.keys) and node.keys[i] == sha1_hash:
                 node.keys.pop(i)
@@ -94,6 +135,8 @@ class GitBTree:
         # Caso 2: clave no encontrada, buscar en hijo adecuado
         if len(node.children[i].keys) < t:
             self._fill(node, i)
+            if i > len(node.keys):
+                i -= 1  # El último hijo se fusionó con su hermano izquierdo
         return self._delete(node.children[i], sha1_hash)
 
     def _delete_internal_node(self, node, sha1_hash, idx):
@@ -171,4 +214,292 @@ class GitBTree:
         if not node.leaf:
             for child in node.children:
                 self.preorder_traversal(child, result)
-        return result
\ No newline at end of file
+        return result
+
+# Modo persistente: B+Tree paginado en disco con caché LRU
+PAGE_SIZE = 4096
+PAGE_MAGIC = b"GBPT"
+PAGE_VERSION = 1
+_META = struct.Struct(">4sHIIQ")       # magic, versión, raíz, nº de páginas, nº de claves
+_HEADER = struct.Struct(">BHI")        # tipo, nº de claves, siguiente hoja
+_LEAF, _INTERNAL = 0, 1
+KEY_SIZE = 20                          # SHA-1 binario
+LEAF_MAX = (PAGE_SIZE - _HEADER.size) // KEY_SIZE
+INTERNAL_MAX = (PAGE_SIZE - _HEADER.size - 4) // (KEY_SIZE + 4)
+
+class BPlusPage:
+    def __init__(self, page_no, leaf=True):
+        self.page_no = page_no
+        self.leaf = leaf
+        self.keys = []       # Hashes SHA-1 en binario (ordenados)
+        self.children = []   # Números de página de los hijos (solo nodos internos)
+        self.next = 0        # Siguiente hoja (0 = ninguna, la página 0 es metadatos)
+
+    def to_bytes(self):
+        kind = _LEAF if self.leaf else _INTERNAL
+        data = _HEADER.pack(kind, len(self.keys), self.next) + b"".join(self.keys)
+        if not self.leaf:
+            data += struct.pack(f">{len(self.children)}I", *self.children)
+        return data.ljust(PAGE_SIZE, b"\0")
+
+    @classmethod
+    def from_bytes(cls, page_no, data):
+        if len(data) != PAGE_SIZE:
+            raise Exception(f"Página {page_no} incompleta ({len(data)} bytes)")
+        kind, count, next_leaf = _HEADER.unpack_from(data)
+        if kind not in (_LEAF, _INTERNAL) or count > (LEAF_MAX if kind == _LEAF else INTERNAL_MAX):
+            raise Exception(f"Página {page_no} dañada")
+        page = cls(page_no, leaf=(kind == _LEAF))
+        page.next = next_leaf
+        start = _HEADER.size
+        page.keys = [data[start + i * KEY_SIZE:start + (i + 1) * KEY_SIZE] for i in range(count)]
+        if not page.leaf:
+            start += count * KEY_SIZE
+            page.children = list(struct.unpack_from(f">{count + 1}I", data, start))
+        return page
+
+class PagedGitBTree:
+    """
+    Variante persistente de GitBTree: B+Tree con páginas de tamaño fijo en un
+    único archivo de índice. Solo se leen las páginas que toca cada búsqueda;
+    las hojas están enlazadas para recorrer rangos en orden.
+    Las eliminaciones son perezosas (no se redistribuyen páginas).
+    Un archivo vacío se toma como índice nuevo; uno truncado o dañado lanza
+    una excepción al abrirlo (el índice se puede rehacer desde ObjectStore).
+    """
+    def __init__(self, index_path, cache_pages=256):
+        self.index_path = index_path
+        self.cache_pages = max(cache_pages, 8)
+        self._cache = OrderedDict()  # page_no -> BPlusPage (orden LRU)
+        self._dirty = set()
+        if os.path.exists(index_path) and os.path.getsize(index_path):
+            self._file = open(index_path, "r+b")
+            try:
+                self._check_file(index_path)
+            except Exception:
+                self._file.close()
+                raise
+        else:
+            self._file = open(index_path, "w+b")
+            self.page_count = 1
+            self.key_count = 0
+            root = self._new_page(leaf=True)
+            self.root_page = root.page_no
+            self.flush()
+
+    def _check_file(self, index_path):
+        """Valida metadatos, tamaño del archivo y la página raíz"""
+        size = os.path.getsize(index_path)
+        if size < PAGE_SIZE:
+            raise Exception(f"Índice de objetos truncado: {index_path}")
+        magic, version, self.root_page, self.page_count, self.key_count = \
+            _META.unpack(self._file.read(_META.size))
+        if magic != PAGE_MAGIC or version != PAGE_VERSION:
+            raise Exception(f"Índice de objetos inválido: {index_path}")
+        if not 0 < self.root_page < self.page_count or self.page_count * PAGE_SIZE > size:
+            raise Exception(f"Índice de objetos truncado: {index_path}")
+        self._get(self.root_page)
+
+    def __len__(self):
+        return self.key_count
+
+    # --- Caché de páginas ---
+    def _get(self, page_no):
+        page = self._cache.get(page_no)
+        if page is not None:
+            self._cache.move_to_end(page_no)
+            return page
+        self._file.seek(page_no * PAGE_SIZE)
+        page = BPlusPage.from_bytes(page_no, self._file.read(PAGE_SIZE))
+        self._cache[page_no] = page
+        self._evict()
+        return page
+
+    def _mark_dirty(self, page):
+        self._cache[page.page_no] = page
+        self._cache.move_to_end(page.page_no)
+        self._dirty.add(page.page_no)
+        self._evict()
+
+    def _evict(self):
+        while len(self._cache) > self.cache_pages:
+            page_no, page = self._cache.popitem(last=False)
+            if page_no in self._dirty:
+                self._write_page(page)
+
+    def _write_page(self, page):
+        self._file.seek(page.page_no * PAGE_SIZE)
+        self._file.write(page.to_bytes())
+        self._dirty.discard(page.page_no)
+
+    def _new_page(self, leaf):
+        page = BPlusPage(self.page_count, leaf)
+        self.page_count += 1
+        self._mark_dirty(page)
+        return page
+
+    def bulk_load(self, sorted_hashes):
+        """
+        Llena un índice vacío con hashes ordenados en O(n): las hojas se
+        escriben completas y seguidas (cada una enlazada con la siguiente) y
+        cada nivel interno se arma con la primera clave de cada hijo, sin
+        ninguna división de páginas. Las páginas salen a disco a medida que
+        la caché las descarta, así que la memoria no depende de n.
+        """
+        if self.key_count:
+            raise Exception("bulk_load solo se puede usar con un índice vacío")
+        self._cache.clear()
+        self._dirty.clear()
+        self.page_count = 1
+        self._file.truncate(PAGE_SIZE)
+        level = []      # (primera clave, página) de cada hoja
+        chunk = []
+        previous = None
+        count = 0
+        for sha1_hash in sorted_hashes:
+            key = bytes.fromhex(sha1_hash)
+            if previous is not None and key <= previous:
+                if key == previous:
+                    continue
+                raise Exception("bulk_load requiere hashes ordenados")
+            previous = key
+            count += 1
+            if len(chunk) == LEAF_MAX:
+                # Todavía quedan claves: la hoja siguiente será la próxima página
+                leaf = self._new_page(leaf=True)
+                leaf.keys = chunk
+                leaf.next = leaf.page_no + 1
+                level.append((chunk[0], leaf.page_no))
+                chunk = []
+            chunk.append(key)
+        leaf = self._new_page(leaf=True)
+        leaf.keys = chunk
+        level.append((chunk[0] if chunk else b"", leaf.page_no))
+        self.key_count = count
+        while len(level) > 1:
+            # Los hijos se reparten parejo para que ninguna página quede con uno solo
+            pages = -(-len(level) // (INTERNAL_MAX + 1))
+            base, extra = divmod(len(level), pages)
+            upper = []
+            start = 0
+            for index in range(pages):
+                group = level[start:start + base + (1 if index < extra else 0)]
+                start += len(group)
+                page = self._new_page(leaf=False)
+                page.keys = [first_key for first_key, _ in group[1:]]
+                page.children = [page_no for _, page_no in group]
+                upper.append((group[0][0], page.page_no))
+            level = upper
+        self.root_page = level[0][1]
+        self.flush()
+
+    def flush(self):
+        """Escribe las páginas modificadas y los metadatos en disco"""
+        for page_no in sorted(self._dirty):
+            self._write_page(self._cache[page_no])
+        self._file.seek(0)
+        meta = _META.pack(PAGE_MAGIC, PAGE_VERSION, self.root_page, self.page_count, self.key_count)
+        self._file.write(meta.ljust(PAGE_SIZE, b"\0"))
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    # --- Operaciones ---
+    def _find_leaf(self, key):
+        page = self._get(self.root_page)
+        while not page.leaf:
+            page = self._get(page.children[bisect_right(page.keys, key)])
+        return page
+
+    def search(self, sha1_hash):
+        """Indica si el hash está en el índice leyendo una página por nivel"""
+        key = bytes.fromhex(sha1_hash)
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        return i < len(leaf.keys) and leaf.keys[i] == key
+
+    def insert(self, sha1_hash):
+        """Inserta un hash; devuelve False si ya existía"""
+        inserted, split = self._insert(self.root_page, bytes.fromhex(sha1_hash))
+        if split:
+            separator, right_page = split
+            new_root = self._new_page(leaf=False)
+            new_root.keys = [separator]
+            new_root.children = [self.root_page, right_page]
+            self.root_page = new_root.page_no
+        if inserted:
+            self.key_count += 1
+        return inserted
+
+    def _insert(self, page_no, key):
+        page = self._get(page_no)
+        if page.leaf:
+            i = bisect_left(page.keys, key)
+            if i < len(page.keys) and page.keys[i] == key:
+                return False, None
+            page.keys.insert(i, key)
+            self._mark_dirty(page)
+            if len(page.keys) <= LEAF_MAX:
+                return True, None
+            mid = len(page.keys) // 2
+            right = self._new_page(leaf=True)
+            right.keys = page.keys[mid:]
+            page.keys = page.keys[:mid]
+            right.next = page.next
+            page.next = right.page_no
+            return True, (right.keys[0], right.page_no)
+
+        i = bisect_right(page.keys, key)
+        inserted, split = self._insert(page.children[i], key)
+        if not split:
+            return inserted, None
+        separator, right_page = split
+        page.keys.insert(i, separator)
+        page.children.insert(i + 1, right_page)
+        self._mark_dirty(page)
+        if len(page.keys) <= INTERNAL_MAX:
+            return inserted, None
+        mid = len(page.keys) // 2
+        right = self._new_page(leaf=False)
+        up = page.keys[mid]
+        right.keys = page.keys[mid + 1:]
+        right.children = page.children[mid + 1:]
+        page.keys = page.keys[:mid]
+        page.children = page.children[:mid + 1]
+        return inserted, (up, right.page_no)
+
+    def delete(self, sha1_hash):
+        """Elimina un hash de su hoja (sin fusionar páginas)"""
+        key = bytes.fromhex(sha1_hash)
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            leaf.keys.pop(i)
+            self._mark_dirty(leaf)
+            self.key_count -= 1
+            return True
+        return False
+
+    def range_scan(self, start=None, end=None):
+        """Recorre en orden los hashes en [start, end) siguiendo las hojas enlazadas"""
+        low = bytes.fromhex(start) if start else b""
+        high = bytes.fromhex(end) if end else None
+        leaf = self._find_leaf(low)
+        i = bisect_left(leaf.keys, low)
+        while True:
+            while i < len(leaf.keys):
+                key = leaf.keys[i]
+                if high is not None and key >= high:
+                    return
+                yield key.hex()
+                i += 1
+            if not leaf.next:
+                return
+            leaf = self._get(leaf.next)
+            i = 0
+
+    def preorder_traversal(self):
+        """Todos los hashes del índice (en orden, por compatibilidad con GitBTree)"""
+        return list(self.range_scan())
@@ -0,0 +1,296 @@
+# 11. Módulo de Diff de Líneas (Myers sobre líneas internadas)
+from bisect import bisect_left
+
+CONTEXT_LINES = 3  # Líneas de contexto alrededor de cada hunk
+
+def iter_lines(chunks):
+    """Parte una secuencia de bloques de bytes en líneas (conservando el salto de línea)"""
+    pending = b""
+    for chunk in chunks:
+        data = pending + bytes(chunk)
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end == -1:
+                break
+            yield data[start:end + 1]
+            start = end + 1
+        pending = data[start:]
+    if pending:
+        yield pending
+
+class LineInterner:
+    """
+    Asigna un entero a cada línea distinta. El diff compara enteros en
+    lugar de cadenas y cada línea repetida se guarda una sola vez.
+    """
+    def __init__(self):
+        self.ids = {}
+
+    def intern(self, lines):
+        ids = self.ids
+        return [ids.setdefault(line, len(ids)) for line in lines]
+
+def _middle_snake(a, a0, a1, b, b0, b1):
+    """
+    Busca el "snake" central del camino de edición más corto entre
+    a[a0:a1] y b[b0:b1] avanzando desde ambos extremos (Myers, espacio lineal).
+    Devuelve (x_inicio, y_inicio, x_fin, y_fin) relativos al subproblema.
+    """
+    n, m = a1 - a0, b1 - b0
+    delta = n - m
+    odd = delta & 1
+    offset = n + m + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range((n + m + 1) // 2 + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            c = delta - k
+            if odd and -(d - 1) <= c <= d - 1 and x + backward[offset + c] >= n:
+                return start_x, start_y, x, y
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[a1 - 1 - x] == b[b1 - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            c = delta - k
+            if not odd and -d <= c <= d and x + forward[offset + c] >= n:
+                return n - x, m - y, n - start_x, m - start_y
+    raise Exception("Diff: no se encontró el camino de edición")
+
+def _unique_anchors(a, a0, a1, b, b0, b1):
+    """
+    Pares (i, j) de líneas que aparecen exactamente una vez en cada lado,
+    reducidos a la subsecuencia creciente más larga: todos pueden usarse
+    como anclas a la vez (idea del patience diff).
+    """
+    counts = {}
+    for i in range(a0, a1):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, -1] if entry is None else [-1, -1]
+    for j in range(b0, b1):
+        entry = counts.get(b[j])
+        if entry is not None and entry[0] != -1:
+            # Segunda aparición en b: la línea deja de ser única
+            entry[1] = j if entry[1] == -1 else None
+    candidates = sorted((i, j) for i, j in counts.values() if i != -1 and j not in (-1, None))
+    # Subsecuencia creciente más larga de los j, en O(k log k)
+    tails, tail_index, previous = [], [], []
+    for index, (_, j) in enumerate(candidates):
+        position = bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+        previous.append(tail_index[position - 1] if position else -1)
+    anchors = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        anchors.append(candidates[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+def _matches(a, b):
+    """Pares (i, j) con a[i] == b[j] de una subsecuencia común (mínima en cada tramo), en orden"""
+    pairs = []
+    pending = [(0, len(a), 0, len(b))]
+    while pending:
+        a0, a1, b0, b1 = pending.pop()
+        # Prefijo y sufijo comunes no necesitan búsqueda
+        while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+            pairs.append((a0, b0))
+            a0 += 1
+            b0 += 1
+        while a0 < a1 and b0 < b1 and a[a1 - 1] == b[b1 - 1]:
+            a1 -= 1
+            b1 -= 1
+            pairs.append((a1, b1))
+        if a0 == a1 or b0 == b1:
+            continue
+        anchors = _unique_anchors(a, a0, a1, b, b0, b1)
+        if anchors:
+            # Los tramos entre anclas se resuelven por separado
+            start_a, start_b = a0, b0
+            for i, j in anchors:
+                pairs.append((i, j))
+                pending.append((start_a, i, start_b, j))
+                start_a, start_b = i + 1, j + 1
+            pending.append((start_a, a1, start_b, b1))
+            continue
+        x, y, u, v = _middle_snake(a, a0, a1, b, b0, b1)
+        for step in range(u - x):
+            pairs.append((a0 + x + step, b0 + y + step))
+        pending.append((a0, a0 + x, b0, b0 + y))
+        pending.append((a0 + u, a1, b0 + v, b1))
+    pairs.sort()
+    return pairs
+
+def matching_pairs(a_ids, b_ids):
+    """
+    Igual que _matches, pero antes descarta las líneas que no aparecen en
+    el otro lado: seguro son cambios y solo agrandarían la búsqueda.
+    """
+    in_a, in_b = set(a_ids), set(b_ids)
+    a_keep = [i for i, line in enumerate(a_ids) if line in in_b]
+    b_keep = [j for j, line in enumerate(b_ids) if line in in_a]
+    reduced = _matches([a_ids[i] for i in a_keep], [b_ids[j] for j in b_keep])
+    return [(a_keep[i], b_keep[j]) for i, j in reduced]
+
+def opcodes(a_ids, b_ids):
+    """Operaciones ('equal'|'replace'|'delete'|'insert', i1, i2, j1, j2) al estilo difflib"""
+    i = j = 0
+    result = []
+    for match_i, match_j in matching_pairs(a_ids, b_ids) + [(len(a_ids), len(b_ids))]:
+        if i < match_i and j < match_j:
+            result.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            result.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            result.append(("insert", i, i, j, match_j))
+        if match_i < len(a_ids):
+            if result and result[-1][0] == "equal":
+                tag, i1, _, j1, _ = result.pop()
+                result.append((tag, i1, match_i + 1, j1, match_j + 1))
+            else:
+                result.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return result
+
+def grouped_opcodes(codes, context=CONTEXT_LINES):
+    """Agrupa las operaciones en hunks con `context` líneas iguales alrededor"""
+    if not codes:
+        return
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # Un tramo igual largo cierra el hunk actual y abre el siguiente
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, i1 + context, j1, j1 + context))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+def _hunk_range(start, length):
+    if length == 1:
+        return f"{start + 1}"
+    if not length:
+        start -= 1  # Rango vacío: se indica la línea anterior
+    return f"{start + 1},{length}"
+
+def _text(line):
+    return line.decode("utf-8", errors="ignore").rstrip("\r\n")
+
+def unified_diff(a_lines, b_lines, fromfile="", tofile="", context=CONTEXT_LINES):
+    """
+    Genera el diff unificado entre dos listas de líneas (bytes) una línea
+    de salida a la vez, sin construir el resultado completo en memoria.
+    """
+    interner = LineInterner()
+    a_ids, b_ids = interner.intern(a_lines), interner.intern(b_lines)
+    started = False
+    for group in grouped_opcodes(opcodes(a_ids, b_ids), context):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        first, last = group[0], group[-1]
+        yield (f"@@ -{_hunk_range(first[1], last[2] - first[1])} "
+               f"+{_hunk_range(first[3], last[4] - first[3])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a_lines[i1:i2]:
+                    yield " " + _text(line)
+                continue
+            for line in a_lines[i1:i2]:
+                yield "-" + _text(line)
+            for line in b_lines[j1:j2]:
+                yield "+" + _text(line)
+
+def _changes(codes):
+    return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in codes if tag != "equal"]
+
+def _apply(base, changes, lines, start, end):
+    """Versión de base[start:end] con los cambios de un lado aplicados"""
+    result = []
+    position = start
+    for i1, i2, j1, j2 in changes:
+        result.extend(base[position:i1])
+        result.extend(lines[j1:j2])
+        position = i2
+    result.extend(base[position:end])
+    return result
+
+def _marker_block(lines):
+    if lines and not lines[-1].endswith(b"\n"):
+        lines = lines[:-1] + [lines[-1] + b"\n"]
+    return lines
+
+def merge3(base, ours, theirs, ours_label="ours", theirs_label="theirs"):
+    """
+    Merge de tres vías línea por línea. Los cambios de cada lado respecto a
+    base se aplican juntos; si ambos tocan la misma zona con distinto
+    resultado se escribe un bloque de conflicto con marcadores.
+    Devuelve (líneas combinadas, número de conflictos).
+    """
+    interner = LineInterner()
+    base_ids = interner.intern(base)
+    ours_changes = _changes(opcodes(base_ids, interner.intern(ours)))
+    theirs_changes = _changes(opcodes(base_ids, interner.intern(theirs)))
+    tagged = sorted([(change, 0) for change in ours_changes] + [(change, 1) for change in theirs_changes])
+    result = []
+    conflicts = 0
+    position = 0
+    index = 0
+    while index < len(tagged):
+        # Zona de base tocada por cambios que se solapan (o se tocan) entre sí
+        start, end = tagged[index][0][0], tagged[index][0][1]
+        sides = ([], [])
+        while index < len(tagged) and tagged[index][0][0] <= end:
+            change, side = tagged[index]
+            sides[side].append(change)
+            end = max(end, change[1])
+            index += 1
+        result.extend(base[position:start])
+        ours_version = _apply(base, sides[0], ours, start, end)
+        theirs_version = _apply(base, sides[1], theirs, start, end)
+        if not sides[1] or ours_version == theirs_version:
+            result.extend(ours_version)
+        elif not sides[0]:
+            result.extend(theirs_version)
+        else:
+            conflicts += 1
+            result.append(f"<<<<<<< {ours_label}\n".encode())
+            result.extend(_marker_block(ours_version))
+            result.append(b"=======\n")
+            result.extend(_marker_block(theirs_version))
+            result.append(f">>>>>>> {theirs_label}\n".encode())
+        position = end
+    result.extend(base[position:])
+    return result, conflicts
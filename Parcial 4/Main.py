@@ -1,48 +1,127 @@
-import hashlib
 import json
 import os
 import sys
 from datetime import datetime
-from DoubleList import DoublyLinkedList
+from functools import partial
+from itertools import islice
 from Stack import StackManager
-from Queue import Queue
 from PullRequest import PullRequest
-from BranchTree import BranchTree
-from ContributorsBST import ContributorsBST
-from GitBTree import GitBTree
-from RoleAVL import RoleAVL
+from PullRequestStore import PRIORITY_LEVELS, PullRequestStore
+from CommitGraph import CommitGraph
+from FingerprintIndex import FingerprintIndex
+# Los demás subsistemas (y sus dependencias: hashlib, concurrent.futures,
+# sqlite3, zlib...) se importan la primera vez que se usan: ver las
+# propiedades de ConsoleApp.
+
+BATCH_FLUSH_EVERY = 1000  # Comandos entre escrituras a disco en modo batch
+SAVE_KINDS = ("commits", "prs", "branches", "contributors", "roles", "index")
     
 class ConsoleApp:
     def __init__(self):
         self.commands = {}
+        self._hasher = None  # Pool de hilos para hashear archivos en lote
+        self._merger = None  # Pool de procesos para merges con muchos archivos
+        self._roles = None
         self.staging = StackManager(self)  # Archivos preparados como pila
-        self.commits = DoublyLinkedList()  # Historial de commits como Dlinked list
+        self.commit_graph = CommitGraph()  # Historial: índice id -> commit (carga perezosa)
+        self.fingerprints = FingerprintIndex()  # Huellas para detectar commits redundantes
+        self.commit_journal = None  # Diario de commits (solo anexado)
+        self._unsaved_commits = []  # Commits aún no escritos en el diario
         self.current_commit = None  # Commit actual (HEAD)
         self.initialized = False
         self.current_branch = "main"
         self.repo_path = None  # Ruta absoluta del repositorio actual
         self.user_name = "root"
         self.user_email = "root@gmail.com"
+        self.batch_mode = False  # En modo batch los guardados se acumulan hasta flush()
+        self._pending_saves = set()
         self._reset_state()  # Nueva función para limpiar datos
         self.register_commands()
         self.commit_file = "commits.json"
         self._load_commits()
-        self.pr_queue = Queue()  # Cola de Pull Requests
         self.pr_file = "pull_requests.json"
-        self._load_pull_requests()  # Cargar PullRequests al iniciar
-        self.branch_tree = BranchTree()
-        self.contributors = ContributorsBST()
-        self.git_objects = GitBTree(t=50)
-        self.roles = RoleAVL()
-        self._init_default_roles()  # Inicializar roles predeterminados
 
     def _reset_state(self):
         """Reinicia todas las estructuras de datos al cambiar de repo"""
-        self.commits = DoublyLinkedList()
-        self.pr_queue = Queue()
+        self.commit_graph = CommitGraph()
+        if getattr(self, "fingerprints", None):
+            self.fingerprints.close()
+        self.fingerprints = FingerprintIndex()
+        if getattr(self, "commit_journal", None):
+            self.commit_journal.close()
+        self.commit_journal = None
+        self._unsaved_commits = []
+        if getattr(self, "_pr_queue", None):
+            self._pr_queue.close()
+        self._pr_queue = None      # Pull Requests indexados por id, estado, autor y destino
+        self._branch_tree = None
+        self._contributors = None
+        self._roles = None         # Cada repo guarda sus propios roles y usuarios
+        self._close_objects()
         self.staging.clear()
         self.current_commit = None
 
+    # --- Subsistemas perezosos: se crean (y cargan del repo) en el primer uso ---
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from FileHasher import HashService
+            self._hasher = HashService()
+        return self._hasher
+
+    @property
+    def merger(self):
+        if self._merger is None:
+            from MergeService import MergeService
+            self._merger = MergeService()
+        return self._merger
+
+    @property
+    def roles(self):
+        if self._roles is None:
+            from RoleAVL import RoleAVL
+            self._roles = RoleAVL()
+            if not (self.repo_path and self._roles.load(self.repo_path)):
+                self._init_default_roles()  # Inicializar roles predeterminados
+        return self._roles
+
+    @property
+    def branch_tree(self):
+        if self._branch_tree is None:
+            from BranchTree import BranchTree
+            self._branch_tree = BranchTree()
+            if self.repo_path:
+                self._branch_tree.load(self.repo_path, self.commit_graph.get)
+        return self._branch_tree
+
+    @property
+    def contributors(self):
+        if self._contributors is None:
+            from ContributorsBST import ContributorsBST
+            self._contributors = ContributorsBST()
+            if self.repo_path:
+                self._contributors.load(self.repo_path)
+        return self._contributors
+
+    @property
+    def pr_queue(self):
+        if self._pr_queue is None:
+            self._load_pull_requests()
+        return self._pr_queue
+
+    @property
+    def git_objects(self):
+        if self._git_objects is None:
+            self._load_objects()
+        return self._git_objects
+
+    @property
+    def object_store(self):
+        """Blobs comprimidos en repo_path/.git/objects (None sin repositorio)"""
+        if self._git_objects is None:
+            self._load_objects()
+        return self._object_store
+
     def _init_default_roles(self):
         """Inicializa los roles predeterminados con sus permisos"""
         # Admin: Acceso total
@@ -56,63 +135,169 @@ class ConsoleApp:
         # Root: acceso total (por si acaso)
         self.roles.insert("root@gmail.com", "Admin", ["push", "pull", "merge", "branch", "admin"])
 
-    def _load_all_data(self):
-        if self.repo_path:
-            self.branch_tree.load(self.repo_path)
-            self.contributors.load(self.repo_path)
+    def _close_objects(self):
+        if getattr(self, "_object_store", None):
+            self._object_store.close()
+        if getattr(self, "_git_objects", None) is not None and hasattr(self._git_objects, "close"):
+            self._git_objects.close()
+        self._object_store = None
+        self._git_objects = None
+
+    def _load_objects(self):
+        """Abre el almacén de objetos del repo y su índice B+Tree persistente"""
+        self._close_objects()
+        if not self.initialized:
+            from GitBTree import GitBTree
+            self._git_objects = GitBTree(t=50)  # Sin repositorio: índice solo en memoria
+            return
+        from GitBTree import PagedGitBTree
+        from ObjectStore import ObjectStore
+        self._object_store = ObjectStore(self.repo_path)
+        index_path = os.path.join(self.repo_path, ".git", "objects.idx")
+        try:
+            self._git_objects = PagedGitBTree(index_path)
+        except Exception as e:
+            # Índice truncado o dañado (p. ej. un corte a mitad de escritura): se rehace
+            print(f"Reconstruyendo índice de objetos ({e})")
+            os.remove(index_path)
+            self._git_objects = PagedGitBTree(index_path)
+        if len(self._git_objects) == 0:
+            # Índice nuevo (o repo anterior a este formato): se arma de una vez desde el almacén
+            self._git_objects.bulk_load(self._object_store.all_hashes())
+
+    def has_object(self, sha1_hash):
+        """Indica si un blob existe en el repositorio"""
+        return self.git_objects.search(sha1_hash)
+
+    def store_files(self, paths):
+        """
+        Comprime y guarda cada archivo como blob (en paralelo, una sola lectura
+        por archivo). Devuelve los SHA-1 en el mismo orden (None si ya no existe).
+        """
+        write_file = partial(self.object_store.write_file, buffer_size=self.hasher.buffer_size)
+        def store(path):
+            try:
+                return write_file(path)
+            except FileNotFoundError:
+                return None
+        return self.hasher.map(store, paths)
+
+    def _index_objects(self, hashes):
+        """Registra en el índice de objetos los blobs que aún no estaban (None = borrado)"""
+        for sha1_hash in hashes:
+            if sha1_hash and not self.git_objects.search(sha1_hash):
+                self.git_objects.insert(sha1_hash)
+        self.git_objects.flush()
+
+    def stream_object(self, sha1_hash, chunk_size=64 * 1024):
+        """Devuelve el contenido de un blob por bloques, sin cargar el pack completo"""
+        if not self.object_store or not self.git_objects.search(sha1_hash):
+            raise Exception(f"Objeto {sha1_hash} no encontrado")
+        return self.object_store.stream_blob(sha1_hash, chunk_size)
+
+    def save(self, kind):
+        """
+        Persiste un tipo de datos: "commits", "prs", "branches", "contributors", "roles" o "index".
+        En modo batch solo se marca como pendiente y se escribe una vez en flush().
+        """
+        if self.batch_mode:
+            self._pending_saves.add(kind)
+            return
+        if kind == "commits":
+            self._save_commits()
+        elif kind == "prs":
+            self._save_pull_requests()
+        elif kind == "branches":
+            self.branch_tree.save(self.repo_path)
+        elif kind == "contributors":
+            self.contributors.save(self.repo_path)
+        elif kind == "roles":
+            self.roles.save(self.repo_path)
+        elif kind == "index":
+            self.staging.save_index()
+
+    def flush(self):
+        """Escribe lo pendiente del modo batch (cada tipo una sola vez)"""
+        pending, self._pending_saves = self._pending_saves, set()
+        batch_mode, self.batch_mode = self.batch_mode, False
+        try:
+            for kind in SAVE_KINDS:
+                if kind in pending and self.repo_path:
+                    self.save(kind)
+            if self.commit_journal:
+                self.commit_journal.sync()
+        finally:
+            self.batch_mode = batch_mode
 
     def _save_all_data(self):
         self.branch_tree.save(self.repo_path)
         self.contributors.save(self.repo_path)
 
     def _load_commits(self):
-        """Carga los commits desde el archivo JSON al iniciar"""
-        if self.repo_path and os.path.exists(os.path.join(self.repo_path, self.commit_file)):
+        """Reproduce commits.json y el diario .git/commits.journal al iniciar"""
+        if self.repo_path:
+            fingerprints_path = os.path.join(self.repo_path, ".git", "fingerprints")
+            rebuild_fingerprints = not os.path.exists(fingerprints_path)
+            self.fingerprints = FingerprintIndex(fingerprints_path)
+            from CommitJournal import CommitJournal
             try:
-                commit_file_path = os.path.join(self.repo_path, self.commit_file)
-                with open(commit_file_path, 'r') as f:
-                    commits_data = json.load(f)
-                    for commit_data in commits_data:
-                        new_commit = Commit.from_dict(commit_data)
-                        self.commits.insert_at_end(new_commit)
-                    if self.commits.tail:
-                        self.current_commit = self.commits.tail
+                journal = CommitJournal(self.repo_path, self.commit_file)
+                self.commit_journal = journal
+                # Solo se lee el índice de offsets; cada commit se deserializa al pedirlo
+                self.commit_graph = CommitGraph(loader=lambda commit_id: Commit.from_dict(journal.read(commit_id)))
+                for commit_id, parent_ids, generation, timestamp in journal.load_index():
+                    self.commit_graph.add_entry(commit_id, parent_ids, generation, timestamp)
+                if rebuild_fingerprints:
+                    for commit_data in journal.read_records():
+                        self.fingerprints.add(Commit.from_dict(commit_data).fingerprint())
+                if os.path.exists(os.path.join(self.repo_path, "branches.json")):
+                    # HEAD es la punta de la rama actual (main al abrir), no el último commit del repo
+                    self.current_commit = self.branch_tree.current_branch.commit if len(self.commit_graph) else None
+                else:
+                    self.current_commit = self.commit_graph.get(self.commit_graph.head_id)
             except Exception as e:
                 print(f"Error cargando commits: {str(e)}")
 
+    def _append_commit(self, commit):
+        """Agrega un commit al historial y lo indexa en el grafo y en las huellas"""
+        self.commit_graph.add(commit)
+        self.fingerprints.add(commit.fingerprint())
+        self._unsaved_commits.append(commit)
+
     def _save_commits(self):
-        """Guarda commits en repo_path/commits.json"""
-        if self.repo_path:
-            commits_data = []
-            current_node = self.commits.head
-            while current_node:
-                commits_data.append(current_node.data.to_dict())
-                current_node = current_node.next
-            commit_path = os.path.join(self.repo_path, self.commit_file)
+        """Anexa al diario los commits nuevos (una línea por commit)"""
+        if self.repo_path and self.commit_journal:
             try:
-                with open(commit_path, 'w') as f:
-                    json.dump(commits_data, f, indent=2)
+                for commit in self._unsaved_commits:
+                    self.commit_journal.append(commit.to_dict())
+                self._unsaved_commits = []
             except Exception as e:
                 print(f"Error guardando commits: {str(e)}")
 
+    def _pr_db_path(self):
+        return os.path.join(self.repo_path, ".git", "pull_requests.db")
+
     def _load_pull_requests(self):
-        """Carga PRs desde repo_path/pull_requests.json"""
+        """Carga PRs desde repo_path/pull_requests.json, o abre .git/pull_requests.db si existe"""
+        self._pr_queue = PullRequestStore()
         if self.repo_path:
+            if os.path.exists(self._pr_db_path()):
+                # Backend SQLite: no se carga nada, cada consulta va a la base
+                from PullRequestSQLite import SQLitePullRequestStore
+                self._pr_queue = SQLitePullRequestStore(self._pr_db_path())
+                return
             pr_path = os.path.join(self.repo_path, self.pr_file)
             if os.path.exists(pr_path):
                 try:
                     with open(pr_path, 'r') as f:
-                        prs_data = json.load(f)
-                        for pr_data in prs_data:
-                            pr = PullRequest.from_dict(pr_data)
-                            self.pr_queue.enqueue(pr)
+                        self._pr_queue.load_dict(json.load(f))
                 except Exception as e:
                     print(f"Error cargando PRs: {str(e)}")
 
     def _save_pull_requests(self):
-        """Guarda PRs en repo_path/pull_requests.json"""
-        if self.repo_path:
-            prs_data = [pr.to_dict() for pr in self.pr_queue.get_all()]
+        """Guarda PRs en repo_path/pull_requests.json (con SQLite cada cambio ya quedó guardado)"""
+        if self.repo_path and not self.pr_queue.writes_through:
+            prs_data = self.pr_queue.to_dict()
             pr_path = os.path.join(self.repo_path, self.pr_file)
             try:
                 with open(pr_path, 'w') as f:
@@ -120,53 +305,56 @@ class ConsoleApp:
             except Exception as e:
                 print(f"Error guardando PRs: {str(e)}")
 
+    def _switch_pr_backend(self, backend):
+        """Migra los PRs entre pull_requests.json y .git/pull_requests.db"""
+        if not self.initialized:
+            raise Exception("Primero inicializa un repositorio con 'init'")
+        from PullRequestSQLite import SQLitePullRequestStore
+        using_sqlite = isinstance(self.pr_queue, SQLitePullRequestStore)
+        if backend == "sqlite" and not using_sqlite:
+            store = SQLitePullRequestStore(self._pr_db_path())
+            store.import_store(self.pr_queue)
+            json_path = os.path.join(self.repo_path, self.pr_file)
+            if os.path.exists(json_path):
+                os.remove(json_path)
+        elif backend == "json" and using_sqlite:
+            store = PullRequestStore()
+            store.import_store(self.pr_queue)
+            self.pr_queue.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self._pr_db_path() + suffix):
+                    os.remove(self._pr_db_path() + suffix)
+        else:
+            return
+        self._pr_queue = store
+        self._save_pull_requests()
+
     def get_committed_files(self):
         """Obtiene todos los archivos registrados en la rama actual (no global)"""
-        committed_files = set()
-        # Buscar la rama actual
         current_branch = self.branch_tree.current_branch
         if current_branch and current_branch.commit:
-            # Recorrer hacia atrás desde el último commit de la rama
-            commit_id = current_branch.commit.id
-            current_node = self.commits.tail
-            while current_node:
-                commit = current_node.data
-                if commit.id == commit_id:
-                    # Recorrer la historia de la rama
-                    while current_node:
-                        commit = current_node.data
-                        committed_files.update(commit.staged_files)
-                        if not commit.parent_id:
-                            break
-                        # Buscar el commit padre
-                        parent_node = self.commits.head
-                        while parent_node:
-                            if parent_node.data.id == commit.parent_id:
-                                current_node = parent_node
-                                break
-                            parent_node = parent_node.next
-                        else:
-                            break
-                    break
-                current_node = current_node.prev
-        return committed_files
+            # Recorrer la historia de la rama a través del grafo de commits
+            return self.commit_graph.files_at(current_branch.commit.id)
+        return set()
 
     def _has_permission(self, action, branch_name=None):
         # Root user tiene acceso total
         if self.user_email == "root@gmail.com":
             return True
+        # Permisos compilados del usuario (máscara de bits en caché)
+        granted = self.roles.permissions_of(self.user_email)
+        if not granted:
+            return False
         # Admin tiene acceso total
-        if self.roles.check_permission(self.user_email, "admin"):
+        if granted.allows("admin"):
             return True
         # Maintainer: push y merge en cualquier rama
-        if action in ["push", "merge", "branch"] and self.roles.check_permission(self.user_email, action):
+        if action in ("push", "merge", "branch") and granted.allows(action):
             return True
         # Developer: push solo en ramas específicas (por ahora, permitimos en cualquier rama si tiene push)
-        if action == "push" and self.roles.check_permission(self.user_email, "push"):
-            # Si quieres restringir a ramas específicas, aquí puedes validar branch_name
-            return True
+        # Si quieres restringir a ramas específicas, aquí puedes validar branch_name
         # Guest: solo pull
-        if action == "pull" and self.roles.check_permission(self.user_email, "pull"):
+        if action == "pull" and granted.allows("pull"):
             return True
         return False
 
@@ -185,22 +373,52 @@ class ConsoleApp:
         self.commands["role"] = GitRole(self)
         self.commands["config"] = GitConfig(self)
 
+    def execute_line(self, user_input):
+        """Ejecuta una línea de comando; devuelve False si falló"""
+        parts = user_input.split()
+        command_name = parts[0]
+        
+        if command_name in self.commands:
+            try:
+                self.commands[command_name].execute(parts)
+                return True
+            except Exception as e:
+                print(f"Error: {str(e)}")
+        else:
+            print("Comando no reconocido")
+        return False
+
     def run(self):
         while True:
             user_input = input(">").strip()
             if not user_input:
                 continue
-            
-            parts = user_input.split()
-            command_name = parts[0]
-            
-            if command_name in self.commands:
-                try:
-                    self.commands[command_name].execute(parts)
-                except Exception as e:
-                    print(f"Error: {str(e)}")
-            else:
-                print("Comando no reconocido")
+            self.execute_line(user_input)
+
+    def run_batch(self, lines, flush_every=BATCH_FLUSH_EVERY):
+        """
+        Ejecuta comandos seguidos (un script o stdin). Los guardados se
+        agrupan: cada tipo de dato se escribe una vez cada flush_every
+        comandos y al terminar. Líneas vacías o que empiezan con # se ignoran.
+        Devuelve (comandos ejecutados, comandos con error).
+        """
+        executed = failed = 0
+        self.batch_mode = True
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if not self.execute_line(line):
+                    failed += 1
+                executed += 1
+                if flush_every and executed % flush_every == 0:
+                    self.flush()
+        finally:
+            # También se guarda si el script termina con 'exit'
+            self.flush()
+            self.batch_mode = False
+        return executed, failed
 
 class Command:
     def execute(self, args):
@@ -214,14 +432,24 @@ class Commit:
         self.message = message
         self.author_email = author_email
         self.parent_id = parent_id
+        self.merge_parent_id = None  # Segundo padre (solo en commits de merge)
         self.staged_files = staged_files.copy()
+        self.generation = 0  # 1 + generación del padre (la calcula CommitGraph)
+        self.file_hashes = {}  # filename -> SHA-1 del blob guardado en .git/objects (None = borrado)
         self.branch = "main"
 
     def _generate_full_id(self, message, staged_files):
         """Genera el hash SHA-1 completo"""
+        import hashlib
         data = f"{message}{self.timestamp}{''.join(sorted(staged_files))}"
         return hashlib.sha1(data.encode()).hexdigest()
 
+    def fingerprint(self):
+        """Hash de (mensaje, archivos ordenados) usado por FingerprintIndex"""
+        import hashlib
+        data = self.message + "\0" + "\n".join(sorted(set(self.staged_files)))
+        return hashlib.sha1(data.encode()).hexdigest()
+
     def is_redundant(self, other_commit):
         """Compara mensaje y archivos con otro commit."""
         return (
@@ -238,7 +466,10 @@ class Commit:
             "message": self.message,
             "author_email": self.author_email,
             "parent_id": self.parent_id,
+            "merge_parent_id": self.merge_parent_id,
             "staged_files": self.staged_files,
+            "file_hashes": self.file_hashes,
+            "generation": self.generation,
             "branch": self.branch
         }
 
@@ -255,6 +486,9 @@ class Commit:
         commit.full_id = data["full_id"]
         commit.timestamp = data["timestamp"]
         commit.branch = data["branch"]
+        commit.merge_parent_id = data.get("merge_parent_id")
+        commit.file_hashes = data.get("file_hashes", {})
+        commit.generation = data.get("generation", 0)
         return commit
 
 class GitInit(Command):
@@ -274,13 +508,13 @@ class GitInit(Command):
             print(f"Ya estás en el repositorio {repo_name}")
             return
             
-        # Reiniciar estado antes de cargar nuevo repo
+        # Guardar lo pendiente (modo batch) y reiniciar estado antes de cargar nuevo repo
+        self.app.flush()
         self.app._reset_state()
         self.app.repo_path = new_repo_path
         
-        # Cargar datos existentes
+        # Cargar el historial; ramas, PRs, colaboradores y objetos se cargan al usarse
         self.app._load_commits()
-        self.app._load_pull_requests()
         
         print(f"Cambiado a repositorio: {repo_name}")
         
@@ -289,6 +523,7 @@ class GitInit(Command):
             if os.path.isdir(self.app.repo_path) and os.path.exists(os.path.join(self.app.repo_path, ".git")):
                 print(f"Repositorio {repo_name} ya está inicializado")
                 self.app.initialized = True
+                self.app.staging.load_index()
                 return
             else:
                 raise Exception(f"'{repo_name}' existe pero no es un repositorio")
@@ -301,6 +536,7 @@ class GitInit(Command):
         
         # Inicializar estado
         self.app.initialized = True
+        self.app.staging.load_index()
         print(f"Repositorio '{repo_name}' creado en: {self.app.repo_path}")
 
 class GitAdd(Command):
@@ -314,21 +550,40 @@ class GitAdd(Command):
             raise Exception("Uso: add [archivo|.]")
         
         target = args[1]
+        # El contenido se guarda como blob al agregarlo: commit registra lo que
+        # estaba en staging aunque el archivo cambie (o se borre) después
         if target == ".":
-            repo_dir = self.app.repo_path if self.app.repo_path else "."
-            for filename in os.listdir(repo_dir):
-                file_path = os.path.join(repo_dir, filename)
-                if os.path.isfile(file_path):
-                    current_hash = self.app.staging._generate_hash(filename)
-                    in_stack = any(item["filename"] == filename for item in self.app.staging.stack)
-                    if not in_stack or (in_stack and current_hash != next(item["hash"] for item in self.app.staging.stack if item["filename"] == filename)):
-                        self.app.staging.push(filename, estado='A' if not in_stack else 'M')
-                        print(f"Archivo {filename} agregado a staging")
+            entries = list(self.app.staging.scan_files())
+            # Los archivos cuyo stat cambió se leen una sola vez: hash y blob a la vez
+            hashes = self.app.staging.hash_entries(entries, self.app.store_files)
+            changed = []
+            for (filename, entry), current_hash in zip(entries, hashes):
+                stack_item = self.app.staging.get(filename)
+                if current_hash and (not stack_item or current_hash != stack_item["hash"]):
+                    changed.append((filename, entry, current_hash, 'A' if not stack_item else 'M'))
+            # Un acierto de la caché de stat (p. ej. hasheado por status) puede no tener blob aún
+            missing = [(filename, entry) for filename, entry, file_hash, _ in changed
+                       if not self.app.object_store.contains(file_hash)]
+            stored = dict(zip((filename for filename, _ in missing),
+                              self.app.store_files([entry.path for _, entry in missing])))
+            for filename, _, file_hash, estado in changed:
+                file_hash = stored.get(filename, file_hash)
+                if file_hash:
+                    self.app.staging.push(filename, estado=estado, file_hash=file_hash)
+                    print(f"Archivo {filename} agregado a staging")
+            self.app.staging.stat_cache.prune({filename for filename, _ in entries})
+            self.app.save("index")
         else:
             file_path = os.path.join(self.app.repo_path, target) if self.app.repo_path else target
             if not os.path.isfile(file_path):
                 raise Exception(f"Archivo {target} no existe")
-            self.app.staging.push(target, estado='A')
+            st = os.stat(file_path)
+            file_hash = self.app.store_files([file_path])[0]
+            if not file_hash:
+                raise Exception(f"Archivo {target} no existe")
+            self.app.staging.stat_cache.update(target, st, file_hash)
+            self.app.staging.push(target, estado='A', file_hash=file_hash)
+            self.app.save("index")
             print(f"Archivo {target} agregado al staging")
             
 class GitStatus(Command):
@@ -373,28 +628,32 @@ class GitCommit(Command):
             raise Exception("Error: No hay archivos en staging. Usa 'add' primero")
         message = args[2].strip('"')
         author_email = self.app.user_email
-        parent_id = self.app.commits.tail.data.id if self.app.commits.tail else None
+        # El padre es el commit de HEAD (punta de la rama actual)
+        parent_id = self.app.current_commit.id if self.app.current_commit else None
         new_commit = Commit(message, author_email, staged_files, parent_id)
         if self.app.branch_tree.current_branch:
             new_commit.branch = self.app.branch_tree.current_branch.name
-        current_node = self.app.commits.head
-        while current_node:
-            existing_commit = current_node.data
-            if new_commit.is_redundant(existing_commit):
-                raise Exception("Commit redundante: Mismos archivos que un commit anterior.")
-            current_node = current_node.next
-        self.app.commits.insert_at_end(new_commit)
-        self.app.current_commit = self.app.commits.tail
+        if self.app.fingerprints.contains(new_commit.fingerprint()):
+            raise Exception("Commit redundante: Mismos archivos que un commit anterior.")
+        # Los blobs se guardaron en 'add': se registra el contenido que estaba en staging.
+        # Un archivo en staging sin hash es un borrado y queda registrado como None.
         for filename in staged_files:
-            file_hash = self.app.staging._generate_hash(filename)
-            if file_hash:
-                self.app.git_objects.insert(file_hash)
+            file_hash = self.app.staging.get(filename)["hash"]
+            if file_hash and not self.app.object_store.contains(file_hash):
+                raise Exception(f"Falta el blob de {filename} ({file_hash}); vuelve a agregarlo con 'add'")
+            new_commit.file_hashes[filename] = file_hash
+        self.app._index_objects(new_commit.file_hashes.values())
+        self.app.object_store.maybe_pack()
+        # Recién con los blobs en disco se registra el commit (y su huella persistente):
+        # si algo falla antes, reintentar el commit no se rechaza como redundante
+        self.app._append_commit(new_commit)
+        self.app.current_commit = new_commit
         self.app.staging.clear()
-        self.app._save_commits()
+        self.app.save("commits")
         current_branch = self.app.branch_tree.current_branch
         if current_branch:
             current_branch.commit = new_commit
-            self.app.branch_tree.save(self.app.repo_path)
+            self.app.save("branches")
         print(f"Commit creado: {new_commit.id}")
         print(f"{len(staged_files)} archivos incluidos")
 
@@ -405,18 +664,44 @@ class GitLog(Command):
     def execute(self, args):
         if not self.app.initialized:
             raise Exception("Error: Repositorio no inicializado")
-        current_node = self.app.commits.head
-        while current_node:
-            commit = current_node.data
+        options = self._parse_options(args[1:])
+        for commit in self.iter_commits(**options):
             print(f"ID: {commit.id}")
             print(f"Fecha: {commit.timestamp}")
             print(f"Mensaje: {commit.message}")
             print(f"Parent: {commit.parent_id}")
+            if commit.merge_parent_id:
+                print(f"Merge: {commit.merge_parent_id}")
             print("Archivos incluidos:")
             for filename in commit.staged_files:
                 print(f"  {filename}")
             print("-"*40)
-            current_node = current_node.next
+
+    def _parse_options(self, args):
+        """log [-n <cantidad>] [--skip <cantidad>] [--since <fecha>] [--until <fecha>]"""
+        options = {"count": None, "skip": 0, "since": None, "until": None}
+        names = {"-n": "count", "--skip": "skip", "--since": "since", "--until": "until"}
+        i = 0
+        while i < len(args):
+            if args[i] not in names or i + 1 >= len(args):
+                raise Exception("Uso: log [-n <cantidad>] [--skip <cantidad>] [--since <fecha>] [--until <fecha>]")
+            name = names[args[i]]
+            value = args[i + 1]
+            if name in ("count", "skip"):
+                if not value.isdigit():
+                    raise Exception(f"{args[i]} espera un número entero")
+                value = int(value)
+            else:
+                value = value.replace("T", " ")  # Permite 2025-03-01T10:00:00 en un solo argumento
+            options[name] = value
+            i += 2
+        return options
+
+    def iter_commits(self, count=None, skip=0, since=None, until=None):
+        """Genera commits del más reciente al más antiguo, deserializando solo los mostrados"""
+        commit_ids = self.app.commit_graph.iter_newest_first(since, until)
+        for commit_id in islice(commit_ids, skip, None if count is None else skip + count):
+            yield self.app.commit_graph.get(commit_id)
 
 class GitCheckout(Command):
     def __init__(self, app):
@@ -433,33 +718,30 @@ class GitCheckout(Command):
             # Restaurar HEAD y staging desde el commit de la rama
             if branch.commit:
                 # HEAD apunta al commit de la rama
-                # Buscar el nodo en la lista de commits
-                current_node = self.app.commits.head
-                while current_node:
-                    if current_node.data.id == branch.commit.id:
-                        self.app.current_commit = current_node
-                        break
-                    current_node = current_node.next
-                # Restaurar staging
-                self.app.staging.clear()
-                for filename in branch.commit.staged_files:
-                    self.app.staging.push(filename, estado='A')
+                self.app.current_commit = branch.commit
+                self._restore_staging(branch.commit)
             print(f"Cambiado a rama: {branch.name}")
             return
         
-        current_node = self.app.commits.head
-        while current_node:
-            commit = current_node.data
-            if commit.id == target_id:
-                self.app.current_commit = current_node
-                # Restaurar el staging desde el commit (usando StackManager)
-                self.app.staging.clear()
-                for filename in commit.staged_files:
-                    self.app.staging.push(filename, estado='A')  # Reconstruye la pila
-                print(f"HEAD movido al commit {target_id}")
-                return
-            current_node = current_node.next
+        commit = self.app.commit_graph.get(target_id)
+        if commit:
+            self.app.current_commit = commit
+            self._restore_staging(commit)
+            print(f"HEAD movido al commit {target_id}")
+            return
         raise Exception("Commit no encontrado")
+
+    def _restore_staging(self, commit):
+        """
+        Reconstruye la pila con los blobs del commit. Los archivos sin blob
+        (borrados, o commits anteriores a file_hashes) no se preparan: un
+        hash vacío haría que el próximo commit los tome como borrados.
+        """
+        self.app.staging.clear()
+        for filename in commit.staged_files:
+            file_hash = commit.file_hashes.get(filename)
+            if file_hash:
+                self.app.staging.push(filename, estado='A', file_hash=file_hash)
     
 class GitPR(Command):
     def __init__(self, app):
@@ -494,36 +776,49 @@ class GitPR(Command):
         self._check_repo_initialized()
         if not self.app._has_permission("push"):
             raise Exception("Permiso denegado: No puedes crear pull requests.")
-        if len(args) != 4:
-            raise Exception("Uso: pr create <rama_origen> <rama_destino>")
+        if len(args) not in (4, 6) or (len(args) == 6 and args[4] != "--priority"):
+            raise Exception("Uso: pr create <rama_origen> <rama_destino> [--priority critical|high|normal|low]")
         source = args[2]
         target = args[3]
-        pr_id = len(self.app.pr_queue) + 1
+        priority = args[5] if len(args) == 6 else None
+        if priority and priority not in PRIORITY_LEVELS:
+            raise Exception(f"Prioridad inválida: {priority}. Usa {', '.join(PRIORITY_LEVELS)}")
+        pr_id = self.app.pr_queue.allocate_id()
         new_pr = PullRequest(pr_id, source, target)
+        if priority:
+            new_pr.tags.append(f"priority:{priority}")
         new_pr.created_at = datetime.now()
         new_pr.author = self.app.user_email
         new_pr.files = self.app.staging.get_staged_files()  # Capturar archivos en staging
         self.app.pr_queue.enqueue(new_pr)
-        self.app._save_pull_requests()
+        self.app.save("prs")
         print(f"PR #{pr_id} creado para fusionar {source} -> {target}")
 
+    def _parse_filters(self, args):
+        """--status, --author y --target -> argumentos de pr_queue.filter"""
+        options = {"--status": "status", "--author": "author", "--target": "target"}
+        filters = {}
+        for i in range(0, len(args), 2):
+            if args[i] not in options or i + 1 >= len(args):
+                raise Exception("Uso: pr list|status [--status <estado>] [--author <email>] [--target <rama>]")
+            filters[options[args[i]]] = args[i + 1]
+        return filters
+
     def status(self, args):
         self._check_repo_initialized()
         print("Estado de los Pull Requests:")
-        for pr in self.app.pr_queue.get_all():
+        for pr in self.app.pr_queue.filter(**self._parse_filters(args[2:])):
             print(f"ID: {pr.id} | Estado: {pr.status} | Origen: {pr.source} -> Destino: {pr.target}")
 
     def next(self, args):
         self._check_repo_initialized()
-        """Mueve el siguiente PR a revisión sin eliminarlo de la cola"""
-        if self.app.pr_queue.is_empty():
+        """Mueve a revisión el PR pendiente de mayor prioridad (el más antiguo si empatan)"""
+        pr = self.app.pr_queue.next_for_review()
+        if not pr:
             print("No hay PRs pendientes en la cola")
             return
-        
-        pr = self.app.pr_queue.peek()  # Obtener PR sin remover
-        pr.status = "reviewing"
         print(f"PR #{pr.id} en revisión: {pr.source} -> {pr.target}")
-        self.app._save_pull_requests()
+        self.app.save("prs")
 
     def approve(self, args):
         self._check_repo_initialized()
@@ -539,25 +834,37 @@ class GitPR(Command):
         if pr.status != "reviewing":
             raise Exception(f"PR #{pr_id} no está en revisión")
 
-        # 1. Fusionar archivos al staging area
-        self.app.staging.clear()
-        for filename in pr.files:
-            self.app.staging.push(filename, estado='A')
-        
-        # 2. Crear commit de fusión
+        target_node = self.app.branch_tree.find(pr.target)
+        if not target_node:
+            raise Exception(f"La rama destino '{pr.target}' no existe")
+
+        # 1. Guardar los archivos del PR como blobs (un archivo que ya no existe es un borrado)
+        paths = [os.path.join(self.app.repo_path, filename) for filename in pr.files]
+        file_hashes = dict(zip(pr.files, self.app.store_files(paths)))
+
+        # 2. Crear commit de fusión sobre la punta de la rama destino, como 'commit'
         merge_commit = Commit(
             message=f"Merge PR #{pr.id}: {pr.source} -> {pr.target}",
             author_email="system@merge",
             staged_files=pr.files,
-            parent_id=self.app.commits.tail.data.id if self.app.commits.tail else None
+            parent_id=target_node.commit.id if target_node.commit else None
         )
-        self.app.commits.insert_at_end(merge_commit)
-        self.app._save_commits()
+        merge_commit.branch = pr.target
+        merge_commit.file_hashes = file_hashes
+        self.app._index_objects(file_hashes.values())
+        self.app.object_store.maybe_pack()
+        self.app._append_commit(merge_commit)
+        self.app.staging.clear()
+        self.app.save("commits")
+        target_node.commit = merge_commit
+        if self.app.branch_tree.current_branch is target_node:
+            self.app.current_commit = merge_commit
+        self.app.save("branches")
         
         # 3. Actualizar estado del PR
-        pr.status = "merged"
         pr.merged_at = datetime.now()
-        self.app._save_pull_requests()
+        self.app.pr_queue.set_status(pr, "merged")
+        self.app.save("prs")
         
         print(f"PR #{pr_id} fusionado en {pr.target}. Commit: {merge_commit.id}")
         
@@ -570,8 +877,8 @@ class GitPR(Command):
         pr_id = int(args[2])
         pr = self.app.pr_queue.find_pr_by_id(pr_id)
         if pr:
-            pr.status = "rejected"
-            self.app._save_pull_requests()
+            self.app.pr_queue.set_status(pr, "rejected")
+            self.app.save("prs")
             print(f"PR #{pr_id} rechazado")
         else:
             raise Exception(f"PR #{pr_id} no encontrado")
@@ -583,10 +890,8 @@ class GitPR(Command):
         if len(args) != 3:
             raise Exception("Uso: pr cancel <id_pr>")
         pr_id = int(args[2])
-        pr = self.app.pr_queue.find_pr_by_id(pr_id)
-        if pr:
-            self.app.pr_queue.items.remove(pr)  # Eliminar de la cola
-            self.app._save_pull_requests()
+        if self.app.pr_queue.remove(pr_id):
+            self.app.save("prs")
             print(f"PR #{pr_id} cancelado")
         else:
             raise Exception(f"PR #{pr_id} no encontrado")
@@ -594,7 +899,7 @@ class GitPR(Command):
     def list(self, args):
         self._check_repo_initialized()
         print("Lista de Pull Requests:")
-        for pr in self.app.pr_queue.get_all():
+        for pr in self.app.pr_queue.filter(**self._parse_filters(args[2:])):
             print(f"ID: {pr.id} | Estado: {pr.status} | {pr.source} -> {pr.target} | Autor: {pr.author} | Date: {pr.created_at}")
 
     def clear(self, args):
@@ -602,18 +907,18 @@ class GitPR(Command):
         if not self.app._has_permission("merge"):
             raise Exception("Permiso denegado: No puedes limpiar la cola de PRs.")
         self.app.pr_queue.clear()
-        self.app._save_pull_requests()
+        self.app.save("prs")
         print("Todos los PRs pendientes eliminados")
 
     def help(self, args):
         print("Comandos:")
-        print("-create")
-        print("-status")
-        print("-next")
+        print("-create <origen> <destino> [--priority critical|high|normal|low]")
+        print("-status [--status <estado>] [--author <email>] [--target <rama>]")
+        print("-next (siguiente por prioridad y antigüedad)")
         print("-approve")
         print("-reject")
         print("-cancel")
-        print("-list")
+        print("-list [--status <estado>] [--author <email>] [--target <rama>]")
         print("-clear")
 
 class GitRole(Command):
@@ -625,12 +930,13 @@ class GitRole(Command):
             "remove": self.remove,
             "show": self.show,
             "check": self.check,
-            "list": self.list_users
+            "list": self.list_users,
+            "import": self.import_users
         }
 
     def execute(self, args):
         if len(args) < 2:
-            print("Uso: role <add|update|remove|show|check|list> ...")
+            print("Uso: role <add|update|remove|show|check|list|import> ...")
             return
         subcmd = args[1]
         if subcmd in self.subcommands:
@@ -646,6 +952,7 @@ class GitRole(Command):
         role = args[3]
         permisos = args[4].split(",")
         self.app.roles.insert(email, role, permisos)
+        self._save()
         print(f"Usuario {email} agregado con rol {role} y permisos {permisos}")
 
     def update(self, args):
@@ -656,6 +963,7 @@ class GitRole(Command):
         new_role = args[3]
         new_permisos = args[4].split(",")
         if self.app.roles.update(email, new_role, new_permisos):
+            self._save()
             print(f"Usuario {email} actualizado a rol {new_role} con permisos {new_permisos}")
         else:
             print("Usuario no encontrado")
@@ -666,6 +974,7 @@ class GitRole(Command):
             return
         email = args[2]
         self.app.roles.remove(email)
+        self._save()
         print(f"Usuario {email} eliminado")
 
     def show(self, args):
@@ -694,13 +1003,35 @@ class GitRole(Command):
         for u in users:
             print(f"Email: {u['email']}, Rol: {u['role']}, Permisos: {u['permisos']}")
 
+    def import_users(self, args):
+        """Carga usuarios desde un archivo con una línea '<email> <role> [permissions_coma]' por usuario"""
+        if len(args) < 3:
+            print("Uso: role import <archivo>")
+            return
+        users = []
+        with open(args[2], "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                parts = line.split()
+                if not parts or parts[0].startswith("#"):
+                    continue
+                if len(parts) not in (2, 3):
+                    raise Exception(f"{args[2]}:{number}: se esperaba '<email> <role> [permissions_coma]'")
+                users.append((parts[0], parts[1], parts[2].split(",") if len(parts) == 3 else []))
+        count = self.app.roles.import_users(users)
+        self._save()
+        print(f"{count} usuarios importados")
+
+    def _save(self):
+        if self.app.repo_path:
+            self.app.save("roles")
+
 class GitConfig(Command):
     def __init__(self, app):
         self.app = app
 
     def execute(self, args):
         if len(args) != 3:
-            print("Uso: config user.name <nombre> | config user.email <email>")
+            print("Uso: config user.name <nombre> | config user.email <email> | config core.bufferSize <bytes> | config merge.workers <n> | config pr.backend json|sqlite")
             return
         if args[1] == "user.name":
             self.app.user_name = args[2]
@@ -708,8 +1039,23 @@ class GitConfig(Command):
         elif args[1] == "user.email":
             self.app.user_email = args[2]
             print(f"Email de usuario cambiado a: {args[2]}")
+        elif args[1] == "core.bufferSize":
+            if not args[2].isdigit() or int(args[2]) <= 0:
+                raise Exception("core.bufferSize debe ser un entero positivo (bytes)")
+            self.app.hasher.buffer_size = int(args[2])
+            print(f"Tamaño de bloque para hashing: {args[2]} bytes")
+        elif args[1] == "merge.workers":
+            if not args[2].isdigit() or int(args[2]) <= 0:
+                raise Exception("merge.workers debe ser un entero positivo (1 = merge en serie)")
+            self.app.merger.max_workers = int(args[2])
+            print(f"Procesos para merge: {args[2]}")
+        elif args[1] == "pr.backend":
+            if args[2] not in ("json", "sqlite"):
+                raise Exception("pr.backend debe ser 'json' o 'sqlite'")
+            self.app._switch_pr_backend(args[2])
+            print(f"Pull requests guardados con: {args[2]}")
         else:
-            print("Opción no reconocida. Usa user.name o user.email")
+            print("Opción no reconocida. Usa user.name, user.email, core.bufferSize, merge.workers o pr.backend")
 
 class GitHelp(Command):
     def execute(self, args):
@@ -744,7 +1090,10 @@ class GitBranch(Command):
             raise Exception("Uso: branch [opción] <nombre>")
             
         if args[1] == "--list":
-            self._list_branches()
+            if len(args) > 2:
+                self._list_branches_with_prefix(args[2])
+            else:
+                self._list_branches()
         elif args[1] == "-d":
             if not self.app._has_permission("branch"):
                 raise Exception("Permiso denegado: No puedes eliminar ramas.")
@@ -752,10 +1101,18 @@ class GitBranch(Command):
         elif args[1] == "merge":
             if not self.app._has_permission("merge"):
                 raise Exception("Permiso denegado: No puedes hacer merge de ramas.")
-            if self.app.branch_tree.merge(args[2], args[3], repo_path=self.app.repo_path, commits_list=self.app.commits):
+            if self.app.branch_tree.merge(args[2], args[3], self.app.commit_graph,
+                                          append_commit=self.app._append_commit,
+                                          object_store=self.app.object_store,
+                                          merge_service=self.app.merger):
+                target_node = self.app.branch_tree.find(args[3])
+                self.app._index_objects(target_node.commit.file_hashes.values())
+                self.app.object_store.maybe_pack()  # Los blobs combinados también cuentan como sueltos
+                if self.app.branch_tree.current_branch is target_node:
+                    self.app.current_commit = target_node.commit
                 print(f"Merge exitoso de '{args[2]}' en '{args[3]}'")
-                self.app._save_commits()
-                self.app.branch_tree.save(self.app.repo_path)
+                self.app.save("commits")
+                self.app.save("branches")
             else:
                 raise Exception("Error en el merge. ¿Ramas válidas?")
         else:
@@ -767,31 +1124,30 @@ class GitBranch(Command):
         current_branch = self.app.branch_tree.current_branch
         if self.app.branch_tree.add_branch(current_branch.name, branch_name):
             print(f"Rama '{branch_name}' creada bajo '{current_branch.name}'")
-            self.app.branch_tree.save(self.app.repo_path)
+            self.app.save("branches")
         else:
             raise Exception("Error creando rama")
     
     def _delete_branch(self, branch_name):
         if self.app.branch_tree.delete_branch(branch_name):
             print(f"Rama '{branch_name}' eliminada")
-            self.app.branch_tree.save(self.app.repo_path)
+            self.app.save("branches")
         else:
             raise Exception("No se puede eliminar la rama. ¿Está fusionada?")
     
     def _list_branches(self):
         branches = self.app.branch_tree.list_branches_preorder(self.app.branch_tree.root)
         print("\n".join(branches))
+
+    def _list_branches_with_prefix(self, prefix):
+        branches = self.app.branch_tree.find_prefix(prefix)
+        if not branches:
+            print(f"Ninguna rama empieza con '{prefix}'")
+            return
+        print("\n".join(branch.name for branch in branches))
     
-    def _merge_branches(self, source, target):
-        if self.app.branch_tree.merge(source, target):
-            print(f"Merge exitoso de '{source}' en '{target}'")
-            self.app._save_commits()
-            self.app.branch_tree.save(self.app.repo_path)
-        else:
-            raise Exception("Error en el merge. ¿Ramas válidas?")
-        
     def help(self):
-        print('--list')
+        print('--list [prefijo]')
         print('-d <name>')
         print('merge <source> <target>')
         
@@ -818,7 +1174,10 @@ class GitContributors(Command):
                 raise Exception("Permiso denegado: No puedes eliminar colaboradores.")
             self._remove_contributor(args[2])
         elif subcmd == "find":
-            self._find_contributor(args[2])
+            if args[2] == "--prefix":
+                self._find_contributors_with_prefix(args[3] if len(args) > 3 else "")
+            else:
+                self._find_contributor(args[2])
         elif subcmd == 'help':
             self.__help()
         else:
@@ -830,13 +1189,13 @@ class GitContributors(Command):
     
     def _add_contributor(self, name, role):
         self.app.contributors.insert(name, role)
-        self.app.contributors.save(self.app.repo_path)
+        self.app.save("contributors")
         print(f"Colaborador '{name}' agregado como {role}")
     
     def _remove_contributor(self, name):
         if self.app.contributors.find(name):
             self.app.contributors.delete(name)
-            self.app.contributors.save(self.app.repo_path)
+            self.app.save("contributors")
             print(f"Colaborador '{name}' eliminado")
         else:
             raise Exception("Colaborador no encontrado")
@@ -847,6 +1206,14 @@ class GitContributors(Command):
             print(f"Nombre: {contributor.name} | Rol: {contributor.role}")
         else:
             print("Colaborador no encontrado")
+
+    def _find_contributors_with_prefix(self, prefix):
+        contributors = self.app.contributors.find_prefix(prefix)
+        if not contributors:
+            print(f"Ningún colaborador empieza con '{prefix}'")
+            return
+        for contributor in contributors:
+            print(f"Nombre: {contributor.name} | Rol: {contributor.role}")
     
     def __help(self):
         print('add <name> <role>')
@@ -854,7 +1221,36 @@ class GitContributors(Command):
         print('add <name> <role>')
         print('remove <name>')
         print('find <name>')
+        print('find --prefix <prefijo>')
 
-if __name__ == "__main__":
+def main():
+    if len(sys.argv) == 1:
+        # Modo interactivo: no hace falta cargar argparse
+        ConsoleApp().run()
+        return
+    import argparse
+    parser = argparse.ArgumentParser(description="Consola git del Parcial 4")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="SCRIPT",
+                        help="Ejecuta los comandos de SCRIPT (o de stdin) sin modo interactivo")
+    parser.add_argument("--flush-every", type=int, default=BATCH_FLUSH_EVERY,
+                        help="Comandos entre escrituras a disco en modo batch (0 = solo al final)")
+    parser.add_argument("-c", "--command", action="append", metavar="COMANDO",
+                        help="Ejecuta un comando y termina (se puede repetir)")
+    args = parser.parse_args()
     app = ConsoleApp()
-    app.run()
\ No newline at end of file
+    if args.command:
+        executed, failed = app.run_batch(args.command, args.flush_every)
+        sys.exit(1 if failed else 0)
+    if args.batch is None:
+        app.run()
+        return
+    if args.batch == "-":
+        executed, failed = app.run_batch(sys.stdin, args.flush_every)
+    else:
+        with open(args.batch, "r", encoding="utf-8") as f:
+            executed, failed = app.run_batch(f, args.flush_every)
+    print(f"{executed} comandos ejecutados, {failed} con error")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
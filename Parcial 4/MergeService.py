@@ -0,0 +1,61 @@
+# 12. Módulo de Merge de Archivos en Paralelo (pool de procesos)
+import os
+
+from LineDiff import iter_lines, merge3
+from ObjectStore import ObjectStore
+
+MIN_PARALLEL_FILES = 64  # Con menos archivos el merge se hace en serie
+CHUNKS_PER_WORKER = 4    # Bloques de tareas por proceso (reparte mejor archivos desiguales)
+
+_worker_store = None  # ObjectStore propio de cada proceso trabajador
+
+def blob_lines(object_store, file_hash):
+    """Líneas de un blob, o [] si no hay blob"""
+    if file_hash and object_store and object_store.contains(file_hash):
+        return list(iter_lines(object_store.stream_blob(file_hash)))
+    return []
+
+def merge_file(object_store, task):
+    """
+    task = (archivo, sha_base, sha_ours, sha_theirs, etiqueta_ours, etiqueta_theirs).
+    Devuelve (archivo, sha1 del resultado, número de conflictos).
+    """
+    filename, base_hash, ours_hash, theirs_hash, ours_label, theirs_label = task
+    lines, conflicts = merge3(blob_lines(object_store, base_hash),
+                              blob_lines(object_store, ours_hash),
+                              blob_lines(object_store, theirs_hash),
+                              ours_label, theirs_label)
+    result_hash = object_store.write_bytes(b"".join(lines)) if object_store else None
+    return filename, result_hash, conflicts
+
+def _init_worker(repo_path):
+    global _worker_store
+    _worker_store = ObjectStore(repo_path)
+
+def _merge_in_worker(task):
+    return merge_file(_worker_store, task)
+
+class MergeService:
+    """
+    Combina los archivos que cambiaron en ambas ramas. Con muchos archivos
+    el trabajo se reparte en bloques entre procesos (merge3 es Python puro y
+    no libera el GIL); cada proceso abre su propio ObjectStore. Los resultados
+    se devuelven ordenados por nombre de archivo.
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def merge_files(self, object_store, tasks):
+        tasks = sorted(tasks)
+        if len(tasks) < MIN_PARALLEL_FILES or self.max_workers == 1 or not object_store:
+            return [merge_file(object_store, task) for task in tasks]
+        from concurrent.futures import ProcessPoolExecutor
+        workers = min(self.max_workers, len(tasks))
+        chunksize = max(1, len(tasks) // (workers * CHUNKS_PER_WORKER))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(object_store.repo_path,)) as pool:
+            results = list(pool.map(_merge_in_worker, tasks, chunksize=chunksize))
+        # Los blobs los escribieron otros procesos, y solo los que no existían
+        # crearon un archivo suelto: se cuenta lo que quedó en disco
+        object_store.recount_loose()
+        return sorted(results)
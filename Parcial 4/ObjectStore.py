@@ -0,0 +1,257 @@
+# 5. Módulo de Objetos Git (almacén direccionado por contenido)
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from FileHasher import iter_chunks
+
+CHUNK_SIZE = 64 * 1024          # Tamaño de bloque para leer/comprimir en streaming
+LOOSE_LIMIT = 4096              # Objetos sueltos antes de empaquetar automáticamente
+PACK_MAGIC = b"PACK"
+IDX_MAGIC = b"\xfftOc"
+IDX_VERSION = 2
+
+class PackIndex:
+    """
+    Índice de un packfile: tabla fan-out de 256 entradas, hashes ordenados
+    y (offset, longitud) de cada objeto comprimido dentro del .pack.
+    El archivo se mapea en memoria, así que abrirlo no lo lee completo.
+    """
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-4] + ".pack"
+        self._file = open(idx_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != IDX_MAGIC:
+            raise Exception(f"Índice de pack inválido: {idx_path}")
+        self.fanout = struct.unpack_from(">256I", self._map, 8)
+        self.count = self.fanout[255]
+        self._sha_start = 8 + 256 * 4
+        self._loc_start = self._sha_start + 20 * self.count
+
+    def _sha_at(self, i):
+        start = self._sha_start + 20 * i
+        return self._map[start:start + 20]
+
+    def find(self, sha1_hash):
+        """Búsqueda binaria limitada por la tabla fan-out. Devuelve (offset, longitud) o None"""
+        raw = bytes.fromhex(sha1_hash)
+        first = raw[0]
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._sha_at(mid)
+            if current < raw:
+                lo = mid + 1
+            elif current > raw:
+                hi = mid
+            else:
+                return struct.unpack_from(">QQ", self._map, self._loc_start + 16 * mid)
+        return None
+
+    def hashes(self):
+        """Recorre los hashes del pack en orden"""
+        for i in range(self.count):
+            yield self._sha_at(i).hex()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class ObjectStore:
+    """
+    Almacén de blobs en <repo>/.git/objects:
+    - Objetos sueltos comprimidos con zlib en objects/xx/yyyy... (clave SHA-1 del contenido)
+    - Packfiles en objects/pack con índice fan-out ordenado para repos grandes
+    """
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self.objects_dir = os.path.join(repo_path, ".git", "objects")
+        self.pack_dir = os.path.join(self.objects_dir, "pack")
+        os.makedirs(self.pack_dir, exist_ok=True)
+        self.packs = []
+        for name in sorted(os.listdir(self.pack_dir)):
+            if name.endswith(".idx"):
+                self.packs.append(PackIndex(os.path.join(self.pack_dir, name)))
+        self.recount_loose()
+        self._lock = threading.Lock()  # write_file puede llamarse desde varios hilos
+
+    def _loose_path(self, sha1_hash):
+        return os.path.join(self.objects_dir, sha1_hash[:2], sha1_hash[2:])
+
+    def recount_loose(self):
+        """Vuelve a contar los objetos sueltos en disco (p. ej. tras escrituras de otros procesos)"""
+        self.loose_count = sum(1 for _ in self._loose_hashes())
+
+    def _loose_hashes(self):
+        for prefix in os.listdir(self.objects_dir):
+            if len(prefix) != 2:
+                continue
+            for rest in os.listdir(os.path.join(self.objects_dir, prefix)):
+                if not rest.endswith(".tmp"):
+                    yield prefix + rest
+
+    def write_file(self, file_path, buffer_size=None):
+        """
+        Comprime y guarda un archivo como blob leyendo por bloques de
+        buffer_size bytes (config core.bufferSize). El SHA-1 se calcula en
+        la misma pasada. Devuelve el hash.
+        """
+        sha = hashlib.sha1()
+        compressor = zlib.compressobj()
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.objects_dir)
+        try:
+            with os.fdopen(fd, "wb") as out, open(file_path, "rb") as f:
+                for chunk in iter_chunks(f, buffer_size):
+                    sha.update(chunk)
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+            sha1_hash = sha.hexdigest()
+            if self.contains(sha1_hash):
+                os.remove(tmp_path)
+                return sha1_hash
+            os.makedirs(os.path.dirname(self._loose_path(sha1_hash)), exist_ok=True)
+            os.replace(tmp_path, self._loose_path(sha1_hash))
+            with self._lock:
+                self.loose_count += 1
+            return sha1_hash
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def write_bytes(self, data):
+        """Guarda un blob a partir de bytes en memoria (contenido generado, p. ej. merges)"""
+        sha1_hash = hashlib.sha1(data).hexdigest()
+        if not self.contains(sha1_hash):
+            path = self._loose_path(sha1_hash)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Nombre temporal único: varios procesos pueden escribir a la vez
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data))
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.loose_count += 1
+        return sha1_hash
+
+    def contains(self, sha1_hash):
+        if os.path.isfile(self._loose_path(sha1_hash)):
+            return True
+        return any(pack.find(sha1_hash) for pack in self.packs)
+
+    def stream_blob(self, sha1_hash, chunk_size=CHUNK_SIZE):
+        """
+        Generador que devuelve el contenido del blob descomprimido por bloques,
+        leyendo solo la región del pack que ocupa el objeto.
+        """
+        loose_path = self._loose_path(sha1_hash)
+        if os.path.isfile(loose_path):
+            with open(loose_path, "rb") as f:
+                yield from self._inflate(f, None, chunk_size)
+            return
+        for pack in self.packs:
+            location = pack.find(sha1_hash)
+            if location:
+                offset, length = location
+                with open(pack.pack_path, "rb") as f:
+                    f.seek(offset)
+                    yield from self._inflate(f, length, chunk_size)
+                return
+        raise KeyError(f"Objeto {sha1_hash} no encontrado")
+
+    def read_blob(self, sha1_hash):
+        """Devuelve el blob completo (solo para archivos pequeños)"""
+        return b"".join(self.stream_blob(sha1_hash))
+
+    def _inflate(self, f, length, chunk_size):
+        decompressor = zlib.decompressobj()
+        remaining = length
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            data = decompressor.decompress(chunk, chunk_size)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def all_hashes(self):
+        """Todos los hashes almacenados (sueltos y empaquetados) en orden"""
+        hashes = set(self._loose_hashes())
+        for pack in self.packs:
+            hashes.update(pack.hashes())
+        return sorted(hashes)
+
+    def maybe_pack(self):
+        """Empaqueta los objetos sueltos cuando superan LOOSE_LIMIT"""
+        if self.loose_count >= LOOSE_LIMIT:
+            self.pack_loose()
+
+    def pack_loose(self):
+        """
+        Mueve todos los objetos sueltos a un nuevo packfile.
+        Los datos ya están comprimidos, así que se copian tal cual.
+        """
+        loose = sorted(h for h in self._loose_hashes()
+                       if not any(pack.find(h) for pack in self.packs))
+        if not loose:
+            return None
+        name = "pack-" + hashlib.sha1("".join(loose).encode()).hexdigest()
+        pack_path = os.path.join(self.pack_dir, name + ".pack")
+        idx_path = os.path.join(self.pack_dir, name + ".idx")
+        locations = []
+        with open(pack_path + ".tmp", "wb") as pack:
+            pack.write(PACK_MAGIC + struct.pack(">II", IDX_VERSION, len(loose)))
+            for sha1_hash in loose:
+                offset = pack.tell()
+                with open(self._loose_path(sha1_hash), "rb") as f:
+                    while True:
+                        chunk = f.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        pack.write(chunk)
+                locations.append((offset, pack.tell() - offset))
+            pack.flush()
+            os.fsync(pack.fileno())
+        fanout = [0] * 256
+        for sha1_hash in loose:
+            fanout[int(sha1_hash[:2], 16)] += 1
+        for i in range(1, 256):
+            fanout[i] += fanout[i - 1]
+        with open(idx_path + ".tmp", "wb") as idx:
+            idx.write(IDX_MAGIC + struct.pack(">I", IDX_VERSION))
+            idx.write(struct.pack(">256I", *fanout))
+            for sha1_hash in loose:
+                idx.write(bytes.fromhex(sha1_hash))
+            for offset, length in locations:
+                idx.write(struct.pack(">QQ", offset, length))
+            idx.flush()
+            os.fsync(idx.fileno())
+        # El .pack debe existir antes que el .idx que lo referencia
+        os.replace(pack_path + ".tmp", pack_path)
+        os.replace(idx_path + ".tmp", idx_path)
+        self.packs.append(PackIndex(idx_path))
+        for sha1_hash in loose:
+            os.remove(self._loose_path(sha1_hash))
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            if len(prefix) == 2 and not os.listdir(prefix_dir):
+                os.rmdir(prefix_dir)
+        self.loose_count = 0
+        return idx_path
+
+    def close(self):
+        for pack in self.packs:
+            pack.close()
+        self.packs = []
@@ -0,0 +1,171 @@
+import json
+import sqlite3
+
+from PullRequest import PullRequest
+from PullRequestStore import PRIORITY_LEVELS, PullRequestStore
+
+# Columns holding lists are stored as JSON text
+LIST_COLUMNS = ("commits", "files", "reviewers", "tags")
+COLUMNS = ("id", "source", "target", "status", "author", "priority", "created_at", "merged_at",
+           "closed_at", "title", "description") + LIST_COLUMNS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL,
+    author TEXT,
+    priority INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    merged_at TEXT,
+    closed_at TEXT,
+    title TEXT,
+    description TEXT,
+    commits TEXT,
+    files TEXT,
+    reviewers TEXT,
+    tags TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pr_status ON pull_requests (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_pr_author ON pull_requests (author);
+CREATE INDEX IF NOT EXISTS idx_pr_target ON pull_requests (target);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1);
+"""
+
+class SQLitePullRequestStore:
+    writes_through = True  # Every change is already in the database
+
+    def __init__(self, db_path):
+        """
+        Pull request store backed by sqlite3 (WAL mode). Same interface as
+        PullRequestStore, but every change is written through as a single-row
+        upsert and nothing is loaded at startup: lookups, filters and the
+        review schedule are indexed queries.
+        Args:
+            db_path (str): Database file (created if missing).
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # WAL keeps the file consistent; fsync on checkpoint
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def __len__(self):
+        """Returns the number of stored PRs."""
+        return self.conn.execute("SELECT COUNT(*) FROM pull_requests").fetchone()[0]
+
+    def is_empty(self):
+        """Checks if there are no PRs at all."""
+        return self.conn.execute("SELECT 1 FROM pull_requests LIMIT 1").fetchone() is None
+
+    @property
+    def next_id(self):
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()[0]
+
+    def allocate_id(self):
+        """Returns a new unique PR id, persisted immediately."""
+        with self.conn:
+            pr_id = self.next_id
+            self.conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (pr_id + 1,))
+        return pr_id
+
+    def _row(self, pr):
+        data = pr.to_dict()
+        data["priority"] = PRIORITY_LEVELS[PullRequestStore.priority_of(pr)]
+        for column in LIST_COLUMNS:
+            data[column] = json.dumps(data[column])
+        return tuple(data[column] for column in COLUMNS)
+
+    def _from_row(self, row):
+        data = dict(zip(COLUMNS, row))
+        for column in LIST_COLUMNS:
+            data[column] = json.loads(data[column]) if data[column] else []
+        return PullRequest.from_dict(data)
+
+    def _select(self, where="", params=(), suffix=" ORDER BY id"):
+        query = f"SELECT {', '.join(COLUMNS)} FROM pull_requests{where}{suffix}"
+        return [self._from_row(row) for row in self.conn.execute(query, params)]
+
+    def save(self, pr):
+        """Inserts or updates one PR (a single-row upsert)."""
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+        with self.conn:
+            self.conn.execute(f"INSERT INTO pull_requests ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+                              f"ON CONFLICT(id) DO UPDATE SET {updates}", self._row(pr))
+            self.conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (pr.id + 1,))
+
+    def enqueue(self, pr):
+        """
+        Adds a PR.
+        Args:
+            pr (PullRequest): PR to store. Its id must not be in use.
+        """
+        if self.find_pr_by_id(pr.id):
+            raise Exception(f"PR #{pr.id} ya existe")
+        self.save(pr)
+
+    def find_pr_by_id(self, pr_id):
+        """Returns the PR with the given id, or None (primary key lookup)."""
+        found = self._select(" WHERE id = ?", (pr_id,), "")
+        return found[0] if found else None
+
+    def set_status(self, pr, status):
+        """Changes the status of a PR and saves it."""
+        pr.status = status
+        self.save(pr)
+
+    def remove(self, pr_id):
+        """
+        Deletes a PR.
+        Returns:
+            PullRequest: The removed PR, or None if it did not exist.
+        """
+        pr = self.find_pr_by_id(pr_id)
+        if pr:
+            with self.conn:
+                self.conn.execute("DELETE FROM pull_requests WHERE id = ?", (pr_id,))
+        return pr
+
+    def next_for_review(self):
+        """
+        Moves the highest-priority pending PR (oldest first on ties) to "reviewing".
+        Served by the (status, priority, created_at) index.
+        Returns:
+            PullRequest: The PR now under review, or None if nothing is pending.
+        """
+        found = self._select(" WHERE status = 'pending'", (), " ORDER BY priority, created_at, id LIMIT 1")
+        if not found:
+            return None
+        self.set_status(found[0], "reviewing")
+        return found[0]
+
+    def filter(self, status=None, author=None, target=None):
+        """Returns the PRs matching every given criterion, in creation order."""
+        conditions = [(column, value) for column, value in (("status", status), ("author", author),
+                                                            ("target", target)) if value is not None]
+        where = " WHERE " + " AND ".join(f"{column} = ?" for column, _ in conditions) if conditions else ""
+        return self._select(where, tuple(value for _, value in conditions))
+
+    def clear(self):
+        """Removes all PRs. The id allocator keeps counting."""
+        with self.conn:
+            self.conn.execute("DELETE FROM pull_requests")
+
+    def get_all(self):
+        """Returns a list of all PRs in creation order (for status display)."""
+        return self._select()
+
+    def import_store(self, store):
+        """Copies every PR and the id counter of another store in one transaction."""
+        with self.conn:
+            for pr in store.get_all():
+                self.conn.execute(f"INSERT OR REPLACE INTO pull_requests ({', '.join(COLUMNS)}) "
+                                  f"VALUES ({', '.join('?' for _ in COLUMNS)})", self._row(pr))
+            self.conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (store.next_id,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,172 @@
+import heapq
+
+from PullRequest import PullRequest
+
+# Lower rank = reviewed first. A PR gets its rank from a "priority:<level>" tag.
+PRIORITY_LEVELS = {"critical": 0, "high": 1, "normal": 2, "low": 3}
+DEFAULT_PRIORITY = "normal"
+
+class PullRequestStore:
+    writes_through = False  # Changes are persisted by saving the whole store
+
+    def __init__(self):
+        """
+        Indexed storage for pull requests. Keeps the Queue interface used by
+        the console (enqueue, get_all, find_pr_by_id, clear...) but every
+        lookup goes through hash maps instead of scanning a deque.
+        """
+        self.prs = {}            # id -> PullRequest, in creation order
+        self.next_id = 1         # Monotonic: ids are never reused, even after cancel/clear
+        self.by_status = {}      # status -> {id: PullRequest}
+        self.by_author = {}      # author -> {id: PullRequest}
+        self.by_target = {}      # target branch -> {id: PullRequest}
+        self._schedule = []      # Heap of (priority rank, created_at, id) for pending PRs
+
+    def __len__(self):
+        """Returns the number of stored PRs."""
+        return len(self.prs)
+
+    def is_empty(self):
+        """Checks if there are no PRs at all."""
+        return not self.prs
+
+    def allocate_id(self):
+        """Returns a new unique PR id (O(1))."""
+        pr_id = self.next_id
+        self.next_id += 1
+        return pr_id
+
+    @staticmethod
+    def priority_of(pr):
+        """
+        Returns the priority level of a PR from its tags.
+        Args:
+            pr (PullRequest): PR to inspect.
+        Returns:
+            str: One of PRIORITY_LEVELS (DEFAULT_PRIORITY when untagged).
+        """
+        levels = [tag.split(":", 1)[1] for tag in pr.tags
+                  if tag.startswith("priority:") and tag.split(":", 1)[1] in PRIORITY_LEVELS]
+        return min(levels, key=PRIORITY_LEVELS.get) if levels else DEFAULT_PRIORITY
+
+    def _index(self, pr):
+        self.by_status.setdefault(pr.status, {})[pr.id] = pr
+        self.by_author.setdefault(pr.author, {})[pr.id] = pr
+        self.by_target.setdefault(pr.target, {})[pr.id] = pr
+        if pr.status == "pending":
+            self._schedule_pr(pr)
+
+    def _unindex(self, pr):
+        for index, key in ((self.by_status, pr.status), (self.by_author, pr.author),
+                           (self.by_target, pr.target)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(pr.id, None)
+                if not bucket:
+                    del index[key]
+
+    def _schedule_pr(self, pr):
+        rank = PRIORITY_LEVELS[self.priority_of(pr)]
+        heapq.heappush(self._schedule, (rank, pr.created_at.timestamp(), pr.id))
+
+    def enqueue(self, pr):
+        """
+        Adds a PR and indexes it (O(log n) because of the schedule heap).
+        Args:
+            pr (PullRequest): PR to store. Its id must not be in use.
+        """
+        if pr.id in self.prs:
+            raise Exception(f"PR #{pr.id} ya existe")
+        self.prs[pr.id] = pr
+        self.next_id = max(self.next_id, pr.id + 1)
+        self._index(pr)
+
+    def find_pr_by_id(self, pr_id):
+        """Returns the PR with the given id, or None (O(1))."""
+        return self.prs.get(pr_id)
+
+    def set_status(self, pr, status):
+        """
+        Changes the status of a stored PR keeping the secondary indexes in sync.
+        Args:
+            pr (PullRequest): PR already in the store.
+            status (str): New status.
+        """
+        self._unindex(pr)
+        pr.status = status
+        self._index(pr)
+
+    def remove(self, pr_id):
+        """
+        Deletes a PR (O(1)). Its schedule entry is discarded lazily by next_for_review.
+        Returns:
+            PullRequest: The removed PR, or None if it did not exist.
+        """
+        pr = self.prs.pop(pr_id, None)
+        if pr:
+            self._unindex(pr)
+        return pr
+
+    def next_for_review(self):
+        """
+        Moves the highest-priority pending PR (oldest first on ties) to "reviewing".
+        Returns:
+            PullRequest: The PR now under review, or None if nothing is pending.
+        """
+        while self._schedule:
+            _, _, pr_id = heapq.heappop(self._schedule)
+            pr = self.prs.get(pr_id)
+            # Entries of cancelled PRs or PRs that already left "pending" are stale
+            if pr and pr.status == "pending":
+                self.set_status(pr, "reviewing")
+                return pr
+        return None
+
+    def filter(self, status=None, author=None, target=None):
+        """
+        Returns the PRs matching every given criterion, in creation order.
+        The smallest matching index is scanned; the others are checked per PR.
+        """
+        buckets = [index.get(key, {}) for index, key in ((self.by_status, status), (self.by_author, author),
+                                                        (self.by_target, target)) if key is not None]
+        if not buckets:
+            return self.get_all()
+        smallest = min(buckets, key=len)
+        return sorted((pr for pr_id, pr in smallest.items() if all(pr_id in bucket for bucket in buckets)),
+                      key=lambda pr: pr.id)
+
+    def clear(self):
+        """Removes all PRs. The id allocator keeps counting."""
+        self.prs.clear()
+        self.by_status.clear()
+        self.by_author.clear()
+        self.by_target.clear()
+        self._schedule.clear()
+
+    def get_all(self):
+        """Returns a list of all PRs in creation order (for status display)."""
+        return list(self.prs.values())
+
+    def import_store(self, store):
+        """Copies every PR and the id counter of another store."""
+        for pr in store.get_all():
+            self.enqueue(pr)
+        self.next_id = max(self.next_id, store.next_id)
+
+    def close(self):
+        """Nothing to release; kept so both PR backends share one interface."""
+
+    def to_dict(self):
+        """Converts the store to a dictionary for JSON serialization."""
+        return {"next_id": self.next_id, "pull_requests": [pr.to_dict() for pr in self.prs.values()]}
+
+    def load_dict(self, data):
+        """
+        Loads PRs saved by to_dict. Also accepts the old format (a plain list
+        of PRs), where the next id is derived from the highest stored id.
+        """
+        records = data if isinstance(data, list) else data.get("pull_requests", [])
+        for pr_data in records:
+            self.enqueue(PullRequest.from_dict(pr_data))
+        if isinstance(data, dict):
+            self.next_id = max(self.next_id, data.get("next_id", 1))
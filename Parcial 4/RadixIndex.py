@@ -0,0 +1,135 @@
+# 13. Módulo de Índice por Prefijo (árbol radix)
+
+class RadixNode:
+    __slots__ = ("label", "children", "value", "has_value")
+
+    def __init__(self, label=""):
+        self.label = label    # Tramo de la clave que representa la arista hacia este nodo
+        self.children = {}    # primer carácter del tramo -> RadixNode
+        self.value = None
+        self.has_value = False
+
+class RadixIndex:
+    """
+    Árbol radix (trie comprimido) de claves de texto. Las cadenas de nodos
+    con un solo hijo se juntan en una arista, así que el árbol tiene a lo
+    sumo 2n nodos. Buscar por prefijo cuesta O(largo del prefijo) para
+    llegar al subárbol y O(resultados) para recorrerlo, ya ordenado.
+    """
+    def __init__(self):
+        self.root = RadixNode()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        node = self._find_node(key)
+        return node is not None and node.has_value
+
+    def get(self, key, default=None):
+        node = self._find_node(key)
+        return node.value if node is not None and node.has_value else default
+
+    def _find_node(self, key):
+        node = self.root
+        while key:
+            child = node.children.get(key[0])
+            if child is None or not key.startswith(child.label):
+                return None
+            key = key[len(child.label):]
+            node = child
+        return node
+
+    def insert(self, key, value=None):
+        """Agrega la clave (o reemplaza su valor si ya estaba)"""
+        node = self.root
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = node.children[rest[0]] = RadixNode(rest)
+                node = child
+                break
+            label = child.label
+            common = 1
+            limit = min(len(label), len(rest))
+            while common < limit and label[common] == rest[common]:
+                common += 1
+            if common < len(label):
+                # La clave se separa a mitad de la arista: se parte en dos
+                middle = node.children[rest[0]] = RadixNode(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                child = middle
+            node = child
+            rest = rest[common:]
+        if not node.has_value:
+            self.size += 1
+        node.value = value
+        node.has_value = True
+
+    def remove(self, key):
+        """Quita la clave. Devuelve False si no estaba."""
+        path = [self.root]
+        rest = key
+        while rest:
+            child = path[-1].children.get(rest[0])
+            if child is None or not rest.startswith(child.label):
+                return False
+            rest = rest[len(child.label):]
+            path.append(child)
+        node = path[-1]
+        if not node.has_value:
+            return False
+        node.value = None
+        node.has_value = False
+        self.size -= 1
+        if node is self.root:
+            return True
+        parent = path[-2]
+        if not node.children:
+            del parent.children[node.label[0]]
+            # Sin el hijo, el padre puede quedar como simple tramo de paso
+            if parent is not self.root and not parent.has_value and len(parent.children) == 1:
+                self._absorb_child(parent)
+        elif len(node.children) == 1:
+            self._absorb_child(node)
+        return True
+
+    def _absorb_child(self, node):
+        """Junta un nodo sin valor con su único hijo"""
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.value = child.value
+        node.has_value = child.has_value
+
+    def items(self, prefix=""):
+        """Genera (clave, valor) de las claves que empiezan con prefix, en orden"""
+        node = self.root
+        matched = ""
+        rest = prefix
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return
+            if child.label.startswith(rest):
+                rest = ""
+            elif rest.startswith(child.label):
+                rest = rest[len(child.label):]
+            else:
+                return
+            matched += child.label
+            node = child
+        pending = [(node, matched)]
+        while pending:
+            node, key = pending.pop()
+            if node.has_value:
+                yield key, node.value
+            for first in sorted(node.children, reverse=True):
+                child = node.children[first]
+                pending.append((child, key + child.label))
+
+    def keys(self, prefix=""):
+        return [key for key, _ in self.items(prefix)]
@@ -1,4 +1,22 @@
 # 4. Módulo de Roles (Árbol AVL)
+import json
+import os
+
+class CompiledPermissions:
+    """
+    Permisos efectivos de un usuario compilados en una máscara de bits.
+    RoleAVL interna una instancia por máscara distinta, así que los usuarios
+    de un mismo rol comparten el mismo objeto.
+    """
+    __slots__ = ("mask", "bits")
+
+    def __init__(self, mask, bits):
+        self.mask = mask
+        self.bits = bits  # permiso -> bit, compartido con RoleAVL
+
+    def allows(self, action):
+        return bool(self.mask & self.bits.get(action, 0))
+
 class PermisoAVLNode:
     def __init__(self, permiso):
         self.permiso = permiso
@@ -10,6 +28,13 @@ class PermisoAVL:
     def __init__(self):
         self.root = None
 
+    @classmethod
+    def from_sorted(cls, permisos):
+        """Construye el árbol ya balanceado desde una lista ordenada sin repetidos, en O(n)"""
+        tree = cls()
+        tree.root = _build_balanced(permisos, 0, len(permisos), PermisoAVLNode)
+        return tree
+
     def insert(self, permiso):
         self.root = self._insert(self.root, permiso)
 
@@ -50,6 +75,17 @@ class PermisoAVL:
         else:
             return self._contains(node.right, permiso)
 
+    def __iter__(self):
+        """Recorre los permisos sin recursión (árbol vacío incluido)"""
+        pending = [self.root] if self.root else []
+        while pending:
+            node = pending.pop()
+            yield node.permiso
+            if node.left:
+                pending.append(node.left)
+            if node.right:
+                pending.append(node.right)
+
     def _get_height(self, node):
         return node.height if node else 0
 
@@ -86,6 +122,21 @@ class PermisoAVL:
         result.append(node.permiso)
         return result
 
+def _build_balanced(items, lo, hi, make_node):
+    """
+    Árbol perfectamente balanceado con items[lo:hi] (ordenados): la mediana
+    es la raíz y cada mitad un subárbol. Las alturas se calculan al volver,
+    así que el resultado es un AVL válido sin ninguna rotación.
+    """
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    node = make_node(items[mid])
+    node.left = _build_balanced(items, lo, mid, make_node)
+    node.right = _build_balanced(items, mid + 1, hi, make_node)
+    node.height = 1 + max(node.left.height if node.left else 0, node.right.height if node.right else 0)
+    return node
+
 class RoleNode:
     def __init__(self, role_name):
         self.role_name = role_name
@@ -95,8 +146,10 @@ class RoleNode:
 class RoleList:
     def __init__(self):
         self.head = None
+        self.version = 0  # Cambia con cada add_role: invalida los permisos compilados
 
     def add_role(self, role_name, permisos):
+        self.version += 1
         node = self.find_role(role_name)
         if node:
             for p in permisos:
@@ -117,6 +170,12 @@ class RoleList:
             current = current.next
         return None
 
+    def __iter__(self):
+        current = self.head
+        while current:
+            yield current
+            current = current.next
+
 class UserAVLNode:
     def __init__(self, email, role, permisos):
         self.email = email
@@ -130,10 +189,134 @@ class RoleAVL:
     def __init__(self):
         self.root = None
         self.roles = RoleList()  # Lista enlazada de roles
+        # Caché de permisos compilados: email -> CompiledPermissions (None si no existe)
+        self._bits = {}          # permiso -> bit
+        self._interned = {}      # máscara -> CompiledPermissions compartido
+        self._compiled = {}
+        self._compiled_version = self.roles.version
+
+    def invalidate(self):
+        """Descarta los permisos compilados (se recompilan en la siguiente consulta)"""
+        self._compiled.clear()
+        self._compiled_version = self.roles.version
+
+    def _bit(self, permiso):
+        bit = self._bits.get(permiso)
+        if bit is None:
+            bit = self._bits[permiso] = 1 << len(self._bits)
+        return bit
+
+    def permissions_of(self, email):
+        """
+        Permisos efectivos del usuario en O(1) amortizado: el AVL de usuarios
+        y el de permisos se recorren solo la primera vez tras un cambio.
+        Devuelve un CompiledPermissions, o None si el usuario no existe.
+        """
+        if self._compiled_version != self.roles.version:
+            self.invalidate()
+        if email in self._compiled:
+            return self._compiled[email]
+        node = self._find(self.root, email)
+        compiled = None
+        if node:
+            mask = 0
+            for permiso in node.permisos:
+                mask |= self._bit(permiso)
+            compiled = self._interned.get(mask)
+            if compiled is None:
+                compiled = self._interned[mask] = CompiledPermissions(mask, self._bits)
+        self._compiled[email] = compiled
+        return compiled
 
     def insert(self, email, role, permisos):
         role_node = self.roles.add_role(role, permisos)
         self.root = self._insert(self.root, email, role, role_node.permisos)
+        self.invalidate()
+
+    def _inorder_nodes(self):
+        """Usuarios ordenados por email (recorrido iterativo)"""
+        pending = []
+        node = self.root
+        while pending or node:
+            while node:
+                pending.append(node)
+                node = node.left
+            node = pending.pop()
+            yield node
+            node = node.right
+
+    def _build_users(self, users):
+        """Reconstruye el AVL de usuarios desde [(email, rol)] ordenado por email, en O(n)"""
+        # Un solo recorrido de la lista de roles en vez de find_role por usuario
+        role_nodes = {role.role_name: role for role in self.roles}
+        entries = [(email, role, role_nodes[role].permisos) for email, role in users]
+        self.root = _build_balanced(entries, 0, len(entries), lambda entry: UserAVLNode(*entry))
+        self.invalidate()
+
+    def import_users(self, users):
+        """
+        Agrega (o reemplaza) muchos usuarios a la vez. users es una secuencia
+        de (email, rol, permisos). En lugar de una inserción con rotaciones
+        por usuario se ordena la entrada, se mezcla con el recorrido en orden
+        del árbol actual y el árbol se reconstruye balanceado.
+        Devuelve la cantidad de usuarios importados.
+        """
+        incoming = {}
+        role_permisos = {}  # rol -> permisos de todas sus líneas: add_role una vez por rol
+        for email, role, permisos in users:
+            role_permisos.setdefault(role, []).extend(permisos)
+            incoming[email] = role  # Si un email se repite gana la última línea
+        for role, permisos in role_permisos.items():
+            self.roles.add_role(role, permisos)
+        new_users = sorted(incoming.items())
+        merged = []
+        position = 0
+        for node in self._inorder_nodes():
+            while position < len(new_users) and new_users[position][0] < node.email:
+                merged.append(new_users[position])
+                position += 1
+            if position < len(new_users) and new_users[position][0] == node.email:
+                continue  # El importado reemplaza al existente
+            merged.append((node.email, node.role))
+        merged.extend(new_users[position:])
+        self._build_users(merged)
+        return len(new_users)
+
+    def to_dict(self):
+        """Roles (en el orden de la lista) y usuarios ordenados por email"""
+        return {
+            "roles": [{"name": role.role_name, "permisos": sorted(role.permisos)} for role in self.roles],
+            "users": [{"email": node.email, "role": node.role} for node in self._inorder_nodes()],
+        }
+
+    def load_dict(self, data):
+        """Reemplaza roles y usuarios con los guardados por to_dict, sin rotaciones"""
+        self.roles = RoleList()
+        # add_role inserta al frente: se agregan al revés para conservar el orden
+        for role in reversed(data.get("roles", [])):
+            role_node = self.roles.add_role(role["name"], [])
+            role_node.permisos = PermisoAVL.from_sorted(sorted(set(role["permisos"])))
+        known = {role.role_name for role in self.roles}
+        for user in data.get("users", []):
+            if user["role"] not in known:
+                self.roles.add_role(user["role"], [])
+                known.add(user["role"])
+        self._build_users(sorted((user["email"], user["role"]) for user in data.get("users", [])))
+
+    def save(self, repo_path):
+        path = os.path.join(repo_path, "roles.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(path + ".tmp", path)
+
+    def load(self, repo_path):
+        """Carga repo_path/roles.json. Devuelve False si el repo no tiene roles guardados."""
+        try:
+            with open(os.path.join(repo_path, "roles.json"), "r") as f:
+                self.load_dict(json.load(f))
+            return True
+        except FileNotFoundError:
+            return False
 
     def _insert(self, node, email, role, permisos):
         if not node:
@@ -166,11 +349,13 @@ class RoleAVL:
             role_node = self.roles.add_role(new_role, new_permisos)
             node.role = new_role
             node.permisos = role_node.permisos
+            self.invalidate()
             return True
         return False
 
     def remove(self, email):
         self.root = self._remove(self.root, email)
+        self.invalidate()
 
     def _remove(self, node, email):
         if not node:
@@ -210,10 +395,8 @@ class RoleAVL:
         return "Usuario no encontrado"
 
     def check_permission(self, email, action):
-        node = self._find(self.root, email)
-        if node and node.permisos.contains(action):
-            return True
-        return False
+        compiled = self.permissions_of(email)
+        return bool(compiled and compiled.allows(action))
 
     def list_users(self):
         result = []
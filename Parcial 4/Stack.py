@@ -1,39 +1,58 @@
 # Credits
 # https://www.geeksforgeeks.org/stack-in-python/
 
-import hashlib
 import os
+from FileHasher import sha1_file
+from StatCache import StatCache
 
 class StackManager:
     def __init__(self, app):
-        self.stack = []  # Pila de cambios: [(filename, hash, estado)]
+        # Pila de cambios indexada por nombre: {filename: {filename, hash, estado}}
+        # El dict conserva el orden de inserción, así que popitem() sigue siendo LIFO
+        self.stack = {}
         self.app = app  # Referencia a ConsoleApp
+        self.stat_cache = StatCache()  # (size, mtime_ns, inode, sha1) por archivo
+
+    def load_index(self):
+        """Carga la caché de stat desde repo_path/.git/index"""
+        self.stat_cache = StatCache(os.path.join(self.app.repo_path, ".git", "index"))
+
+    def save_index(self):
+        self.stat_cache.save()
         
-    def push(self, filename, estado='A'):
+    def push(self, filename, estado='A', file_hash=None):
         """Agrega/actualiza archivos en staging sin duplicados"""
-        file_hash = self._generate_hash(filename)
+        if file_hash is None:
+            file_hash = self._generate_hash(filename)
         
-        # Verificar si el archivo ya está en el stack
-        for item in self.stack:
-            if item["filename"] == filename:
-                # Actualizar hash y estado si es necesario
-                if item["hash"] != file_hash:
-                    item["hash"] = file_hash
-                    item["estado"] = 'M'  # Marcamos como modificado
-                return True  # Evita duplicados
+        # Verificar si el archivo ya está en el stack (búsqueda O(1))
+        item = self.stack.get(filename)
+        if item:
+            # Actualizar hash y estado si es necesario
+            if item["hash"] != file_hash:
+                item["hash"] = file_hash
+                item["estado"] = 'M'  # Marcamos como modificado
+            return True  # Evita duplicados
         
         # Si no existe, agregarlo
-        self.stack.append({
+        self.stack[filename] = {
             "filename": filename,
             "hash": file_hash,
             "estado": estado
-        })
+        }
         return True
 
+    def get(self, filename):
+        """Devuelve la entrada de staging de un archivo o None"""
+        return self.stack.get(filename)
+
+    def __contains__(self, filename):
+        return filename in self.stack
+
     def pop(self):
         """Elimina el último archivo agregado a la pila"""
         if not self.is_empty():
-            return self.stack.pop()
+            return self.stack.popitem()[1]
         return None
 
     def clear(self):
@@ -42,39 +61,94 @@ class StackManager:
 
     def get_staged_files(self):
         """Devuelve los archivos en staging (orden LIFO)"""
-        return [item["filename"] for item in self.stack]
+        return list(self.stack)
 
     def get_status(self, committed_files):
         """Escanea archivos dentro de repo_path"""
-        staged = [item["filename"] for item in self.stack]
+        staged = list(self.stack)
         modified = []
         untracked = []
         
         if self.app.repo_path:
-            for filename in os.listdir(self.app.repo_path):
-                file_path = os.path.join(self.app.repo_path, filename)
-                if os.path.isfile(file_path):
-                    current_hash = self._generate_hash(filename)
-                    in_stack = any(item["filename"] == filename for item in self.stack)
-                    
-                    if in_stack:
-                        stack_item = next(item for item in self.stack if item["filename"] == filename)
-                        if current_hash != stack_item["hash"]:
-                            modified.append(filename)
-                    else:
-                        if filename not in committed_files:
-                            untracked.append(filename)
+            in_stack = []
+            visited = set()
+            for filename, entry in self.scan_files():
+                visited.add(filename)
+                if filename in self.stack:
+                    in_stack.append((filename, entry))
+                elif filename not in committed_files:
+                    untracked.append(filename)
+            # Solo se rehashean (en paralelo) los archivos cuyo stat cambió
+            for (filename, _), current_hash in zip(in_stack, self.hash_entries(in_stack)):
+                if current_hash != self.stack[filename]["hash"]:
+                    modified.append(filename)
+            # El escaneo es completo: lo que no se visitó ya no existe
+            self.stat_cache.prune(visited)
+            self.app.save("index")
         
         return staged, modified, untracked
 
+    def scan_files(self):
+        """
+        Recorre el repo (con subdirectorios, sin entrar en .git) en una sola
+        pasada de os.scandir. Devuelve (ruta relativa con '/', DirEntry).
+        """
+        pending = [""]
+        while pending:
+            relative_dir = pending.pop()
+            with os.scandir(os.path.join(self.app.repo_path, relative_dir)) as entries:
+                for entry in entries:
+                    filename = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != ".git":
+                            pending.append(filename)
+                    elif entry.is_file():
+                        yield filename, entry
+
     def _generate_hash(self, filename):
-        """Genera hash desde repo_path/filename"""
+        """Genera hash desde repo_path/filename (usando la caché de stat)"""
         if self.app.repo_path:
             file_path = os.path.join(self.app.repo_path, filename)
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
+                self.stat_cache.remove(filename)
+                return None
             if os.path.isfile(file_path):
-                with open(file_path, "rb") as f:
-                    return hashlib.sha1(f.read()).hexdigest()
+                return self._hash_with_cache(filename, file_path, st)
         return None
 
+    def hash_entries(self, entries, hash_files=None):
+        """
+        Hashes de [(filename, DirEntry)] en el mismo orden. Los aciertos de la
+        caché de stat no se leen; el resto se hashea en lote con hash_files
+        (por defecto app.hasher.hash_files; 'add' pasa una que también guarda el blob).
+        """
+        hashes = []
+        misses = []  # (posición, filename, ruta, stat)
+        for filename, entry in entries:
+            st = entry.stat()
+            cached = self.stat_cache.lookup(filename, st)
+            if not cached:
+                misses.append((len(hashes), filename, entry.path, st))
+            hashes.append(cached)
+        results = (hash_files or self.app.hasher.hash_files)([path for _, _, path, _ in misses])
+        for (position, filename, _, st), file_hash in zip(misses, results):
+            hashes[position] = file_hash
+            if file_hash:
+                self.stat_cache.update(filename, st, file_hash)
+            else:
+                self.stat_cache.remove(filename)  # Se borró entre el escaneo y la lectura
+        return hashes
+
+    def _hash_with_cache(self, filename, file_path, st):
+        cached = self.stat_cache.lookup(filename, st)
+        if cached:
+            return cached
+        file_hash = sha1_file(file_path, self.app.hasher.buffer_size)
+        if file_hash:
+            self.stat_cache.update(filename, st, file_hash)
+        return file_hash
+
     def is_empty(self):
         return len(self.stack) == 0
\ No newline at end of file
@@ -0,0 +1,62 @@
+# 8. Módulo de Caché de Stat (equivalente a .git/index)
+import json
+import os
+
+INDEX_VERSION = 1
+
+class StatCache:
+    """
+    Guarda por archivo (tamaño, mtime_ns, inodo, sha1). Si los datos de stat
+    no cambiaron, el hash guardado es válido y no hace falta releer el archivo.
+    Las entradas con mtime igual o posterior a la última escritura del índice
+    se consideran dudosas ("racy") y se vuelven a hashear.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}  # filename -> [size, mtime_ns, inode, sha1]
+        self.dirty = False
+        self._written_ns = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.entries = data["entries"]
+                self._written_ns = os.stat(path).st_mtime_ns
+            except (ValueError, KeyError):
+                self.entries = {}  # Índice dañado: se reconstruye con el próximo escaneo
+
+    def lookup(self, filename, st):
+        """Devuelve el sha1 guardado si el stat coincide, o None"""
+        entry = self.entries.get(filename)
+        if (entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns
+                and entry[2] == st.st_ino and st.st_mtime_ns < self._written_ns):
+            return entry[3]
+        return None
+
+    def update(self, filename, st, sha1_hash):
+        self.entries[filename] = [st.st_size, st.st_mtime_ns, st.st_ino, sha1_hash]
+        self.dirty = True
+
+    def remove(self, filename):
+        if self.entries.pop(filename, None):
+            self.dirty = True
+
+    def prune(self, present):
+        """Quita las entradas de archivos que no están en present (ya no existen en el repo)"""
+        stale = [filename for filename in self.entries if filename not in present]
+        for filename in stale:
+            del self.entries[filename]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        """Escribe el índice de forma atómica si hubo cambios"""
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self._written_ns = os.stat(self.path).st_mtime_ns
+        self.dirty = False
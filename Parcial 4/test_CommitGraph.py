@@ -0,0 +1,100 @@
+import random
+from types import SimpleNamespace
+
+from CommitGraph import CommitGraph
+
+def add(graph, commit_id, parents=(), file_hashes=None, staged_files=None):
+    """Registra un commit mínimo; file_hashes=None imita un commit sin hashes (formato antiguo)"""
+    parents = list(parents) + [None, None]
+    hashes = file_hashes or {}
+    commit = SimpleNamespace(id=commit_id, parent_id=parents[0], merge_parent_id=parents[1],
+                             generation=0, timestamp=f"2024-01-01 00:00:{len(graph):02d}",
+                             staged_files=staged_files if staged_files is not None else list(hashes),
+                             file_hashes=hashes)
+    graph.add(commit)
+    return commit
+
+def history(graph):
+    r"""
+    base - m1 - m2 ------ merge     (main)
+        \         /
+         f1 - f2 -                 (feat)
+    """
+    add(graph, "base", file_hashes={"a": "a1", "b": "b1"})
+    add(graph, "m1", ["base"], {"a": "a2"})
+    add(graph, "f1", ["base"], {"b": "b2"})
+    add(graph, "m2", ["m1"], {"c": "c1"})
+    add(graph, "f2", ["f1"], {"b": "b3", "d": "d1"})
+    add(graph, "merge", ["m2", "f2"], {"b": "b3", "d": "d1"})
+
+def test_generations_and_ancestry():
+    graph = CommitGraph()
+    history(graph)
+    assert [graph.generations[c] for c in ("base", "m1", "f2", "merge")] == [1, 2, 3, 4]
+    assert graph.head_id == "merge"
+    assert graph.is_ancestor("f1", "merge") and graph.is_ancestor("base", "f2")
+    assert not graph.is_ancestor("m1", "f2") and not graph.is_ancestor("merge", "base")
+    assert set(graph.ancestor_ids("f2")) == {"f2", "f1", "base"}
+    assert graph.files_at("m2") == {"a", "b", "c"}
+
+def test_merge_base():
+    graph = CommitGraph()
+    history(graph)
+    assert graph.merge_base("m2", "f2") == "base"
+    assert graph.merge_base("f2", "m2") == "base"
+    assert graph.merge_base("merge", "f2") == "f2"     # f2 ya está integrado
+    assert graph.merge_base("m1", "m1") == "m1"
+    add(graph, "f3", ["f2"], {"e": "e1"})
+    assert graph.merge_base("merge", "f3") == "f2"     # Después del merge la base avanza
+    add(graph, "otro", [], {"z": "z1"})
+    assert graph.merge_base("otro", "merge") is None   # Historias sin relación
+    assert graph.merge_base("nope", "merge") is None
+
+def test_changed_since_keeps_the_newest_version():
+    graph = CommitGraph()
+    history(graph)
+    assert graph.changed_since("base", "f2") == {"b": "b3", "d": "d1"}
+    assert graph.changed_since("base", "m2") == {"a": "a2", "c": "c1"}
+    assert graph.changed_since("f2", "merge") == {"a": "a2", "c": "c1", "b": "b3", "d": "d1"}
+    assert graph.changed_since("merge", "merge") == {}
+    assert graph.blobs_at("merge", ["a", "b", "c", "d", "x"]) == {"a": "a2", "b": "b3", "c": "c1",
+                                                                  "d": "d1", "x": None}
+    assert graph.blobs_at("f1", ["a", "b"]) == {"a": "a1", "b": "b2"}
+
+def test_merge_base_matches_brute_force_on_random_dags():
+    rng = random.Random(17)
+    for _ in range(20):
+        graph = CommitGraph()
+        ids = []
+        for i in range(40):
+            parents = rng.sample(ids, min(len(ids), rng.choice([1, 1, 1, 2]))) if ids else []
+            add(graph, f"c{i}", parents)
+            ids.append(f"c{i}")
+        for _ in range(30):
+            first, second = rng.sample(ids, 2)
+            common = set(graph.ancestor_ids(first)) & set(graph.ancestor_ids(second))
+            base = graph.merge_base(first, second)
+            if not common:
+                assert base is None
+                continue
+            # La base es un ancestro común que no tiene otro ancestro común más nuevo debajo
+            assert base in common
+            assert not any(other != base and graph.is_ancestor(base, other) for other in common)
+
+def test_changed_since_reports_explicit_deletions():
+    graph = CommitGraph()
+    add(graph, "base", file_hashes={"a": "a1", "b": "b1"})
+    add(graph, "s1", ["base"], {"a": "a2"})
+    add(graph, "s2", ["s1"], {"b": None})
+    assert graph.changed_since("base", "s2") == {"a": "a2", "b": None}
+
+def test_commits_without_hashes_are_not_deletions():
+    graph = CommitGraph()
+    add(graph, "base", file_hashes={"a": "a1"})
+    # Commit de merge de PR / commit migrado: nombra archivos pero no registra sus hashes
+    add(graph, "legacy", ["base"], staged_files=["a", "b"])
+    add(graph, "tip", ["legacy"], {"c": "c1"})
+    assert graph.changed_since("base", "tip") == {"c": "c1"}
+    # blobs_at sigue buscando en los ancestros en lugar de devolver None
+    assert graph.blobs_at("tip", ["a", "b", "c"]) == {"a": "a1", "b": None, "c": "c1"}
+    assert graph.blob_at("legacy", "a") == "a1"
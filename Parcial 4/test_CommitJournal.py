@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+
+import pytest
+
+from CommitJournal import CommitJournal
+
+def record(i):
+    # Como Commit.to_dict(): "id" siempre es la primera clave
+    return {"id": f"c{i:06d}", "parent_id": f"c{i - 1:06d}" if i else None,
+            "timestamp": f"2024-01-01 00:00:{i % 60:02d}", "message": f"commit {i}"}
+
+@pytest.fixture
+def repo(tmp_path):
+    os.makedirs(tmp_path / ".git")
+    return str(tmp_path)
+
+def reopen(repo, **kwargs):
+    journal = CommitJournal(repo, **kwargs)
+    return journal, journal.load_index()
+
+def test_append_and_reopen(repo):
+    journal, index = reopen(repo)
+    assert index == []
+    for i in range(5):
+        journal.append(record(i))
+    journal.close()
+
+    journal, index = reopen(repo)
+    assert [entry[0] for entry in index] == [record(i)["id"] for i in range(5)]
+    assert [entry[2] for entry in index] == [1, 2, 3, 4, 5]  # Generaciones
+    assert journal.read("c000003") == record(3)
+    assert journal.read("nope") is None
+    journal.close()
+
+def test_torn_tail_is_truncated(repo):
+    journal, _ = reopen(repo)
+    for i in range(3):
+        journal.append(record(i))
+    journal.close()
+    # Un corte a mitad de escritura deja una última línea incompleta
+    with open(os.path.join(repo, ".git", "commits.journal"), "ab") as f:
+        f.write(b'{"id": "c000003", "parent_')
+
+    journal, index = reopen(repo)
+    assert [entry[0] for entry in index] == ["c000000", "c000001", "c000002"]
+    # El siguiente anexado empieza en una línea nueva y se puede leer
+    journal.append(record(3))
+    journal.close()
+    journal, index = reopen(repo)
+    assert len(index) == 4
+    assert journal.read("c000003") == record(3)
+    journal.close()
+
+def test_stale_index_is_rebuilt(repo):
+    journal, _ = reopen(repo)
+    for i in range(4):
+        journal.append(record(i))
+    journal.close()
+    with open(os.path.join(repo, ".git", "commits.idx"), "w") as f:
+        f.write("# 1 0\n")  # No coincide con el diario
+
+    journal, index = reopen(repo)
+    assert len(index) == 4
+    assert journal.read("c000002") == record(2)
+    journal.close()
+
+def test_compaction_moves_records_into_snapshot(repo):
+    journal, _ = reopen(repo, compact_every=5)
+    for i in range(12):
+        journal.append(record(i))
+    journal.compact(wait=True)
+    assert not os.path.exists(journal.journal_path)
+    # Las ubicaciones se actualizan: las lecturas siguen funcionando sin reabrir
+    assert journal.read("c000007") == record(7)
+    journal.close()
+
+    with open(os.path.join(repo, "commits.json")) as f:
+        assert json.load(f) == [record(i) for i in range(12)]
+    journal, index = reopen(repo, compact_every=5)
+    assert [entry[0] for entry in index] == [record(i)["id"] for i in range(12)]
+    assert journal.journal_records == 0
+    assert all(journal.read(record(i)["id"]) == record(i) for i in range(12))
+    assert list(journal.read_records()) == [record(i) for i in range(12)]
+    journal.close()
+
+def test_interrupted_compaction_is_finished_on_open(repo):
+    journal, _ = reopen(repo)
+    for i in range(3):
+        journal.append(record(i))
+    journal.compact(wait=True)
+    for i in range(3, 6):
+        journal.append(record(i))
+    journal.close()
+    # Se cae justo después de rotar el diario, antes de integrarlo a la instantánea
+    os.replace(journal.journal_path, journal.compacting_path)
+
+    journal, index = reopen(repo)
+    assert not os.path.exists(journal.compacting_path)
+    assert [entry[0] for entry in index] == [record(i)["id"] for i in range(6)]
+    assert journal.read("c000004") == record(4)
+    journal.close()
+
+def test_legacy_commits_json_is_migrated(repo):
+    # Formato anterior: json.dump(..., indent=4) de todo el historial
+    with open(os.path.join(repo, "commits.json"), "w") as f:
+        json.dump([record(i) for i in range(4)], f, indent=4)
+
+    journal, index = reopen(repo)
+    assert [entry[0] for entry in index] == [record(i)["id"] for i in range(4)]
+    assert journal._snapshot_is_line_format()
+    assert journal.read("c000001") == record(1)
+    journal.append(record(4))
+    journal.compact(wait=True)
+    journal.close()
+    with open(os.path.join(repo, "commits.json")) as f:
+        assert json.load(f) == [record(i) for i in range(5)]
+
+def test_appends_with_fsync_during_background_compaction(repo):
+    # fsync en cada registro mientras el hilo de compactación reescribe el índice
+    journal, _ = reopen(repo, fsync_every=1, compact_every=3)
+    for i in range(60):
+        journal.append(record(i))
+    journal.close()
+    journal, index = reopen(repo)
+    assert [entry[0] for entry in index] == [record(i)["id"] for i in range(60)]
+    assert all(journal.read(record(i)["id"]) == record(i) for i in range(0, 60, 7))
+    journal.close()
+
+def test_sync_waits_while_compaction_swaps_the_index(repo):
+    journal, _ = reopen(repo)
+    journal.append(record(0))
+    synced = threading.Event()
+    with journal._lock:
+        worker = threading.Thread(target=lambda: (journal.sync(), synced.set()))
+        worker.start()
+        assert not synced.wait(0.2)  # sync espera a que la compactación suelte el lock
+        # Lo mismo que hace _write_index en el hilo de compactación
+        journal._index_file.close()
+        journal._index_file = None
+    worker.join()
+    assert synced.is_set()
+    journal.close()
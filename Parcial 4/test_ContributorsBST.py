@@ -0,0 +1,145 @@
+import json
+import random
+
+import pytest
+
+from ContributorsBST import BLACK, RED, ContributorsBST
+
+def check_red_black(tree):
+    """Raíz negra, sin rojo-rojo, misma cantidad de negros por camino y punteros a padre correctos"""
+    assert tree.root is None or tree.root.color == BLACK
+    assert tree.root is None or tree.root.parent is None
+
+    def walk(node, low, high):
+        if node is None:
+            return 1, 0
+        assert (low is None or node.name > low) and (high is None or node.name < high)
+        for child in (node.left, node.right):
+            if child is not None:
+                assert child.parent is node
+                if node.color == RED:
+                    assert child.color == BLACK
+        left_black, left_count = walk(node.left, low, node.name)
+        right_black, right_count = walk(node.right, node.name, high)
+        assert left_black == right_black
+        return left_black + (node.color == BLACK), left_count + right_count + 1
+
+    black_height, count = walk(tree.root, None, None)
+    assert count == tree.size == len(tree)
+    return black_height
+
+def names(tree):
+    return [node.name for node in tree._iter_nodes()]
+
+def test_sorted_inserts_stay_balanced():
+    tree = ContributorsBST()
+    for i in range(1000):
+        tree.insert(f"user{i:04d}", "dev")
+    check_red_black(tree)
+    height = 0
+    pending = [(tree.root, 1)]
+    while pending:
+        node, depth = pending.pop()
+        if node:
+            height = max(height, depth)
+            pending += [(node.left, depth + 1), (node.right, depth + 1)]
+    assert height <= 2 * (1000 + 1).bit_length()
+
+def test_duplicate_insert_fails():
+    tree = ContributorsBST()
+    tree.insert("ana", "dev")
+    with pytest.raises(Exception):
+        tree.insert("ana", "admin")
+    assert len(tree) == 1
+
+def test_random_deletes_keep_red_black_properties():
+    rng = random.Random(11)
+    tree = ContributorsBST()
+    people = [f"p{i:04d}" for i in range(600)]
+    rng.shuffle(people)
+    for name in people:
+        tree.insert(name, "dev")
+    rng.shuffle(people)
+    for name in people[:450]:
+        tree.delete(name)
+        check_red_black(tree)
+        assert tree.find(name) is None
+    assert names(tree) == sorted(people[450:])
+    tree.delete("no-existe")
+    assert len(tree) == 150
+
+def test_delete_everything_in_order():
+    tree = ContributorsBST()
+    for i in range(200):
+        tree.insert(f"u{i:03d}", "dev")
+    for i in range(200):
+        tree.delete(f"u{i:03d}")
+        check_red_black(tree)
+    assert tree.root is None and len(tree) == 0
+
+def test_delete_with_two_children_keeps_successor_data():
+    tree = ContributorsBST()
+    for name, role in [("m", "admin"), ("c", "dev"), ("t", "ops"), ("p", "qa"), ("x", "dev")]:
+        tree.insert(name, role)
+    tree.delete("m")
+    check_red_black(tree)
+    assert tree.find("p").role == "qa"
+    # El índice de prefijos apunta al nodo que ahora guarda al sucesor
+    assert [node.role for node in tree.find_prefix("p")] == ["qa"]
+    assert tree.find_prefix("m") == []
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 7, 8, 100, 1023, 1024])
+def test_build_sorted_is_a_valid_red_black_tree(count):
+    tree = ContributorsBST()
+    records = [(f"c{i:05d}", "dev") for i in range(count)]
+    tree.build_sorted(records)
+    check_red_black(tree)
+    assert names(tree) == [name for name, _ in records]
+    tree.insert("zzz", "admin")
+    tree.delete("c00000")
+    check_red_black(tree)
+
+def test_save_and_load_flat_format(tmp_path):
+    tree = ContributorsBST()
+    for name, role in [("carla", "dev"), ("ana", "admin"), ("beto", "qa")]:
+        tree.insert(name, role)
+    tree.save(str(tmp_path))
+    with open(tmp_path / "contributors.json") as f:
+        assert json.load(f) == [["ana", "admin"], ["beto", "qa"], ["carla", "dev"]]
+
+    loaded = ContributorsBST()
+    loaded.load(str(tmp_path))
+    check_red_black(loaded)
+    assert loaded.list_inorder() == ["ana (admin)", "beto (qa)", "carla (dev)"]
+    assert [node.name for node in loaded.find_prefix("b")] == ["beto"]
+
+def test_load_legacy_nested_format(tmp_path):
+    # Formato anterior: el árbol serializado como objetos anidados
+    legacy = {"name": "beto", "role": "qa",
+              "left": {"name": "ana", "role": "admin", "left": None, "right": None},
+              "right": {"name": "dario", "role": "dev",
+                        "left": {"name": "carla", "role": "dev", "left": None, "right": None},
+                        "right": None}}
+    with open(tmp_path / "contributors.json", "w") as f:
+        json.dump(legacy, f, indent=4)
+
+    tree = ContributorsBST()
+    tree.load(str(tmp_path))
+    check_red_black(tree)
+    assert tree.list_inorder() == ["ana (admin)", "beto (qa)", "carla (dev)", "dario (dev)"]
+    # Al guardar se convierte al formato plano
+    tree.save(str(tmp_path))
+    with open(tmp_path / "contributors.json") as f:
+        assert json.load(f)[0] == ["ana", "admin"]
+
+def test_load_legacy_empty_tree(tmp_path):
+    with open(tmp_path / "contributors.json", "w") as f:
+        f.write("null")
+    tree = ContributorsBST()
+    tree.load(str(tmp_path))
+    assert tree.root is None and len(tree) == 0
+
+def test_load_missing_file(tmp_path):
+    tree = ContributorsBST()
+    tree.load(str(tmp_path))
+    assert len(tree) == 0
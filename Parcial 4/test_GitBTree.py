@@ -0,0 +1,159 @@
+import hashlib
+import random
+
+import pytest
+
+from GitBTree import GitBTree, LEAF_MAX, PagedGitBTree
+
+def sha(i):
+    return hashlib.sha1(str(i).encode()).hexdigest()
+
+def check_invariants(tree):
+    """Claves ordenadas, ocupación entre t-1 y 2t-1 y todas las hojas a la misma altura"""
+    t = tree.t
+    leaf_depths = set()
+
+    def walk(node, low, high, depth):
+        assert node.keys == sorted(node.keys)
+        assert all((low is None or key > low) and (high is None or key < high) for key in node.keys)
+        assert len(node.keys) <= 2 * t - 1
+        if node is not tree.root:
+            assert len(node.keys) >= t - 1
+        if node.leaf:
+            leaf_depths.add(depth)
+            return
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [low] + node.keys + [high]
+        for i, child in enumerate(node.children):
+            walk(child, bounds[i], bounds[i + 1], depth + 1)
+
+    walk(tree.root, None, None, 0)
+    assert len(leaf_depths) == 1
+
+def test_insert_keeps_every_key_after_splits():
+    tree = GitBTree(2)
+    hashes = [sha(i) for i in range(500)]
+    for h in hashes:
+        tree.insert(h)
+    check_invariants(tree)
+    # La mediana de cada división sube al padre en lugar de perderse
+    assert sorted(tree.preorder_traversal()) == sorted(hashes)
+    assert all(tree.search(h) for h in hashes)
+    assert not tree.search(sha("ausente"))
+
+def test_delete_random_order():
+    rng = random.Random(7)
+    tree = GitBTree(3)
+    hashes = [sha(i) for i in range(400)]
+    for h in hashes:
+        tree.insert(h)
+    rng.shuffle(hashes)
+    removed = hashes[:300]
+    for h in removed:
+        tree.delete(h)
+        check_invariants(tree)
+    assert not any(tree.search(h) for h in removed)
+    assert sorted(tree.preorder_traversal()) == sorted(hashes[300:])
+
+def test_delete_from_last_child_after_merge():
+    # Borrar siempre la clave mayor obliga a fusionar el último hijo con su hermano izquierdo
+    tree = GitBTree(2)
+    hashes = sorted(sha(i) for i in range(60))
+    for h in hashes:
+        tree.insert(h)
+    for h in reversed(hashes):
+        tree.delete(h)
+        assert not tree.search(h)
+        check_invariants(tree)
+    assert tree.preorder_traversal() == []
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 4, 5, 99, 100, 101, 5000])
+def test_bulk_load(count):
+    hashes = sorted(sha(i) for i in range(count))
+    tree = GitBTree.bulk_load(hashes, t=3)
+    check_invariants(tree)
+    assert sorted(tree.preorder_traversal()) == hashes
+    # El árbol cargado en bloque admite inserciones y borrados normales
+    tree.insert(sha("nuevo"))
+    if hashes:
+        tree.delete(hashes[0])
+    check_invariants(tree)
+    assert tree.search(sha("nuevo"))
+
+def test_bulk_load_skips_duplicates_and_rejects_unsorted():
+    hashes = sorted(sha(i) for i in range(10))
+    tree = GitBTree.bulk_load(hashes[:5] + [hashes[4]] + hashes[5:], t=2)
+    assert sorted(tree.preorder_traversal()) == hashes
+    with pytest.raises(Exception):
+        GitBTree.bulk_load(list(reversed(hashes)), t=2)
+
+def test_paged_insert_search_and_reopen(tmp_path):
+    path = str(tmp_path / "objects.idx")
+    tree = PagedGitBTree(path, cache_pages=8)
+    hashes = [sha(i) for i in range(3 * LEAF_MAX)]
+    for h in hashes:
+        assert tree.insert(h)
+    assert not tree.insert(hashes[0])
+    assert len(tree) == len(hashes)
+    tree.close()
+
+    reopened = PagedGitBTree(path, cache_pages=8)
+    assert len(reopened) == len(hashes)
+    assert reopened.preorder_traversal() == sorted(hashes)
+    assert all(reopened.search(h) for h in hashes[::37])
+    reopened.close()
+
+def test_paged_delete_and_range_scan(tmp_path):
+    tree = PagedGitBTree(str(tmp_path / "objects.idx"))
+    hashes = sorted(sha(i) for i in range(1000))
+    for h in hashes:
+        tree.insert(h)
+    assert tree.delete(hashes[10])
+    assert not tree.delete(hashes[10])
+    assert not tree.search(hashes[10])
+    assert list(tree.range_scan(hashes[5], hashes[15])) == hashes[5:10] + hashes[11:15]
+    tree.close()
+
+@pytest.mark.parametrize("count", [0, 1, LEAF_MAX, LEAF_MAX + 1, 50000])
+def test_paged_bulk_load(tmp_path, count):
+    path = str(tmp_path / "objects.idx")
+    hashes = sorted(sha(i) for i in range(count))
+    tree = PagedGitBTree(path, cache_pages=8)
+    tree.bulk_load(iter(hashes))
+    assert len(tree) == count
+    tree.close()
+
+    reopened = PagedGitBTree(path, cache_pages=8)
+    assert reopened.preorder_traversal() == hashes
+    assert all(reopened.search(h) for h in hashes[::997])
+    reopened.insert(sha("nuevo"))
+    assert reopened.search(sha("nuevo"))
+    reopened.close()
+
+def test_paged_bulk_load_requires_empty_index(tmp_path):
+    tree = PagedGitBTree(str(tmp_path / "objects.idx"))
+    tree.insert(sha(1))
+    with pytest.raises(Exception):
+        tree.bulk_load([sha(2)])
+    tree.close()
+
+def test_paged_empty_file_is_a_new_index(tmp_path):
+    path = tmp_path / "objects.idx"
+    path.write_bytes(b"")
+    tree = PagedGitBTree(str(path))
+    assert len(tree) == 0
+    tree.insert(sha(1))
+    assert tree.search(sha(1))
+    tree.close()
+
+@pytest.mark.parametrize("cut", [10, 4096, 4096 + 100])
+def test_paged_truncated_file_raises_a_clear_error(tmp_path, cut):
+    path = str(tmp_path / "objects.idx")
+    tree = PagedGitBTree(path)
+    for i in range(3 * LEAF_MAX):
+        tree.insert(sha(i))
+    tree.close()
+    with open(path, "r+b") as f:
+        f.truncate(cut)
+    with pytest.raises(Exception, match="Índice de objetos|Página"):
+        PagedGitBTree(path)
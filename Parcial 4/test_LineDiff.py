@@ -0,0 +1,81 @@
+import difflib
+import random
+
+from LineDiff import LineInterner, iter_lines, merge3, opcodes, unified_diff
+
+def lines(text):
+    return [line.encode() for line in text.splitlines(keepends=True)]
+
+BASE = lines("uno\ndos\ntres\ncuatro\ncinco\nseis\n")
+
+def test_merge3_without_changes():
+    assert merge3(BASE, BASE, BASE) == (BASE, 0)
+
+def test_merge3_takes_the_side_that_changed():
+    ours = lines("uno\nDOS\ntres\ncuatro\ncinco\nseis\n")
+    assert merge3(BASE, ours, BASE) == (ours, 0)
+    assert merge3(BASE, BASE, ours) == (ours, 0)
+
+def test_merge3_combines_disjoint_changes():
+    ours = lines("uno\nDOS\ntres\ncuatro\ncinco\nseis\n")
+    theirs = lines("uno\ndos\ntres\ncuatro\ncinco\nSEIS\nsiete\n")
+    merged, conflicts = merge3(BASE, ours, theirs)
+    assert conflicts == 0
+    assert merged == lines("uno\nDOS\ntres\ncuatro\ncinco\nSEIS\nsiete\n")
+
+def test_merge3_same_change_on_both_sides_is_not_a_conflict():
+    both = lines("uno\ndos\nTRES\ncuatro\ncinco\nseis\n")
+    assert merge3(BASE, both, both) == (both, 0)
+
+def test_merge3_conflicting_changes_get_markers():
+    ours = lines("uno\ndos\nnuestro\ncuatro\ncinco\nseis\n")
+    theirs = lines("uno\ndos\nsuyo\ncuatro\ncinco\nseis\n")
+    merged, conflicts = merge3(BASE, ours, theirs, "main", "feature")
+    assert conflicts == 1
+    assert merged == lines("uno\ndos\n<<<<<<< main\nnuestro\n=======\nsuyo\n>>>>>>> feature\n"
+                           "cuatro\ncinco\nseis\n")
+
+def test_merge3_delete_against_edit_conflicts():
+    ours = lines("uno\ndos\ncuatro\ncinco\nseis\n")          # Borra "tres"
+    theirs = lines("uno\ndos\nTRES\ncuatro\ncinco\nseis\n")  # Lo modifica
+    merged, conflicts = merge3(BASE, ours, theirs)
+    assert conflicts == 1
+    assert merged == lines("uno\ndos\n<<<<<<< ours\n=======\nTRES\n>>>>>>> theirs\ncuatro\ncinco\nseis\n")
+
+def test_merge3_counts_each_conflict_zone():
+    ours = lines("A\ndos\ntres\ncuatro\ncinco\nF\n")
+    theirs = lines("a\ndos\ntres\ncuatro\ncinco\nf\n")
+    merged, conflicts = merge3(BASE, ours, theirs)
+    assert conflicts == 2
+    assert merged.count(b"=======\n") == 2
+
+def test_merge3_conflict_markers_start_on_their_own_line():
+    base = lines("x\ny")
+    ours = lines("x\nnuestro")
+    theirs = lines("x\nsuyo")
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == 1
+    assert b"".join(merged).decode() == "x\n<<<<<<< ours\nnuestro\n=======\nsuyo\n>>>>>>> theirs\n"
+
+def test_opcodes_rebuild_the_target():
+    rng = random.Random(3)
+    words = [f"l{i}\n".encode() for i in range(20)]
+    for _ in range(50):
+        a = [rng.choice(words) for _ in range(rng.randint(0, 40))]
+        b = [rng.choice(words) for _ in range(rng.randint(0, 40))]
+        interner = LineInterner()
+        rebuilt = []
+        for tag, i1, i2, j1, j2 in opcodes(interner.intern(a), interner.intern(b)):
+            rebuilt.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+        assert rebuilt == b
+
+def test_unified_diff_matches_difflib_for_simple_edit():
+    a = lines("uno\ndos\ntres\n")
+    b = lines("uno\nDOS\ntres\n")
+    ours = list(unified_diff(a, b, "a/f", "b/f"))
+    expected = [line.rstrip("\n") for line in
+                difflib.unified_diff([l.decode() for l in a], [l.decode() for l in b], "a/f", "b/f")]
+    assert ours == expected
+
+def test_iter_lines_joins_chunks():
+    assert list(iter_lines([b"un", b"o\ndo", b"s\ntr", b"es"])) == [b"uno\n", b"dos\n", b"tres"]
@@ -0,0 +1,214 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from Main import ConsoleApp
+
+def run(app, command_line, ok=True):
+    """Ejecuta un comando como la consola y devuelve lo que imprimió"""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        succeeded = app.execute_line(command_line)
+    assert succeeded == ok, out.getvalue()
+    return out.getvalue()
+
+def write(repo, name, text):
+    path = os.path.join(repo, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+def open_repo(repo):
+    app = ConsoleApp()
+    run(app, f"init {repo}")
+    return app
+
+def close(app):
+    app.flush()
+    app._reset_state()
+    if app._hasher:
+        app._hasher.shutdown()
+
+@pytest.fixture
+def repo(tmp_path):
+    return str(tmp_path / "repo")
+
+def test_head_follows_the_branch_after_reopening(repo):
+    app = open_repo(repo)
+    write(repo, "base.txt", "base\n")
+    run(app, "add base.txt")
+    run(app, 'commit -m "base"')
+    base_id = app.current_commit.id
+    run(app, "branch feat")
+    run(app, "checkout feat")
+    write(repo, "f.txt", "solo en feat\n")
+    run(app, "add f.txt")
+    run(app, 'commit -m "feat"')
+    run(app, "checkout main")
+    close(app)
+
+    # Al reabrir, HEAD es la punta de main y no el commit más reciente (el de feat)
+    app = open_repo(repo)
+    assert app.current_commit.id == base_id
+    write(repo, "m.txt", "solo en main\n")
+    run(app, "add m.txt")
+    run(app, 'commit -m "main"')
+    assert app.current_commit.parent_id == base_id
+    assert app.get_committed_files() == {"base.txt", "m.txt"}
+    close(app)
+
+def test_pr_approve_commits_blobs_on_the_target_branch(repo):
+    app = open_repo(repo)
+    write(repo, "a.txt", "uno\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "base"')
+    main_tip = app.current_commit.id
+    run(app, "branch feat")
+    run(app, "checkout feat")
+    write(repo, "b.txt", "dos\n")
+    run(app, "add b.txt")
+    run(app, 'commit -m "feat"')
+    feat_tip = app.current_commit.id
+    run(app, "checkout main")
+    write(repo, "p.txt", "del PR\n")
+    run(app, "add p.txt")
+    run(app, "pr create feat main")
+    run(app, "pr next")
+    run(app, "pr approve 1")
+
+    merge = app.branch_tree.find("main").commit
+    assert merge.parent_id == main_tip                     # No el último commit global (feat)
+    assert app.branch_tree.find("feat").commit.id == feat_tip
+    assert app.current_commit is merge
+    assert app.staging.is_empty()
+    # checkout main dejó en staging los archivos de main; el PR los incluye junto con p.txt
+    assert sorted(merge.file_hashes) == ["a.txt", "p.txt"]
+    assert app.object_store.read_blob(merge.file_hashes["p.txt"]) == b"del PR\n"
+    assert app.has_object(merge.file_hashes["p.txt"])
+    # El historial lo ve como contenido, no como borrados
+    changes = app.commit_graph.changed_since(main_tip, merge.id)
+    assert all(changes.values()) and changes["p.txt"] == merge.file_hashes["p.txt"]
+    close(app)
+
+def test_checkout_skips_files_without_a_blob(repo):
+    app = open_repo(repo)
+    write(repo, "a.txt", "uno\n")
+    write(repo, "d.txt", "se borra\n")
+    run(app, "add .")
+    run(app, 'commit -m "base"')
+    os.remove(os.path.join(repo, "d.txt"))
+    app.staging.push("d.txt")  # Borrado en staging: sin hash
+    run(app, 'commit -m "borra d"')
+    deletion = app.current_commit
+    assert deletion.file_hashes["d.txt"] is None
+
+    run(app, f"checkout {deletion.id}")
+    assert app.staging.is_empty()  # d.txt no se prepara con hash vacío
+
+    # Commit con el formato anterior: nombra archivos pero no guarda hashes
+    legacy = app.commit_graph.get(app.commit_graph.order[0])
+    legacy.file_hashes = {}
+    run(app, f"checkout {legacy.id}")
+    assert app.staging.is_empty()
+
+    # El siguiente commit no encuentra hashes vacíos ni blobs faltantes
+    write(repo, "a.txt", "dos\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "sigue"')
+    assert app.current_commit.file_hashes == {"a.txt": app.staging.stat_cache.entries["a.txt"][3]}
+    assert app.object_store.read_blob(app.current_commit.file_hashes["a.txt"]) == b"dos\n"
+    close(app)
+
+@pytest.mark.parametrize("cut", [0, 100])
+def test_damaged_object_index_is_rebuilt_on_open(repo, cut):
+    app = open_repo(repo)
+    write(repo, "a.txt", "uno\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "base"')
+    blob = app.current_commit.file_hashes["a.txt"]
+    close(app)
+    # Corte a mitad de escritura: índice vacío o truncado
+    with open(os.path.join(repo, ".git", "objects.idx"), "r+b") as f:
+        f.truncate(cut)
+
+    app = open_repo(repo)
+    assert app.has_object(blob)
+    run(app, "status")
+    close(app)
+
+def test_branch_merge_packs_loose_objects(repo, monkeypatch):
+    app = open_repo(repo)
+    write(repo, "a.txt", "1\n2\n3\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "base"')
+    run(app, "branch feat")
+    run(app, "checkout feat")
+    write(repo, "a.txt", "uno\n2\n3\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "feat"')
+    run(app, "checkout main")
+    write(repo, "a.txt", "1\n2\ntres\n")
+    run(app, "add a.txt")
+    run(app, 'commit -m "main"')
+
+    store = app.object_store
+    assert not store.packs
+    # El blob combinado por el merge es el que alcanza el límite
+    monkeypatch.setattr("ObjectStore.LOOSE_LIMIT", store.loose_count + 1)
+    run(app, "branch merge feat main")
+    merged = app.branch_tree.find("main").commit.file_hashes["a.txt"]
+    assert store.packs and store.loose_count == 0
+    assert store.read_blob(merged) == b"uno\n2\ntres\n"
+    close(app)
+
+def count_writes(app, monkeypatch):
+    """Cuenta las escrituras reales de cada tipo de dato (después de la coalescencia de save)"""
+    writes = []
+    for kind, method in (("commits", "_save_commits"), ("prs", "_save_pull_requests")):
+        original = getattr(app, method)
+        monkeypatch.setattr(app, method, lambda kind=kind, original=original: (writes.append(kind), original()))
+    original_branches = app.branch_tree.save
+    monkeypatch.setattr(app.branch_tree, "save", lambda path: (writes.append("branches"), original_branches(path)))
+    return writes
+
+def test_batch_save_only_marks_pending_until_flush(repo, monkeypatch):
+    app = open_repo(repo)
+    writes = count_writes(app, monkeypatch)
+    app.batch_mode = True
+    for kind in ("prs", "commits", "prs", "branches", "commits", "prs"):
+        app.save(kind)
+    assert writes == []
+    assert app._pending_saves == {"prs", "commits", "branches"}
+    app.flush()
+    # Cada tipo una sola vez, en el orden de SAVE_KINDS, y el modo batch sigue activo
+    assert writes == ["commits", "prs", "branches"]
+    assert app.batch_mode and not app._pending_saves
+    app.flush()
+    assert writes == ["commits", "prs", "branches"]
+    app.batch_mode = False
+    app.save("prs")
+    assert writes[-1] == "prs"
+    close(app)
+
+def test_run_batch_flushes_every_n_commands_and_at_the_end(repo, monkeypatch):
+    app = open_repo(repo)
+    write(repo, "a.txt", "a\n")
+    writes = count_writes(app, monkeypatch)
+    lines = ["# script de prueba", "", "branch feat", "pr create feat main", "pr create feat main",
+             "comando-inexistente", "add a.txt", 'commit -m "batch"', "pr create feat main"]
+    executed, failed = app.run_batch(lines, flush_every=3)
+    assert (executed, failed) == (7, 1)
+    assert not app.batch_mode
+    # Un flush cada 3 comandos más el final: cada tipo se escribe una vez por tramo, no una por comando
+    assert writes == ["prs", "branches",       # branch feat, pr create x2
+                      "commits", "branches",   # comando-inexistente, add, commit
+                      "prs"]                   # pr create (flush final)
+    close(app)
+
+    app = open_repo(repo)
+    assert [pr.id for pr in app.pr_queue.get_all()] == [1, 2, 3]
+    assert app.branch_tree.find("feat")
+    assert app.current_commit.message == "batch"
+    close(app)
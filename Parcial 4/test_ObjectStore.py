@@ -0,0 +1,96 @@
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from ObjectStore import ObjectStore
+
+def blob_with_prefix(prefix):
+    """Contenido cuyo SHA-1 empieza con prefix (para los extremos de la tabla fan-out)"""
+    i = 0
+    while True:
+        data = f"blob {i}\n".encode()
+        if hashlib.sha1(data).hexdigest().startswith(prefix):
+            return data
+        i += 1
+
+@pytest.fixture
+def store(tmp_path):
+    store = ObjectStore(str(tmp_path))
+    yield store
+    store.close()
+
+def test_write_bytes_round_trip(store):
+    data = b"hola\nmundo\n"
+    sha1_hash = store.write_bytes(data)
+    assert sha1_hash == hashlib.sha1(data).hexdigest()
+    assert store.contains(sha1_hash)
+    assert store.read_blob(sha1_hash) == data
+    # Suelto: comprimido con zlib en objects/xx/yyyy...
+    with open(os.path.join(store.objects_dir, sha1_hash[:2], sha1_hash[2:]), "rb") as f:
+        assert zlib.decompress(f.read()) == data
+
+def test_write_bytes_counts_only_new_objects(store):
+    store.write_bytes(b"a")
+    store.write_bytes(b"a")
+    store.write_bytes(b"b")
+    assert store.loose_count == 2
+
+def test_write_file_streams_large_files(store, tmp_path):
+    path = tmp_path / "grande.bin"
+    data = os.urandom(300 * 1024) + b"fin"
+    path.write_bytes(data)
+    sha1_hash = store.write_file(str(path), buffer_size=4096)
+    assert sha1_hash == hashlib.sha1(data).hexdigest()
+    chunks = list(store.stream_blob(sha1_hash, chunk_size=8192))
+    assert max(len(chunk) for chunk in chunks) <= 8192
+    assert b"".join(chunks) == data
+
+def test_missing_blob(store):
+    assert not store.contains("0" * 40)
+    with pytest.raises(KeyError):
+        store.read_blob("0" * 40)
+
+def test_pack_loose_and_fanout_lookup(store):
+    contents = [blob_with_prefix("00"), blob_with_prefix("ff")] + [f"archivo {i}\n".encode() for i in range(300)]
+    hashes = [store.write_bytes(data) for data in contents]
+    idx_path = store.pack_loose()
+    assert idx_path and os.path.exists(idx_path[:-4] + ".pack")
+    assert store.loose_count == 0
+    assert store.all_hashes() == sorted(hashes)
+    # Primer y último tramo de la tabla fan-out, y el resto
+    pack = store.packs[0]
+    assert pack.fanout[255] == len(hashes)
+    assert all(pack.find(h) for h in hashes)
+    assert pack.find("00" + "0" * 38) is None and pack.find("ff" * 20) is None
+    assert all(store.read_blob(h) == data for h, data in zip(hashes, contents))
+    assert not [name for name in os.listdir(store.objects_dir) if len(name) == 2]
+
+def test_packs_survive_reopen_and_coexist_with_loose_objects(tmp_path):
+    store = ObjectStore(str(tmp_path))
+    packed = [store.write_bytes(f"p{i}".encode()) for i in range(10)]
+    store.pack_loose()
+    assert store.pack_loose() is None  # Nada suelto: no crea un pack vacío
+    loose = store.write_bytes(b"suelto")
+    store.close()
+
+    reopened = ObjectStore(str(tmp_path))
+    assert reopened.loose_count == 1
+    assert reopened.all_hashes() == sorted(packed + [loose])
+    assert reopened.read_blob(packed[3]) == b"p3"
+    assert reopened.read_blob(loose) == b"suelto"
+    # Un blob que ya está empaquetado no se vuelve a escribir suelto
+    reopened.write_bytes(b"p3")
+    assert reopened.loose_count == 1
+    reopened.close()
+
+def test_maybe_pack_honours_the_limit(store, monkeypatch):
+    monkeypatch.setattr("ObjectStore.LOOSE_LIMIT", 3)
+    store.write_bytes(b"1")
+    store.write_bytes(b"2")
+    store.maybe_pack()
+    assert not store.packs
+    store.write_bytes(b"3")
+    store.maybe_pack()
+    assert len(store.packs) == 1 and store.loose_count == 0
@@ -0,0 +1,136 @@
+import os
+
+import pytest
+
+from PullRequestSQLite import SQLitePullRequestStore
+from PullRequestStore import PullRequestStore
+from test_Main import close, open_repo, run
+from test_PullRequestStore import make_pr
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Every test runs against both backends: they must behave the same."""
+    if request.param == "memory":
+        yield PullRequestStore()
+        return
+    store = SQLitePullRequestStore(str(tmp_path / "pull_requests.db"))
+    yield store
+    store.close()
+
+def ids(prs):
+    return [pr.id for pr in prs]
+
+def test_enqueue_find_and_round_trip(store):
+    pr = make_pr(store.allocate_id(), tags=["priority:high"], author="ana")
+    pr.files = ["a.txt", "b.txt"]
+    store.enqueue(pr)
+    with pytest.raises(Exception, match="ya existe"):
+        store.enqueue(make_pr(pr.id))
+    found = store.find_pr_by_id(pr.id)
+    assert found.to_dict() == pr.to_dict()
+    assert store.find_pr_by_id(99) is None
+    assert len(store) == 1 and not store.is_empty()
+
+def test_next_for_review_orders_by_priority_then_age(store):
+    store.enqueue(make_pr(1, minutes=0))
+    store.enqueue(make_pr(2, tags=["priority:low"], minutes=1))
+    store.enqueue(make_pr(3, tags=["priority:critical"], minutes=2))
+    store.enqueue(make_pr(4, minutes=3))
+    store.enqueue(make_pr(5, status="merged", tags=["priority:critical"], minutes=4))
+    store.remove(1)
+    order = []
+    while True:
+        pr = store.next_for_review()
+        if pr is None:
+            break
+        order.append(pr.id)
+        assert store.find_pr_by_id(pr.id).status == "reviewing"
+    assert order == [3, 4, 2]
+
+def test_filter_and_set_status(store):
+    store.enqueue(make_pr(1, author="ana"))
+    store.enqueue(make_pr(2, author="beto"))
+    store.enqueue(make_pr(3, author="ana", status="merged"))
+    assert ids(store.filter(author="ana")) == [1, 3]
+    assert ids(store.filter(author="ana", status="pending")) == [1]
+    assert ids(store.filter(target="main")) == [1, 2, 3]
+    store.set_status(store.find_pr_by_id(1), "approved")
+    assert store.filter(author="ana", status="pending") == []
+    assert ids(store.filter(status="approved")) == [1]
+    assert ids(store.get_all()) == [1, 2, 3]
+
+def test_ids_are_never_reused(store):
+    for _ in range(3):
+        store.enqueue(make_pr(store.allocate_id()))
+    assert store.remove(3).id == 3
+    assert store.remove(3) is None
+    assert store.allocate_id() == 4
+    store.clear()
+    assert store.is_empty()
+    assert store.allocate_id() == 5
+
+def test_sqlite_store_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "pull_requests.db")
+    store = SQLitePullRequestStore(path)
+    store.enqueue(make_pr(store.allocate_id(), author="ana"))
+    store.enqueue(make_pr(store.allocate_id(), tags=["priority:high"]))
+    store.remove(2)
+    store.close()
+
+    reopened = SQLitePullRequestStore(path)
+    assert ids(reopened.get_all()) == [1]
+    assert reopened.find_pr_by_id(1).author == "ana"
+    assert reopened.allocate_id() == 3
+    reopened.close()
+
+def test_import_store_copies_prs_and_counter(tmp_path):
+    source = PullRequestStore()
+    for minutes in range(3):
+        source.enqueue(make_pr(source.allocate_id(), minutes=minutes))
+    source.remove(3)
+    target = SQLitePullRequestStore(str(tmp_path / "pull_requests.db"))
+    target.import_store(source)
+    assert [pr.to_dict() for pr in target.get_all()] == [pr.to_dict() for pr in source.get_all()]
+    assert target.allocate_id() == 4
+    back = PullRequestStore()
+    back.import_store(target)
+    assert ids(back.get_all()) == [1, 2] and back.allocate_id() == 5
+    target.close()
+
+def test_config_pr_backend_migrates_both_ways(tmp_path):
+    repo = str(tmp_path / "repo")
+    json_path = os.path.join(repo, "pull_requests.json")
+    db_path = os.path.join(repo, ".git", "pull_requests.db")
+    app = open_repo(repo)
+    run(app, "branch feat")
+    run(app, "pr create feat main")
+    run(app, "pr create feat main --priority critical")
+    run(app, "pr create feat main")
+    run(app, "pr cancel 3")
+    close(app)
+    assert os.path.exists(json_path)
+
+    app = open_repo(repo)
+    run(app, "config pr.backend sqlite")
+    assert isinstance(app.pr_queue, SQLitePullRequestStore)
+    assert os.path.exists(db_path) and not os.path.exists(json_path)
+    before = [pr.to_dict() for pr in app.pr_queue.get_all()]
+    assert [pr["id"] for pr in before] == [1, 2]  # cancel removed #3
+    close(app)
+
+    # Reopening picks the SQLite backend without loading anything
+    app = open_repo(repo)
+    assert isinstance(app.pr_queue, SQLitePullRequestStore)
+    assert [pr.to_dict() for pr in app.pr_queue.get_all()] == before
+    assert app.pr_queue.next_for_review().id == 2
+    run(app, "config pr.backend json")
+    assert isinstance(app.pr_queue, PullRequestStore)
+    assert os.path.exists(json_path) and not os.path.exists(db_path)
+    close(app)
+
+    app = open_repo(repo)
+    assert isinstance(app.pr_queue, PullRequestStore)
+    assert [(pr.id, pr.status) for pr in app.pr_queue.get_all()] == [(1, "pending"), (2, "reviewing")]
+    run(app, "pr create feat main")
+    assert app.pr_queue.find_pr_by_id(4)  # #3 stays retired: the counter survived both migrations
+    close(app)
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from PullRequest import PullRequest
+from PullRequestStore import PullRequestStore
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+def make_pr(pr_id, status="pending", tags=(), author="ana", minutes=0):
+    pr = PullRequest(pr_id, f"feature{pr_id}", "main")
+    pr.status = status
+    pr.tags = list(tags)
+    pr.author = author
+    pr.created_at = START + timedelta(minutes=minutes)
+    return pr
+
+def test_load_legacy_list_derives_next_id():
+    # Old format: a plain list of PRs without the id counter
+    legacy = [make_pr(3).to_dict(), make_pr(7, status="merged").to_dict()]
+    store = PullRequestStore()
+    store.load_dict(legacy)
+    assert [pr.id for pr in store.get_all()] == [3, 7]
+    assert store.allocate_id() == 8
+    assert [pr.id for pr in store.filter(status="pending")] == [3]
+
+def test_to_dict_round_trip_keeps_the_counter():
+    store = PullRequestStore()
+    store.enqueue(make_pr(store.allocate_id()))
+    store.enqueue(make_pr(store.allocate_id()))
+    store.remove(2)  # Ids are never reused, even when the last one is removed
+    loaded = PullRequestStore()
+    loaded.load_dict(store.to_dict())
+    assert [pr.id for pr in loaded.get_all()] == [1]
+    assert loaded.allocate_id() == 3
+
+def test_next_for_review_orders_by_priority_then_age():
+    store = PullRequestStore()
+    store.enqueue(make_pr(1, minutes=0))
+    store.enqueue(make_pr(2, tags=["priority:low"], minutes=1))
+    store.enqueue(make_pr(3, tags=["priority:critical"], minutes=2))
+    store.enqueue(make_pr(4, minutes=3))
+    store.remove(1)
+    order = []
+    while True:
+        pr = store.next_for_review()
+        if pr is None:
+            break
+        order.append(pr.id)
+        assert pr.status == "reviewing"
+    assert order == [3, 4, 2]
+
+def test_filter_intersects_indexes():
+    store = PullRequestStore()
+    store.enqueue(make_pr(1, author="ana"))
+    store.enqueue(make_pr(2, author="beto"))
+    store.enqueue(make_pr(3, author="ana", status="merged"))
+    assert [pr.id for pr in store.filter(author="ana")] == [1, 3]
+    assert [pr.id for pr in store.filter(author="ana", status="pending")] == [1]
+    store.set_status(store.find_pr_by_id(1), "approved")
+    assert store.filter(author="ana", status="pending") == []
+    assert store.filter(author="nadie") == []
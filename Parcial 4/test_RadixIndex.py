@@ -0,0 +1,100 @@
+import random
+
+from RadixIndex import RadixIndex
+
+def count_nodes(index):
+    pending = [index.root]
+    total = 0
+    while pending:
+        node = pending.pop()
+        total += 1
+        pending.extend(node.children.values())
+    return total
+
+def check_compressed(index):
+    """Ningún nodo sin valor (salvo la raíz) queda con un solo hijo ni sin hijos"""
+    pending = list(index.root.children.values())
+    while pending:
+        node = pending.pop()
+        assert node.label
+        assert node.has_value or len(node.children) >= 2
+        for first, child in node.children.items():
+            assert child.label[0] == first
+        pending.extend(node.children.values())
+
+def test_insert_get_and_prefix_items():
+    index = RadixIndex()
+    for key in ["main", "feature/login", "feature/logout", "fix", "feature"]:
+        index.insert(key, key.upper())
+    assert len(index) == 5
+    assert index.get("feature/login") == "FEATURE/LOGIN"
+    assert index.get("feat") is None
+    assert "feature" in index and "feat" not in index
+    assert index.keys("feature/log") == ["feature/login", "feature/logout"]
+    assert index.keys("f") == ["feature", "feature/login", "feature/logout", "fix"]
+    assert index.keys("featurex") == []
+    assert index.keys() == sorted(["main", "feature/login", "feature/logout", "fix", "feature"])
+
+def test_insert_replaces_value():
+    index = RadixIndex()
+    index.insert("ana", 1)
+    index.insert("ana", 2)
+    assert len(index) == 1
+    assert index.get("ana") == 2
+
+def test_remove_merges_pass_through_nodes():
+    index = RadixIndex()
+    for key in ["romane", "romanus", "romulus", "rubens"]:
+        index.insert(key)
+    assert index.remove("romanus")
+    check_compressed(index)
+    assert index.keys("rom") == ["romane", "romulus"]
+    assert index.remove("romulus")
+    check_compressed(index)
+    # "roman" + "e" se juntaron en una sola arista
+    assert index.keys("r") == ["romane", "rubens"]
+    assert not index.remove("romulus")
+    assert not index.remove("rom")  # Prefijo sin valor propio
+    assert len(index) == 2
+
+def test_remove_key_that_is_a_prefix_of_others():
+    index = RadixIndex()
+    for key in ["test", "tester", "testing"]:
+        index.insert(key)
+    assert index.remove("test")
+    check_compressed(index)
+    assert "test" not in index
+    assert index.keys("test") == ["tester", "testing"]
+    assert index.remove("tester")
+    check_compressed(index)
+    assert index.keys("t") == ["testing"]
+    assert count_nodes(index) == 2
+
+def test_empty_key():
+    index = RadixIndex()
+    index.insert("", "raiz")
+    index.insert("a", 1)
+    assert index.get("") == "raiz"
+    assert index.keys() == ["", "a"]
+    assert index.remove("")
+    assert index.keys() == ["a"]
+
+def test_random_against_dict():
+    rng = random.Random(5)
+    alphabet = "abc"
+    index = RadixIndex()
+    expected = {}
+    for _ in range(3000):
+        key = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+        if rng.random() < 0.6:
+            index.insert(key, len(key))
+            expected[key] = len(key)
+        else:
+            assert index.remove(key) == (key in expected)
+            expected.pop(key, None)
+        assert len(index) == len(expected)
+    check_compressed(index)
+    assert count_nodes(index) <= 2 * len(expected) + 1
+    for prefix in ["", "a", "ab", "cab", "bbb"]:
+        assert index.keys(prefix) == sorted(key for key in expected if key.startswith(prefix))
+    assert all(index.get(key) == value for key, value in expected.items())
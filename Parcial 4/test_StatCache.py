@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+from StatCache import StatCache
+
+SECOND = 1_000_000_000
+
+@pytest.fixture
+def paths(tmp_path):
+    target = tmp_path / "a.txt"
+    target.write_text("uno\n")
+    return str(tmp_path / "index"), str(target)
+
+def set_mtime(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return os.stat(path)
+
+def saved_cache(index_path, file_path, sha1_hash="h1"):
+    """Índice guardado con a.txt, cuyo mtime queda claramente antes de la escritura del índice"""
+    cache = StatCache(index_path)
+    st = set_mtime(file_path, os.stat(file_path).st_mtime_ns - 10 * SECOND)
+    cache.update("a.txt", st, sha1_hash)
+    cache.save()
+    return cache
+
+def test_hit_after_save(paths):
+    index_path, file_path = paths
+    cache = saved_cache(index_path, file_path)
+    assert cache.lookup("a.txt", os.stat(file_path)) == "h1"
+    # Otra instancia lee el mismo índice del disco
+    assert StatCache(index_path).lookup("a.txt", os.stat(file_path)) == "h1"
+
+def test_unsaved_entries_are_racy(paths):
+    index_path, file_path = paths
+    cache = StatCache(index_path)
+    st = os.stat(file_path)
+    cache.update("a.txt", st, "h1")
+    # Todavía no hay escritura del índice con la que comparar el mtime
+    assert cache.lookup("a.txt", st) is None
+
+def test_mtime_at_or_after_index_write_is_rehashed(paths):
+    index_path, file_path = paths
+    cache = saved_cache(index_path, file_path)
+    written_ns = os.stat(index_path).st_mtime_ns
+    # Un archivo modificado en el mismo instante en que se escribió el índice:
+    # mismo tamaño y mismo mtime que la entrada no alcanzan para confiar en ella
+    st = set_mtime(file_path, written_ns)
+    cache.update("a.txt", st, "h1")
+    assert cache.lookup("a.txt", st) is None
+    later = set_mtime(file_path, written_ns + SECOND)
+    cache.update("a.txt", later, "h1")
+    assert cache.lookup("a.txt", later) is None
+
+def test_stat_changes_miss(paths):
+    index_path, file_path = paths
+    cache = saved_cache(index_path, file_path)
+    st = os.stat(file_path)
+    # Mismo mtime pero otro tamaño
+    with open(file_path, "w") as f:
+        f.write("uno y más\n")
+    assert cache.lookup("a.txt", set_mtime(file_path, st.st_mtime_ns)) is None
+    # Mismo tamaño y mtime pero otro inodo (archivo reemplazado)
+    replacement = file_path + ".nuevo"
+    with open(replacement, "w") as f:
+        f.write("uno\n")
+    os.replace(replacement, file_path)
+    replaced = set_mtime(file_path, st.st_mtime_ns)
+    if replaced.st_ino != st.st_ino:
+        assert cache.lookup("a.txt", replaced) is None
+
+def test_remove_and_prune_are_persisted(paths):
+    index_path, file_path = paths
+    cache = saved_cache(index_path, file_path)
+    st = os.stat(file_path)
+    for name in ("b.txt", "c.txt"):
+        cache.update(name, st, "h")
+    cache.save()
+    cache.remove("b.txt")
+    cache.remove("no-existe")
+    cache.prune({"a.txt"})
+    assert cache.dirty
+    cache.save()
+    assert sorted(StatCache(index_path).entries) == ["a.txt"]
+
+def test_save_skips_clean_cache(paths):
+    index_path, file_path = paths
+    cache = saved_cache(index_path, file_path)
+    written_ns = os.stat(index_path).st_mtime_ns
+    cache.prune({"a.txt"})
+    assert not cache.dirty
+    set_mtime(index_path, written_ns - SECOND)
+    cache.save()
+    assert os.stat(index_path).st_mtime_ns == written_ns - SECOND
+
+@pytest.mark.parametrize("content", ["{no es json", json.dumps({"version": 999, "entries": {"a.txt": [1, 2, 3, "h"]}})])
+def test_damaged_or_foreign_index_starts_empty(paths, content):
+    index_path, _ = paths
+    with open(index_path, "w") as f:
+        f.write(content)
+    assert StatCache(index_path).entries == {}